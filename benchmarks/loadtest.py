@@ -0,0 +1,392 @@
+"""
+/info/index/, /info/download/ 부하 측정
+
+로컬 서버(manage.py runserver)를 새 저장소 / 새 DB 로 띄우고 가상 명부(tax_refund.engine.synthetic)를
+지정한 동시 요청 수, 도착률로 업로드해 처리량, 응답 시간 백분위, 오류율, 서버 RSS 를 측정합니다.
+
+    - 명부, 요청 순서, 도착 시각은 --seed 로 재현됩니다. (같은 인자면 같은 요청을 같은 순서로 보냅니다.)
+    - 매 측정마다 빈 업로드 저장소와 DB 를 사용하므로 이전 측정의 cache 가 결과에 영향을 주지 않습니다.
+    - 응답 시간은 요청을 보내기로 한 시각부터 측정합니다. (client 대기 시간 포함)
+    - 서버 RSS 는 서버와 하위 프로세스(계산 worker)의 합계입니다. (Linux /proc 필요)
+
+Usage:
+    python benchmarks/loadtest.py                                        # 1,000 명 명부 20건, 동시 4
+    python benchmarks/loadtest.py --rows 10000 --requests 50 --concurrency 8 --rate 2
+    python benchmarks/loadtest.py --endpoint download --format csv --rosters 1   # 같은 명부 반복 (cache)
+    python benchmarks/loadtest.py --url http://127.0.0.1:8000            # 실행 중인 서버 측정
+    python benchmarks/loadtest.py --output benchmarks/loadtest.jsonl     # 측정 결과를 누적 기록
+
+--env 로 서버 환경 변수(settings)를 지정합니다.
+    python benchmarks/loadtest.py --env CALCULATION_WORKERS=4 --env ADMISSION_MAX_WAIT=30
+
+⚠️ 모든 요청이 같은 client IP 에서 보내지므로 사용자별 대기 요청 수 제한(ADMISSION_MAX_QUEUED_PER_USER)을 받습니다.
+   서버 전체 처리 용량을 측정할 때는 --env ADMISSION_MAX_QUEUED_PER_USER=<동시 요청 수> 로 지정합니다.
+"""
+import argparse
+import http.client
+import json
+import os
+import queue
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+import warnings
+from urllib.parse import urlsplit
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENDPOINTS = {'index': '/info/index/', 'download': '/info/download/'}
+
+
+def percentile(values, q):
+    """
+    Description:
+        values 의 q 백분위 값 (선형 보간), values 가 비어있으면 None
+    """
+    if not values:
+        return None
+    values = sorted(values)
+    position = (len(values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def write_rosters(root, n_rosters, n_rows, seed):
+    """
+    Description:
+        n_rows 명의 가상 명부 n_rosters 개를 csv 로 저장합니다. 명부마다 seed 가 다릅니다. (seed, seed + 1, ...)
+
+    :list return: [csv 경로, ... ]
+    """
+    sys.path.insert(0, BASE_DIR)
+    from tax_refund.engine.synthetic import synthetic_workdate
+
+    paths = []
+    with warnings.catch_warnings():
+        # 날짜가 없는 인원(NaN) 변환 경고
+        warnings.simplefilter('ignore', RuntimeWarning)
+        for i in range(n_rosters):
+            path = os.path.join(root, 'roster_{}_{}.csv'.format(n_rows, seed + i))
+            synthetic_workdate(n_rows, seed + i).to_csv(path, index=False, encoding='utf-8')
+            paths.append(path)
+    return paths
+
+
+def multipart(fields, files):
+    """
+    Description:
+        multipart/form-data body 를 만듭니다.
+
+    :param dict fields: {이름: 값}
+    :param dict files: {이름: (파일 이름, bytes)}
+    :return: (content type, body)
+    """
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append('--{}\r\nContent-Disposition: form-data; name="{}"\r\n\r\n{}\r\n'
+                     .format(boundary, name, value).encode('utf-8'))
+    for name, (filename, content) in files.items():
+        parts.append('--{}\r\nContent-Disposition: form-data; name="{}"; filename="{}"\r\n'
+                     'Content-Type: text/csv\r\n\r\n'.format(boundary, name, filename).encode('utf-8'))
+        parts.append(content + b'\r\n')
+    parts.append('--{}--\r\n'.format(boundary).encode('utf-8'))
+    return 'multipart/form-data; boundary=' + boundary, b''.join(parts)
+
+
+def plan(args, rosters):
+    """
+    Description:
+        보낼 요청 목록을 seed 로 만듭니다. 도착률(--rate)이 있으면 포아송 도착 시각을 함께 만듭니다.
+
+    :list return: [{'endpoint', 'roster', 'at'}, ... ], at 은 측정 시작부터의 초 (closed loop 이면 None)
+    """
+    rng = random.Random(args.seed)
+    endpoints = list(ENDPOINTS) if args.endpoint == 'both' else [args.endpoint]
+    requests, at = [], 0.0
+    for i in range(args.requests):
+        if args.rate:
+            at += rng.expovariate(args.rate)
+        requests.append({'endpoint': endpoints[i % len(endpoints)],
+                         'roster': rosters[i % len(rosters)],
+                         'at': at if args.rate else None})
+    return requests
+
+
+def send(url, request, fmt, timeout):
+    """
+    Description:
+        명부를 업로드하고 (status, 응답 bytes 수) 를 반환합니다. redirect 는 따라가지 않습니다.
+    """
+    with open(request['roster'], 'rb') as f:
+        content = f.read()
+    fields = {'company': 'loadtest', 'year': 2022}
+    if request['endpoint'] == 'download':
+        fields['format'] = fmt
+    content_type, body = multipart(fields, {'employee': (os.path.basename(request['roster']), content)})
+
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=timeout)
+    try:
+        connection.request('POST', ENDPOINTS[request['endpoint']], body=body, headers={'Content-Type': content_type})
+        response = connection.getresponse()
+        return response.status, len(response.read())
+    finally:
+        connection.close()
+
+
+def descendants(pid):
+    # pid 와 모든 하위 프로세스 pid (/proc/<pid>/stat 의 ppid 로 찾습니다.)
+    parents = {}
+    for name in os.listdir('/proc'):
+        if name.isdigit():
+            try:
+                with open('/proc/{}/stat'.format(name)) as f:
+                    parents[int(name)] = int(f.read().rsplit(')', 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+    pids, stack = [], [pid]
+    while stack:
+        current = stack.pop()
+        pids.append(current)
+        stack.extend(child for child, parent in parents.items() if parent == current)
+    return pids
+
+
+def rss_bytes(pid):
+    """
+    Description:
+        pid 와 하위 프로세스의 RSS 합계 (bytes), /proc 이 없으면 None
+    """
+    if pid is None or not os.path.isdir('/proc'):
+        return None
+    total = 0
+    for current in descendants(pid):
+        try:
+            with open('/proc/{}/status'.format(current)) as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except OSError:
+            continue
+    return total
+
+
+class RssSampler(threading.Thread):
+    """
+    interval 초 마다 서버 RSS 를 측정해 최대값과 마지막 값을 기록합니다.
+    """
+
+    def __init__(self, pid, interval=0.2):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.peak = None
+        self.last = None
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.is_set():
+            self.sample()
+            self.stopped.wait(self.interval)
+
+    def sample(self):
+        rss = rss_bytes(self.pid)
+        if rss is not None:
+            self.last = rss
+            self.peak = max(self.peak or 0, rss)
+        return rss
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+        self.sample()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(root, env_overrides):
+    """
+    Description:
+        root 아래 새 업로드 저장소, 새 sqlite DB 로 runserver 를 시작하고 응답할 때 까지 기다립니다.
+
+    :return: (subprocess.Popen, url)
+    """
+    port = free_port()
+    env = dict(os.environ, UPLOAD_STORE_ROOT=os.path.join(root, 'media'),
+               DATABASE_NAME=os.path.join(root, 'db.sqlite3'), PYTHONUNBUFFERED='1')
+    env.update(env_overrides)
+    manage = [sys.executable, os.path.join(BASE_DIR, 'manage.py')]
+    subprocess.run(manage + ['migrate', '--verbosity', '0'], cwd=BASE_DIR, env=env, check=True)
+
+    log = open(os.path.join(root, 'server.log'), 'w')
+    server = subprocess.Popen(manage + ['runserver', '127.0.0.1:{}'.format(port), '--noreload'],
+                              cwd=BASE_DIR, env=env, stdout=log, stderr=subprocess.STDOUT)
+    url = 'http://127.0.0.1:{}'.format(port)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError('서버가 시작되지 않았습니다. ({})'.format(log.name))
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/info/metrics/')
+            connection.getresponse().read()
+            connection.close()
+            return server, url
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError('서버가 60초 안에 응답하지 않았습니다. ({})'.format(log.name))
+
+
+def run_load(url, requests, args):
+    """
+    Description:
+        requests 를 args.concurrency 개의 thread 로 보냅니다.
+        at 이 있으면 그 시각에 보내고(open loop), 없으면 앞 요청이 끝나는 대로 보냅니다(closed loop).
+
+    :return: (결과 list, 측정 시간(초))
+    """
+    pending = queue.Queue()
+    for request in requests:
+        pending.put(request)
+    results = []
+    lock = threading.Lock()
+    start = time.monotonic()
+
+    def worker():
+        while True:
+            try:
+                request = pending.get_nowait()
+            except queue.Empty:
+                return
+            scheduled = start + request['at'] if request['at'] is not None else time.monotonic()
+            delay = scheduled - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            try:
+                status, size = send(url, request, args.format, args.timeout)
+            except (OSError, http.client.HTTPException) as e:
+                status, size = type(e).__name__, 0
+            result = {'endpoint': request['endpoint'], 'status': status, 'bytes': size,
+                      'latency': time.monotonic() - scheduled}
+            with lock:
+                results.append(result)
+
+    threads = [threading.Thread(target=worker) for _ in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results, time.monotonic() - start
+
+
+def summarize(results, elapsed):
+    """
+    Description:
+        endpoint 별 처리량, 응답 시간 백분위(ms), 상태 코드별 건수, 오류율을 계산합니다.
+        2xx / 3xx 가 아닌 응답(503 / 429 포함)과 연결 오류는 오류입니다.
+    """
+    summary = {}
+    for endpoint in sorted({result['endpoint'] for result in results}) + ['all']:
+        rows = [result for result in results if endpoint in ('all', result['endpoint'])]
+        ok = [row for row in rows if isinstance(row['status'], int) and row['status'] < 400]
+        latencies = [row['latency'] * 1000 for row in ok]
+        statuses = {}
+        for row in rows:
+            statuses[str(row['status'])] = statuses.get(str(row['status']), 0) + 1
+        summary[endpoint] = {'requests': len(rows),
+                             'throughput_rps': len(ok) / elapsed if elapsed else None,
+                             'error_rate': 1 - len(ok) / len(rows) if rows else None,
+                             'statuses': statuses,
+                             'latency_ms': {'p50': percentile(latencies, 50),
+                                            'p90': percentile(latencies, 90),
+                                            'p99': percentile(latencies, 99),
+                                            'max': max(latencies) if latencies else None,
+                                            'mean': statistics.mean(latencies) if latencies else None}}
+    return summary
+
+
+def report(summary, elapsed, rss):
+    def ms(value):
+        return '-' if value is None else '{:.0f}'.format(value)
+
+    print('elapsed {:.1f} s'.format(elapsed))
+    print('{:<9} {:>5} {:>8} {:>7} {:>7} {:>7} {:>7} {:>7}  statuses'.format(
+        'endpoint', 'n', 'rps', 'err%', 'p50', 'p90', 'p99', 'max'))
+    for endpoint, row in summary.items():
+        latency = row['latency_ms']
+        print('{:<9} {:>5} {:>8.2f} {:>7.1f} {:>7} {:>7} {:>7} {:>7}  {}'.format(
+            endpoint, row['requests'], row['throughput_rps'] or 0, (row['error_rate'] or 0) * 100,
+            ms(latency['p50']), ms(latency['p90']), ms(latency['p99']), ms(latency['max']),
+            ' '.join('{}:{}'.format(status, n) for status, n in sorted(row['statuses'].items()))))
+    if rss['peak'] is not None:
+        print('server rss peak {:.1f} MiB, after {:.1f} MiB (before {:.1f} MiB)'.format(
+            rss['peak'] / 1024 ** 2, rss['after'] / 1024 ** 2, rss['before'] / 1024 ** 2))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--rows', type=int, default=1000, help='명부 인원 수')
+    arg_parser.add_argument('--rosters', type=int, default=None,
+                            help='서로 다른 명부 수, 기본값은 요청 수 (모든 요청이 cache 를 사용하지 않습니다.)')
+    arg_parser.add_argument('--requests', type=int, default=20, help='보낼 요청 수')
+    arg_parser.add_argument('--concurrency', type=int, default=4, help='동시 요청 수 (client thread 수)')
+    arg_parser.add_argument('--rate', type=float, default=0,
+                            help='초당 평균 도착 요청 수 (포아송), 0 이면 앞 요청이 끝나는 대로 보냅니다.')
+    arg_parser.add_argument('--endpoint', choices=list(ENDPOINTS) + ['both'], default='both')
+    arg_parser.add_argument('--format', default='xlsx', help='download 결과 형식')
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--timeout', type=float, default=300, help='요청 timeout (초)')
+    arg_parser.add_argument('--url', help='실행 중인 서버 주소, 지정하지 않으면 새 서버를 시작합니다.')
+    arg_parser.add_argument('--env', action='append', default=[], metavar='NAME=VALUE',
+                            help='새 서버 환경 변수 (settings), 여러번 지정할 수 있습니다.')
+    arg_parser.add_argument('--output', help='측정 결과를 json line 으로 추가할 파일')
+    args = arg_parser.parse_args()
+
+    env = dict(item.split('=', 1) for item in args.env)
+    with tempfile.TemporaryDirectory() as root:
+        rosters = write_rosters(root, args.rosters or args.requests, args.rows, args.seed)
+        requests = plan(args, rosters)
+
+        server = None
+        url = args.url
+        if url is None:
+            server, url = start_server(root, env)
+        try:
+            sampler = RssSampler(server.pid if server else None)
+            before = sampler.sample()
+            sampler.start()
+            results, elapsed = run_load(url, requests, args)
+            sampler.stop()
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+
+    summary = summarize(results, elapsed)
+    rss = {'before': before, 'peak': sampler.peak, 'after': sampler.last}
+    report(summary, elapsed, rss)
+
+    if args.output:
+        with open(args.output, 'a') as f:
+            f.write(json.dumps({'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                                'args': {key: value for key, value in vars(args).items() if key != 'output'},
+                                'elapsed_s': elapsed, 'rss_bytes': rss, 'results': summary},
+                               ensure_ascii=False) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Django 앱과 계산 CLI 의 cold start 시간을 `python -X importtime` 으로 측정합니다.
+
+    django : django.setup() 후 URLconf(모든 view 포함)를 로드하는 시간
+    cli    : tax_refund.engine.parser 를 import 하는 시간
+
+Usage:
+    python benchmarks/startup.py                      # 각 대상 5회 측정
+    python benchmarks/startup.py --repeat 10 --top 15
+    python benchmarks/startup.py --output benchmarks/startup.jsonl   # 측정 결과를 누적 기록
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = {
+    'django': ("import os, django\n"
+               "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tax_refund.settings')\n"
+               "django.setup()\n"
+               "from django.urls import get_resolver\n"
+               "get_resolver().url_patterns\n"),
+    'cli': "import tax_refund.engine.parser\n",
+}
+
+# Django cold start 에 포함되면 안되는 무거운 모듈
+HEAVY_MODULES = ('pandas', 'numpy')
+
+
+def parse_importtime(stderr):
+    """
+    Description:
+        -X importtime 출력에서 top-level 모듈 별 누적 import 시간(us)과 import 된 모든 모듈 이름을 추출합니다.
+
+    :param str stderr:
+    :return:
+        : dict modules: {top-level module: cumulative_us}
+        : set imported: {module, module ... module}
+    """
+    modules = {}
+    imported = set()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        imported.add(name.strip())
+        # 들여쓰기가 없는 모듈만 top-level import 입니다.
+        if not name.startswith('  '):
+            modules[name.strip()] = int(cumulative)
+    return modules, imported
+
+
+def measure(code):
+    """
+    Description:
+        새 인터프리터에서 code 를 실행하고 wall time(ms), import 시간(ms), top-level 모듈별 import 시간,
+        import 된 모든 모듈 이름을 반환합니다.
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=BASE_DIR, env=env,
+                          capture_output=True, text=True)
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr)
+    modules, imported = parse_importtime(proc.stderr)
+    return wall_ms, sum(modules.values()) / 1000, modules, imported
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    arg_parser.add_argument('--top', type=int, default=10, help='import 시간이 긴 top-level 모듈 출력 개수')
+    arg_parser.add_argument('--output', help='측정 결과를 json line 으로 추가할 파일')
+    args = arg_parser.parse_args()
+
+    results = {}
+    for target, code in TARGETS.items():
+        runs = [measure(code) for _ in range(args.repeat)]
+        wall = [run[0] for run in runs]
+        imports = [run[1] for run in runs]
+        modules, imported = runs[-1][2], runs[-1][3]
+        heavy = sorted(name for name in imported if name in HEAVY_MODULES)
+
+        results[target] = {'wall_ms_median': statistics.median(wall),
+                           'wall_ms_min': min(wall),
+                           'import_ms_median': statistics.median(imports),
+                           'heavy_modules': heavy}
+
+        print('[{}] wall {:.1f} ms (min {:.1f}), import {:.1f} ms'.format(
+            target, statistics.median(wall), min(wall), statistics.median(imports)))
+        if heavy:
+            print('    heavy imports: {}'.format(', '.join(heavy)))
+        for name, cumulative in sorted(modules.items(), key=lambda item: -item[1])[:args.top]:
+            print('    {:>9.1f} ms  {}'.format(cumulative / 1000, name))
+
+    if args.output:
+        with open(args.output, 'a') as f:
+            f.write(json.dumps({'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'results': results}) + '\n')
+
+
+if __name__ == '__main__':
+    main()
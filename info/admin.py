@@ -1,6 +1,9 @@
 from django.contrib import admin
+from django.template.response import TemplateResponse
+from django.urls import path
 
 # Register your models here.
+from info.aggregates import YEARS, upload_totals, yearly_totals
 from info.models import Info
 
 
@@ -31,5 +34,29 @@ class InfoAdmin(admin.ModelAdmin):
                     'army',
                     'elder']
 
+    def get_urls(self):
+        urls = [path('summary/', self.admin_site.admin_view(self.summary_view), name='info_info_summary')]
+        return urls + super().get_urls()
+
+    def summary_view(self, request):
+        """
+        Description:
+            전체 / 업로드(filename)별 연도별 상시 / 청년 / 기타 근로 달 수 합계를 DB 에서 집계해 보여줍니다.
+            ?filename= 으로 업로드를 선택할 수 있습니다. (info.aggregates 참조)
+        """
+        queryset = self.get_queryset(request)
+        filename = request.GET.get('filename')
+        if filename:
+            queryset = queryset.filter(filename=filename)
+
+        context = dict(self.admin_site.each_context(request),
+                       opts=self.model._meta,
+                       title='연도별 근로 달 수 집계',
+                       filename=filename,
+                       years=YEARS,
+                       totals=yearly_totals(queryset),
+                       uploads=upload_totals(queryset))
+        return TemplateResponse(request, 'admin/info/info/summary.html', context)
+
 
 admin.site.register(Info, InfoAdmin)
@@ -0,0 +1,266 @@
+"""
+계산 요청 admission control
+
+명부 크기로 계산 비용(행 수)을 추정하고 동시에 실행하는 계산 수와 비용 합계를 제한합니다.
+제한을 넘는 요청은 사용자별 대기열에서 기다리며 사용자 순서대로(round robin) 한 건씩 실행됩니다.
+    - 한 사용자가 많은 명부를 올려도 다른 사용자의 요청이 그 뒤에 밀리지 않습니다.
+    - 예상 대기 시간이 최대 대기 시간보다 길면 기다리지 않고 바로 503 + Retry-After 로 응답합니다.
+      (대기 중인 요청은 요청 처리 thread 를 점유하므로 최대 대기 시간 안에 실행될 요청만 기다립니다.)
+    - 예상보다 오래 걸려 최대 대기 시간 안에 실행되지 못해도 503 + Retry-After 로 응답합니다.
+    - 사용자별 대기 요청 수를 넘으면 바로 429 + Retry-After 로 응답합니다.
+
+제한은 요청 처리 프로세스 안에서만 적용됩니다. (프로세스가 여러개면 프로세스마다 적용됩니다.)
+
+settings:
+    ADMISSION_MAX_CONCURRENT: 동시에 실행하는 최대 계산 수
+    ADMISSION_MAX_COST: 동시에 실행하는 계산의 최대 비용(명부 행 수) 합계, 이보다 큰 명부는 혼자 실행됩니다.
+    ADMISSION_MAX_WAIT: 최대 대기 시간(초)
+    ADMISSION_MAX_QUEUED_PER_USER: 사용자별 최대 대기 요청 수
+"""
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.http import HttpResponse
+
+from tax_refund.engine import CSV_EXTENSIONS
+from tax_refund.engine.metrics import REGISTRY
+
+# 엑셀 명부 1행(row)의 대략적인 크기 (bytes), 행 수를 세지 않고 파일 크기로 비용을 추정합니다.
+EXCEL_BYTES_PER_ROW = 100
+
+# 완료된 계산이 없을 때 사용하는 계산 시간(초) 추정값
+DEFAULT_JOB_SECONDS = 5.0
+
+_controller = None
+_controller_lock = threading.Lock()
+
+RUNNING = REGISTRY.gauge('tax_refund_admission_running', '실행 중인 계산 수')
+QUEUED = REGISTRY.gauge('tax_refund_admission_queued', '대기 중인 계산 요청 수')
+REJECTED = REGISTRY.counter('tax_refund_admission_rejected_total', '받지 않은 계산 요청 수 (status: 503 / 429)',
+                            ['status'])
+
+
+class Saturated(Exception):
+    """
+    계산 요청을 받을 수 없는 경우 발생합니다. retry_after 초 후 다시 요청해야 합니다.
+    """
+
+    def __init__(self, retry_after, status=503):
+        super().__init__(retry_after)
+        self.retry_after = retry_after
+        self.status = status
+
+
+class Ticket:
+    __slots__ = ('user', 'cost', 'granted')
+
+    def __init__(self, user, cost):
+        self.user = user
+        self.cost = cost
+        self.granted = False
+
+
+def estimate_cost(path):
+    """
+    Description:
+        명부 파일의 계산 비용(행 수)을 추정합니다.
+        csv 는 줄 수를 세고, 엑셀은 파일 크기로 추정합니다. (명부를 파싱하지 않습니다.)
+
+    :param str path: 명부 경로
+    :int return: 추정 행 수 (1 이상)
+    """
+    if os.path.splitext(path)[-1].lower() in CSV_EXTENSIONS:
+        lines = 0
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                lines += block.count(b'\n')
+        return max(lines, 1)
+    return max(os.path.getsize(path) // EXCEL_BYTES_PER_ROW, 1)
+
+
+def user_key(request):
+    """
+    Description:
+        사용자별 대기열 key, 로그인 사용자는 username, 아니면 client IP 입니다.
+    """
+    if getattr(request, 'user', None) is not None and request.user.is_authenticated:
+        return 'user:' + request.user.get_username()
+    return 'ip:' + request.META.get('REMOTE_ADDR', '')
+
+
+class AdmissionController:
+    """
+    동시 실행 수 / 비용 제한과 사용자별 round robin 대기열
+    """
+
+    def __init__(self, max_concurrent, max_cost, max_wait, max_queued_per_user):
+        self.max_concurrent = max_concurrent
+        self.max_cost = max_cost
+        self.max_wait = max_wait
+        self.max_queued_per_user = max_queued_per_user
+
+        self.condition = threading.Condition()
+        self.running = 0
+        self.running_cost = 0
+        self.queues = OrderedDict()  # {user: deque([Ticket, ...])}, 다음 차례 사용자가 앞에 있습니다.
+        self.job_seconds = None  # 계산 시간 지수 이동 평균
+
+    @property
+    def queued(self):
+        with self.condition:
+            return sum(len(queue) for queue in self.queues.values())
+
+    def retry_after(self):
+        """
+        Description:
+            대기 중인 요청과 실행 중인 계산이 모두 끝날 때 까지의 예상 시간(초)
+        """
+        seconds = self.job_seconds or DEFAULT_JOB_SECONDS
+        return max(math.ceil(seconds * (self.queued + self.running + 1) / self.max_concurrent), 1)
+
+    def expected_wait(self):
+        """
+        Description:
+            대기열 맨 뒤 요청이 실행될 때 까지의 예상 시간(초)
+            실행 중인 계산과 대기 중인 요청이 max_concurrent 건씩 차례로 실행된다고 추정합니다.
+        """
+        seconds = self.job_seconds or DEFAULT_JOB_SECONDS
+        return seconds * max(math.ceil((self.queued + self.running) / self.max_concurrent) - 1, 1)
+
+    def _fits(self, ticket):
+        # 실행 중인 계산이 없으면 비용과 관계없이 실행합니다.
+        return self.running < self.max_concurrent and (
+                self.running == 0 or self.running_cost + ticket.cost <= self.max_cost)
+
+    def _grant(self):
+        # 다음 차례 사용자의 첫 요청이 실행될 수 있으면 실행하고 그 사용자를 대기열 맨 뒤로 보냅니다.
+        # (차례인 요청이 실행될 수 없으면 뒤의 작은 요청도 기다립니다. 큰 명부가 계속 밀리지 않습니다.)
+        granted = False
+        while self.queues:
+            user, queue = next(iter(self.queues.items()))
+            ticket = queue[0]
+            if not self._fits(ticket):
+                break
+            queue.popleft()
+            if queue:
+                self.queues.move_to_end(user)
+            else:
+                del self.queues[user]
+            ticket.granted = True
+            self.running += 1
+            self.running_cost += ticket.cost
+            granted = True
+        if granted:
+            self.condition.notify_all()
+
+    def acquire(self, user, cost):
+        """
+        Description:
+            계산을 실행할 차례가 될 때 까지 기다립니다.
+            사용자 대기 요청이 많거나 예상 대기 시간(expected_wait)이 max_wait 보다 길면 기다리지 않고 바로,
+            max_wait 안에 차례가 오지 않으면 Saturated 가 발생합니다.
+
+        :param str user: user_key
+        :param int cost: estimate_cost
+        :Ticket return:
+        """
+        with self.condition:
+            queue = self.queues.get(user)
+            if queue is not None and len(queue) >= self.max_queued_per_user:
+                raise Saturated(self.retry_after(), status=429)
+
+            ticket = Ticket(user, cost)
+            self.queues.setdefault(user, deque()).append(ticket)
+            self._grant()
+            if not ticket.granted and self.expected_wait() > self.max_wait:
+                self._cancel(ticket)
+                raise Saturated(self.retry_after())
+
+            deadline = time.monotonic() + self.max_wait
+            while not ticket.granted:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._cancel(ticket)
+                    raise Saturated(self.retry_after())
+                self.condition.wait(remaining)
+            return ticket
+
+    def _cancel(self, ticket):
+        # 대기열에서 요청을 제외하고 다음 차례 요청을 실행합니다.
+        queue = self.queues[ticket.user]
+        queue.remove(ticket)
+        if not queue:
+            del self.queues[ticket.user]
+        self._grant()
+
+    def release(self, ticket, seconds=None):
+        """
+        Description:
+            계산이 끝나면 호출합니다. seconds 는 계산 시간이며 Retry-After 추정에 사용합니다.
+        """
+        with self.condition:
+            self.running -= 1
+            self.running_cost -= ticket.cost
+            if seconds is not None:
+                self.job_seconds = seconds if self.job_seconds is None else 0.8 * self.job_seconds + 0.2 * seconds
+            self._grant()
+
+    @contextmanager
+    def admit(self, user, cost):
+        """
+        Usage:
+            >>> with controller.admit(user_key(request), estimate_cost(filepath)):
+            >>>     workers.run('deductio_and_tax_summary', filepath, None)
+        """
+        ticket = self.acquire(user, cost)
+        start = time.monotonic()
+        try:
+            yield ticket
+        finally:
+            self.release(ticket, time.monotonic() - start)
+
+
+def get_controller():
+    """
+    Description:
+        settings 로 만든 AdmissionController 를 반환합니다. 처음 호출될 때 생성합니다.
+
+    :AdmissionController return:
+    """
+    global _controller
+    with _controller_lock:
+        if _controller is None:
+            _controller = AdmissionController(max_concurrent=settings.ADMISSION_MAX_CONCURRENT,
+                                              max_cost=settings.ADMISSION_MAX_COST,
+                                              max_wait=settings.ADMISSION_MAX_WAIT,
+                                              max_queued_per_user=settings.ADMISSION_MAX_QUEUED_PER_USER)
+    return _controller
+
+
+RUNNING.set_function(lambda: get_controller().running)
+QUEUED.set_function(lambda: get_controller().queued)
+
+
+def admit(request, path):
+    """
+    Description:
+        요청한 명부의 계산 차례를 기다립니다. (AdmissionController.admit 참조)
+    """
+    return get_controller().admit(user_key(request), estimate_cost(path))
+
+
+def saturated_response(error):
+    """
+    Description:
+        Saturated 를 Retry-After header 가 있는 503 (혼잡) / 429 (사용자 대기 요청 초과) 응답으로 변환합니다.
+    """
+    REJECTED.inc(status=error.status)
+    message = '계산 요청이 많아 대기 중입니다. {}초 후 다시 시도해 주세요.'.format(error.retry_after)
+    response = HttpResponse(message, status=error.status, content_type='text/plain; charset=utf-8')
+    response['Retry-After'] = str(error.retry_after)
+    return response
@@ -0,0 +1,86 @@
+"""
+저장된 Info 행(row)의 DB 집계
+
+연도별 상시 / 청년 / 기타 근로 달 수 합계와 업로드(filename)별 인원, 근로 달 수를 SQL Sum / GROUP BY 로 계산합니다.
+모델 instance 를 로드하지 않고 한번의 query 로 계산하며 filename covering index(Info.Meta 참조)를 사용합니다.
+
+workdate_1 ~ workdate_5 는 공제 계산 기간(START_DATE ~ END_DATE)의 연도 순서입니다.
+"""
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce
+
+from info.models import Info
+from tax_refund.engine import START_DATE, END_DATE
+
+YEARS = list(range(int(START_DATE[:4]), int(END_DATE[:4]) + 1))
+
+
+def _year_sums():
+    """
+    Description:
+        연도별 상시 / 청년 / 기타 근로 달 수 합계 집계식을 반환합니다. 청년 근로 달 수가 없으면(NULL) 0 입니다.
+
+    :dict return: {'workers_2018': Sum, 'youngs_2018': Sum, 'etc_2018': Sum, ... }
+    """
+    sums = {}
+    for i, year in enumerate(YEARS, start=1):
+        workers = Coalesce(Sum('workdate_{}'.format(i)), 0)
+        youngs = Coalesce(Sum('young_workdate_{}'.format(i)), 0)
+        sums['workers_{}'.format(year)] = workers
+        sums['youngs_{}'.format(year)] = youngs
+        sums['etc_{}'.format(year)] = workers - youngs
+    return sums
+
+
+def _by_year(row):
+    return [{'year': year,
+             'workers': row['workers_{}'.format(year)],
+             'youngs': row['youngs_{}'.format(year)],
+             'etc': row['etc_{}'.format(year)]} for year in YEARS]
+
+
+def yearly_totals(queryset=None):
+    """
+    Description:
+        전체(또는 queryset) Info 행의 연도별 상시 / 청년 / 기타 근로 달 수 합계를 계산합니다.
+
+        ------------------------------------------
+        | year | workers | youngs | etc |
+        | 2018 |     288 |     73 | 215 |
+        ------------------------------------------
+
+    :param QuerySet queryset: Info queryset, None 이면 전체
+    :list return: [{'year', 'workers', 'youngs', 'etc'}, ... ]
+    """
+    queryset = Info.objects.all() if queryset is None else queryset
+    return _by_year(queryset.aggregate(**_year_sums()))
+
+
+def upload_totals(queryset=None):
+    """
+    Description:
+        업로드(filename)별 인원 수와 연도별 상시 / 청년 / 기타 근로 달 수 합계를 계산합니다. (GROUP BY filename)
+
+    :param QuerySet queryset: Info queryset, None 이면 전체
+    :list return: [{'filename', 'n_employees', 'years': [{'year', 'workers', 'youngs', 'etc'}, ... ]}, ... ]
+    """
+    queryset = Info.objects.all() if queryset is None else queryset
+    rows = (queryset.order_by()
+            .values('filename')
+            .annotate(n_employees=Count('id'), **_year_sums())
+            .order_by('filename'))
+    return [{'filename': row['filename'], 'n_employees': row['n_employees'], 'years': _by_year(row)}
+            for row in rows]
+
+
+def upload_headcounts(queryset=None):
+    """
+    Description:
+        업로드(filename)별 인원 수만 계산합니다. (filename index 만 사용합니다.)
+
+    :dict return: {filename: 인원 수}
+    """
+    queryset = Info.objects.all() if queryset is None else queryset
+    rows = queryset.order_by().values('filename').annotate(n_employees=Count('id')).values_list(
+        'filename', 'n_employees')
+    return dict(rows)
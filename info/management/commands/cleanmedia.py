@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from info.storage import SHARDS, UploadStore
+
+
+class Command(BaseCommand):
+    help = '업로드 명부 / 생성된 엑셀 파일 저장소에서 보관 기간이 지났거나 용량을 넘는 파일을 삭제합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--shards', type=int, default=16, help='이번 실행에서 검사할 shard 수 (전체 256)')
+        parser.add_argument('--all', action='store_true', help='모든 shard 를 검사합니다.')
+
+    def handle(self, *args, **options):
+        n_shards = len(SHARDS) if options['all'] else options['shards']
+        stats = UploadStore().cleanup(n_shards=n_shards)
+        self.stdout.write('shard {}~{}: {}개 파일, {} bytes 삭제'.format(
+            stats['shards'][0], stats['shards'][-1], stats['removed'], stats['freed']))
@@ -0,0 +1,42 @@
+"""
+요청 처리 metric
+
+view 별 요청 처리 시간(초)을 기록합니다. 기록한 값은 /info/metrics/ 에서 Prometheus text format 으로 제공합니다.
+(tax_refund.engine.metrics 참조)
+"""
+import functools
+import time
+
+from tax_refund.engine.metrics import REGISTRY
+
+REQUEST_SECONDS = REGISTRY.histogram('tax_refund_request_seconds', 'view 별 요청 처리 시간(초)',
+                                     ['view', 'method', 'status'])
+
+
+def timed(view_name):
+    """
+    Description:
+        view 의 요청 처리 시간을 view_name, method, 응답 status 별로 기록합니다. 예외가 발생하면 status 는 500 입니다.
+
+    Usage:
+        >>> @timed('index')
+        >>> def index(request):
+        >>>     ...
+    """
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            start = time.perf_counter()
+            status = 500
+            try:
+                response = view(request, *args, **kwargs)
+                status = response.status_code
+                return response
+            finally:
+                REQUEST_SECONDS.observe(time.perf_counter() - start, view=view_name, method=request.method,
+                                        status=status)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,43 @@
+# Generated by Django 4.1.4 on 2026-10-19 14:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Info',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('filename', models.CharField(max_length=200)),
+                ('resident_code', models.CharField(max_length=13)),
+                ('name', models.CharField(max_length=10)),
+                ('acquisi_date', models.DateField()),
+                ('disqual_date', models.DateField(blank=True, null=True)),
+                ('start_workyear', models.IntegerField()),
+                ('workdate_1', models.IntegerField()),
+                ('workdate_2', models.IntegerField()),
+                ('workdate_3', models.IntegerField()),
+                ('workdate_4', models.IntegerField()),
+                ('workdate_5', models.IntegerField()),
+                ('total_workdate', models.IntegerField()),
+                ('young_workdate_1', models.IntegerField(null=True)),
+                ('young_workdate_2', models.IntegerField(null=True)),
+                ('young_workdate_3', models.IntegerField(null=True)),
+                ('young_workdate_4', models.IntegerField(null=True)),
+                ('young_workdate_5', models.IntegerField(null=True)),
+                ('total_young_workdate', models.IntegerField(null=True)),
+                ('executive', models.BooleanField(default=False)),
+                ('contract_worker', models.BooleanField(default=False)),
+                ('army', models.BooleanField(default=False)),
+                ('elder', models.BooleanField(default=False)),
+                ('Disabled', models.BooleanField(default=False)),
+            ],
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.1.4 on 2026-10-19 14:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('info', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='info',
+            index=models.Index(fields=['filename', 'workdate_1', 'workdate_2', 'workdate_3', 'workdate_4', 'workdate_5', 'young_workdate_1', 'young_workdate_2', 'young_workdate_3', 'young_workdate_4', 'young_workdate_5'], name='info_filename_workdate_idx'),
+        ),
+    ]
@@ -30,3 +30,11 @@ class Info(models.Model):
     army = models.BooleanField(default=False)  # 군대 여부
     elder = models.BooleanField(default=False)  # 노인 여부
     Disabled = models.BooleanField(default=False)
+
+    class Meta:
+        # filename 별 집계(info.aggregates)는 이 index 만 읽습니다. (covering index, table 을 읽지 않습니다.)
+        indexes = [models.Index(fields=['filename',
+                                        'workdate_1', 'workdate_2', 'workdate_3', 'workdate_4', 'workdate_5',
+                                        'young_workdate_1', 'young_workdate_2', 'young_workdate_3',
+                                        'young_workdate_4', 'young_workdate_5'],
+                                name='info_filename_workdate_idx')]
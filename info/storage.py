@@ -0,0 +1,196 @@
+"""
+업로드 명부 / 생성된 엑셀 파일 저장소
+
+파일 내용의 sha256 hash 로 경로를 정하므로 같은 명부는 한번만 저장됩니다.
+    uploads/ab/cd/<hash>.xls      : 업로드된 사업자가입명부
+    results/ab/cd/<key>.xlsx      : 생성된 엑셀 파일
+    arrays/ab/cd/<key>/*.npy      : 계산 중간 결과 (tax_refund.engine.arrays 참조)
+    indexes/ab/cd/<hash>/*.npy    : 업로드 명부의 시점별 인원 조회 index (tax_refund.engine.intervals 참조)
+    tmp/                          : 저장 중인 파일
+
+디렉토리는 hash 앞 2자리, 다음 2자리로 나눠 한 디렉토리의 파일 수를 제한합니다.
+보관 기간(mtime 기준)이 지난 파일과 shard 별 용량을 넘는 오래된 파일은 cleanup 으로 삭제합니다.
+
+settings:
+    UPLOAD_STORE_ROOT: 저장소 경로
+    UPLOAD_RETENTION_DAYS: 업로드 명부 보관 기간(일)
+    RESULT_RETENTION_DAYS: 생성된 엑셀 파일 보관 기간(일)
+    UPLOAD_STORE_MAX_BYTES: 저장소 최대 용량, shard 별로 나눠 적용합니다.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from django.conf import settings
+
+UPLOADS = 'uploads'
+RESULTS = 'results'
+ARRAYS = 'arrays'
+INDEXES = 'indexes'
+SHARDS = ['{:02x}'.format(i) for i in range(256)]
+
+
+def result_key(digest, **params):
+    """
+    Description:
+        명부 hash 와 계산 조건으로 결과 파일 id 를 만듭니다. 같은 명부, 같은 조건이면 항상 같은 id 입니다.
+
+    :param str digest: 명부 sha256
+    :param params: 계산 조건 (공제 계산 기간 등)
+    :str return: sha256 hex
+    """
+    payload = json.dumps({'digest': digest, 'params': params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class UploadStore:
+    def __init__(self, root=None):
+        self.root = str(root or settings.UPLOAD_STORE_ROOT)
+
+    def _path(self, namespace, key, ext):
+        return os.path.join(self.root, namespace, key[:2], key[2:4], key + ext)
+
+    def upload_path(self, digest, ext):
+        return self._path(UPLOADS, digest, ext)
+
+    def result_path(self, key, ext):
+        return self._path(RESULTS, key, ext)
+
+    def array_path(self, key):
+        return self._path(ARRAYS, key, '')
+
+    def index_path(self, digest):
+        return self._path(INDEXES, digest, '')
+
+    def temp_path(self, ext):
+        """
+        Description:
+            저장소와 같은 파일 시스템에 임시 파일 경로를 만들어 반환합니다. (os.replace 로 옮길 수 있습니다.)
+        """
+        dirpath = os.path.join(self.root, 'tmp')
+        os.makedirs(dirpath, exist_ok=True)
+        fd, path = tempfile.mkstemp(suffix=ext, dir=dirpath)
+        os.close(fd)
+        return path
+
+    def _commit(self, temp_path, path):
+        # 같은 내용의 파일이 이미 있으면 새로 저장하지 않고 사용 시간만 갱신합니다.
+        if os.path.exists(path):
+            os.remove(temp_path)
+            os.utime(path)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(temp_path, path)
+        return path
+
+    def save_upload(self, uploaded_file):
+        """
+        Description:
+            업로드된 파일을 hash 하면서 저장합니다.
+
+        :param UploadedFile uploaded_file:
+        :return:
+            : str digest: 파일 내용 sha256
+            : str path: 저장된 경로
+        """
+        ext = os.path.splitext(uploaded_file.name)[-1].lower()
+        temp_path = self.temp_path(ext)
+        sha256 = hashlib.sha256()
+        with open(temp_path, 'wb') as f:
+            for chunk in uploaded_file.chunks():
+                sha256.update(chunk)
+                f.write(chunk)
+        digest = sha256.hexdigest()
+        return digest, self._commit(temp_path, self.upload_path(digest, ext))
+
+    def save_result(self, temp_path, key, ext):
+        """
+        Description:
+            temp_path 에 생성된 결과 파일을 key 경로로 옮깁니다.
+        """
+        path = self.result_path(key, ext)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(temp_path, path)
+        return path
+
+    def cleanup(self, n_shards=16, now=None):
+        """
+        Description:
+            다음 n_shards 개 shard 를 검사해 보관 기간이 지났거나 shard 용량을 넘는 오래된 파일을 삭제합니다.
+            마지막으로 검사한 shard 는 .cleanup_cursor 에 기록되므로 반복 호출하면 전체 저장소를 순서대로 검사합니다.
+
+        :param int n_shards: 한번에 검사할 shard 수
+        :param float now: 기준 시간 (time.time())
+        :dict return: {'shards': 검사한 shard, 'removed': 삭제한 파일 수, 'freed': 삭제한 용량}
+        """
+        now = now or time.time()
+        retention = {UPLOADS: settings.UPLOAD_RETENTION_DAYS * 86400,
+                     RESULTS: settings.RESULT_RETENTION_DAYS * 86400,
+                     ARRAYS: settings.RESULT_RETENTION_DAYS * 86400,
+                     INDEXES: settings.UPLOAD_RETENTION_DAYS * 86400}
+        shard_budget = settings.UPLOAD_STORE_MAX_BYTES / (len(SHARDS) * len(retention))
+
+        cursor_path = os.path.join(self.root, '.cleanup_cursor')
+        try:
+            with open(cursor_path) as f:
+                cursor = int(f.read().strip() or 0)
+        except (OSError, ValueError):
+            cursor = 0
+
+        shards = [SHARDS[(cursor + i) % len(SHARDS)] for i in range(min(n_shards, len(SHARDS)))]
+        stats = {'shards': shards, 'removed': 0, 'freed': 0}
+
+        def remove(path, size):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                return
+            stats['removed'] += 1
+            stats['freed'] += size
+
+        for namespace, max_age in retention.items():
+            for shard in shards:
+                files = []
+                for dirpath, _, filenames in os.walk(os.path.join(self.root, namespace, shard)):
+                    for filename in filenames:
+                        path = os.path.join(dirpath, filename)
+                        try:
+                            stat = os.stat(path)
+                        except FileNotFoundError:
+                            continue
+                        if now - stat.st_mtime > max_age:
+                            remove(path, stat.st_size)
+                        else:
+                            files.append((stat.st_mtime, stat.st_size, path))
+
+                # shard 용량을 넘으면 오래 사용하지 않은 파일부터 삭제합니다.
+                total = sum(size for _, size, _ in files)
+                for mtime, size, path in sorted(files):
+                    if total <= shard_budget:
+                        break
+                    remove(path, size)
+                    total -= size
+
+                # 파일이 모두 삭제된 디렉토리 (계산 중간 결과 cache 디렉토리 등) 삭제
+                shard_dir = os.path.join(self.root, namespace, shard)
+                for dirpath, _, _ in os.walk(shard_dir, topdown=False):
+                    if dirpath != shard_dir:
+                        try:
+                            os.rmdir(dirpath)
+                        except OSError:
+                            pass
+
+        # 하루 이상 남아있는 임시 파일 삭제
+        temp_dir = os.path.join(self.root, 'tmp')
+        if os.path.isdir(temp_dir):
+            for entry in os.scandir(temp_dir):
+                stat = entry.stat()
+                if now - stat.st_mtime > 86400:
+                    remove(entry.path, stat.st_size)
+
+        os.makedirs(self.root, exist_ok=True)
+        with open(cursor_path, 'w') as f:
+            f.write(str((cursor + len(shards)) % len(SHARDS)))
+        return stats
@@ -1,3 +1,254 @@
-from django.test import TestCase
+import io
+import os
+import tempfile
+import threading
+import time
+from datetime import date
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from info import admission, workers
+from info.admission import AdmissionController, Saturated, estimate_cost
+from info.aggregates import upload_totals, upload_headcounts, yearly_totals
+from info.models import Info
 
 # Create your tests here.
+
+
+def info(filename, workdates, young_workdates):
+    fields = {'workdate_{}'.format(i): n for i, n in enumerate(workdates, start=1)}
+    fields.update({'young_workdate_{}'.format(i): n for i, n in enumerate(young_workdates, start=1)})
+    return Info(filename=filename, resident_code='9001011000000', name='홍길동', acquisi_date=date(2018, 1, 1),
+                start_workyear=2018, total_workdate=sum(workdates),
+                total_young_workdate=None if None in young_workdates else sum(young_workdates), **fields)
+
+
+class AggregateTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Info.objects.bulk_create([info('a.xls', [12, 12, 12, 12, 12], [12, 12, 6, 0, 0]),
+                                  info('a.xls', [0, 3, 12, 12, 12], [None] * 5),
+                                  info('b.xls', [12, 12, 12, 0, 0], [12, 12, 12, 0, 0])])
+
+    def test_yearly_totals(self):
+        with self.assertNumQueries(1):
+            totals = yearly_totals()
+        self.assertEqual([(t['year'], t['workers'], t['youngs'], t['etc']) for t in totals],
+                         [(2018, 24, 24, 0), (2019, 27, 24, 3), (2020, 36, 18, 18), (2021, 24, 0, 24),
+                          (2022, 24, 0, 24)])
+
+    def test_upload_totals(self):
+        with self.assertNumQueries(1):
+            uploads = upload_totals()
+        self.assertEqual([(u['filename'], u['n_employees']) for u in uploads], [('a.xls', 2), ('b.xls', 1)])
+        self.assertEqual(uploads[0]['years'][1], {'year': 2019, 'workers': 15, 'youngs': 12, 'etc': 3})
+        self.assertEqual(upload_headcounts(), {'a.xls': 2, 'b.xls': 1})
+
+    def test_covering_index(self):
+        # filename 별 집계는 table 을 읽지 않고 covering index 만 사용합니다.
+        if connection.vendor != 'sqlite':
+            self.skipTest('sqlite query plan')
+        with CaptureQueriesContext(connection) as queries:
+            upload_totals()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + queries[0]['sql'])
+            plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+        self.assertIn('COVERING INDEX info_filename_workdate_idx', plan)
+
+    def test_migrations(self):
+        # Meta.indexes 는 migration 으로만 기존 database 에 생성됩니다. (info/migrations/0002_filename_workdate_idx.py)
+        call_command('makemigrations', 'info', 'result', check=True, dry_run=True, stdout=io.StringIO())
+
+    def test_admin_summary(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'admin'))
+        response = self.client.get(reverse('admin:info_info_summary'), {'filename': 'b.xls'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([u['filename'] for u in response.context['uploads']], ['b.xls'])
+
+
+class DownloadFormatTest(TestCase):
+    def download(self, export_format):
+        with open(os.path.join(settings.BASE_DIR, 'data', '사업장가입자명부.xls'), 'rb') as f:
+            return self.client.post(reverse('info:download'), {'company': 'acme', 'employee': f,
+                                                               'format': export_format})
+
+    def test_formats(self):
+        with tempfile.TemporaryDirectory() as root, \
+                override_settings(CALCULATION_WORKERS=0, UPLOAD_STORE_ROOT=root):
+            for export_format, filename, content_type in [('csv', 'acme.csv.zip', 'application/zip'),
+                                                          ('ndjson', 'acme.ndjson', 'application/x-ndjson')]:
+                response = self.client.get(self.download(export_format)['Location'])
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response['Content-Type'], content_type)
+                self.assertIn(filename, response['Content-Disposition'])
+            self.assertEqual(self.download('pdf').status_code, 400)
+
+    def test_error_removes_temp_file(self):
+        # 계산 중 오류가 나도 임시 결과 파일이 남지 않습니다.
+        with tempfile.TemporaryDirectory() as root, \
+                override_settings(CALCULATION_WORKERS=0, UPLOAD_STORE_ROOT=root), \
+                mock.patch.object(workers, 'run', side_effect=MemoryError):
+            with self.assertRaises(MemoryError):
+                self.download('csv')
+            self.assertEqual(os.listdir(os.path.join(root, 'tmp')), [])
+
+
+class WorkerTest(TestCase):
+    def test_start(self):
+        # 서버 시작시 worker 프로세스를 미리 실행하고, 계산 결과는 기본 자료형 요약만 돌려받습니다.
+        path = os.path.join(settings.BASE_DIR, 'data', '사업장가입자명부.xls')
+        with override_settings(CALCULATION_WORKERS=1):
+            try:
+                futures = workers.start()
+                self.assertEqual(len(futures), 1)
+                self.assertNotEqual(futures[0].result(timeout=60), os.getpid())
+                summary = workers.run('deductio_and_tax_summary', path, None, include_table=False)
+            finally:
+                workers.shutdown()
+        self.assertEqual((summary['deduction'], summary['tax'], summary['table']), (16000.0, 8400.0, None))
+        self.assertEqual(summary['n_workers'], [288, 293, 299, 310, 323])
+        with override_settings(CALCULATION_WORKERS=0):
+            self.assertEqual(workers.start(), [])
+
+
+class AdmissionTest(TestCase):
+    download = DownloadFormatTest.download
+
+    def test_estimate_cost(self):
+        path = os.path.join(settings.BASE_DIR, 'data', '사업장가입자명부.xls')
+        self.assertEqual(estimate_cost(path), os.path.getsize(path) // admission.EXCEL_BYTES_PER_ROW)
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, 'roster.csv')
+            with open(path, 'w') as f:
+                f.write('a,b\n' * 30)
+            self.assertEqual(estimate_cost(path), 30)
+
+    def test_round_robin(self):
+        # a 가 실행 중이고 a 3건, b 1건이 대기하면 a, b, a, a 순서로 실행됩니다.
+        # 예상 대기 시간(4 x DEFAULT_JOB_SECONDS)이 max_wait 안이므로 모두 기다립니다.
+        controller = AdmissionController(max_concurrent=1, max_cost=100, max_wait=30, max_queued_per_user=3)
+        first = controller.acquire('a', 1)
+        order, threads = [], []
+        for user in ['a', 'a', 'b', 'a']:
+            def run(user=user):
+                with controller.admit(user, 1):
+                    order.append(user)
+            threads.append(threading.Thread(target=run))
+            threads[-1].start()
+            while controller.queued < len(threads):
+                time.sleep(0.01)
+        controller.release(first)
+        for thread in threads:
+            thread.join()
+        self.assertEqual(order, ['a', 'b', 'a', 'a'])
+        self.assertEqual((controller.running, controller.running_cost, controller.queued), (0, 0, 0))
+
+    def test_cost_limit(self):
+        controller = AdmissionController(max_concurrent=4, max_cost=100, max_wait=0.05, max_queued_per_user=2)
+        big = controller.acquire('a', 500)  # 실행 중인 계산이 없으면 최대 비용보다 커도 실행됩니다.
+        with self.assertRaises(Saturated) as cm:
+            controller.acquire('b', 1)
+        self.assertEqual(cm.exception.status, 503)
+        self.assertGreaterEqual(cm.exception.retry_after, 1)
+        self.assertEqual(controller.queued, 0)
+        controller.release(big)
+        controller.release(controller.acquire('b', 60))
+
+    def test_rejects_without_waiting(self):
+        # 예상 대기 시간이 max_wait 보다 길면 요청 처리 thread 를 점유하지 않고 바로 503 으로 응답합니다.
+        controller = AdmissionController(max_concurrent=1, max_cost=100, max_wait=60, max_queued_per_user=2)
+        controller.job_seconds = 120
+        ticket = controller.acquire('a', 1)
+        results = []
+
+        def run():
+            try:
+                controller.acquire('b', 1)
+            except Saturated as e:
+                results.append(e)
+
+        thread = threading.Thread(target=run)
+        start = time.monotonic()
+        thread.start()
+        thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertEqual([(e.status, e.retry_after) for e in results], [(503, 240)])
+        self.assertEqual((controller.running, controller.queued), (1, 0))
+
+        # 예상 대기 시간이 max_wait 안이면 차례를 기다립니다.
+        controller.job_seconds = 1
+        thread = threading.Thread(target=lambda: controller.release(controller.acquire('b', 1)))
+        thread.start()
+        while controller.queued < 1:
+            time.sleep(0.01)
+        controller.release(ticket)
+        thread.join(timeout=5)
+        self.assertEqual((controller.running, controller.queued), (0, 0))
+
+    def test_saturated_response(self):
+        controller = AdmissionController(max_concurrent=1, max_cost=100, max_wait=0, max_queued_per_user=1)
+        ticket = controller.acquire('other', 1)
+        with tempfile.TemporaryDirectory() as root, \
+                override_settings(CALCULATION_WORKERS=0, UPLOAD_STORE_ROOT=root), \
+                mock.patch.object(admission, '_controller', controller):
+            response = self.download('csv')
+            self.assertEqual(response.status_code, 503)
+            self.assertGreaterEqual(int(response['Retry-After']), 1)
+
+            # 사용자 대기 요청 수를 넘으면 기다리지 않고 429 로 응답합니다.
+            controller.queues['ip:127.0.0.1'] = admission.deque([admission.Ticket('ip:127.0.0.1', 1)])
+            self.assertEqual(self.download('csv').status_code, 429)
+            del controller.queues['ip:127.0.0.1']
+
+            controller.release(ticket)
+            self.assertEqual(self.download('csv').status_code, 302)
+
+    def test_cached_roster_skips_admission(self):
+        # 중간 결과 cache 가 있는 명부는 계산 슬롯이 없어도 바로 계산합니다.
+        controller = AdmissionController(max_concurrent=1, max_cost=100, max_wait=0, max_queued_per_user=1)
+
+        def upload():
+            with open(os.path.join(settings.BASE_DIR, 'data', '사업장가입자명부.xls'), 'rb') as f:
+                return self.client.post(reverse('info:index'), {'company': 'acme', 'year': 2022, 'employee': f})
+
+        with tempfile.TemporaryDirectory() as root, \
+                override_settings(CALCULATION_WORKERS=0, UPLOAD_STORE_ROOT=root), \
+                mock.patch.object(admission, '_controller', controller):
+            ticket = controller.acquire('other', 1)
+            self.assertEqual(upload().status_code, 503)
+            controller.release(ticket)
+            self.assertEqual(upload().status_code, 200)
+
+            ticket = controller.acquire('other', 1)
+            self.assertEqual(upload().status_code, 200)
+            self.assertEqual(self.download('csv').status_code, 302)
+            controller.release(ticket)
+
+
+class MetricsTest(TestCase):
+    download = DownloadFormatTest.download
+
+    def test_metrics(self):
+        with tempfile.TemporaryDirectory() as root, \
+                override_settings(CALCULATION_WORKERS=0, UPLOAD_STORE_ROOT=root):
+            self.download('csv')
+            self.download('csv')
+        response = self.client.get(reverse('info:metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        lines = response.content.decode('utf-8').splitlines()
+        for line in ['# TYPE tax_refund_request_seconds histogram',
+                     'tax_refund_cache_requests_total{cache="result",result="hit"}',
+                     'tax_refund_stage_seconds_count{stage="workdate"}',
+                     'tax_refund_roster_rows_count',
+                     'tax_refund_calculations_total{func="deductio_and_tax_summary",result="ok"}',
+                     'tax_refund_request_seconds_count{view="download",method="POST",status="302"}']:
+            self.assertTrue(any(sample.startswith(line) for sample in lines), line)
@@ -1,6 +1,6 @@
 from django.urls import path
 
-from info.views import index, logout, graph, download
+from info.views import index, logout, graph, download, result, employed, metrics
 
 app_name = 'info'
 urlpatterns = [
@@ -8,4 +8,7 @@ urlpatterns = [
     path('logout/', logout, name='logout'),
     path('graph/', graph, name='graph'),
     path('download/', download, name='download'),
+    path('result/<str:result_id>/', result, name='result'),
+    path('employed/<str:digest>/', employed, name='employed'),
+    path('metrics/', metrics, name='metrics'),
 ]
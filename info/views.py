@@ -1,13 +1,32 @@
+import contextlib
 import os
-from django.core.files.storage import FileSystemStorage
-from django.http import HttpResponse, FileResponse
-from django.shortcuts import render
+import re
+from datetime import date, datetime, timezone
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse, FileResponse, HttpResponseBadRequest, Http404, JsonResponse
+from django.shortcuts import render, redirect
 from django.template import loader
+from django.urls import reverse
+from django.utils.http import http_date
 from django.views.decorators.csrf import csrf_exempt
-from parser import deductio_and_tax
+from django.views.decorators.http import condition, require_GET
+
+from info import workers
+from info.admission import Saturated, admit, saturated_response
+from info.metrics import timed
+from info.storage import UploadStore, result_key
+from result.models import Result
+from tax_refund.engine import END_DATE, calculation_period, target_years
+from tax_refund.engine.errors import RosterValidationError
+from tax_refund.engine.exports import DEFAULT_FORMAT, FORMATS, available_formats
+from tax_refund.engine.metrics import CACHE_REQUESTS, REGISTRY
 
 
 @csrf_exempt
+@timed('index')
 def index(request):
     if request.method == 'GET':
         return render(request, template_name='info/index.html')
@@ -16,27 +35,175 @@ def index(request):
 
         # 파일 저장
         company_name = request.POST.get('company')
-        year = int(request.POST.get('year'))
+        year = target_year(request)
+        if year is None:
+            return HttpResponseBadRequest('연도가 올바르지 않습니다.', content_type='text/plain; charset=utf-8')
         employee = request.FILES.getlist('employee')[0]
 
-        # File 저장
-        dirpath = './media'
-        fs = FileSystemStorage(location=dirpath)
-        filename = fs.save(employee.name, employee)
-        filepath = os.path.join(dirpath, filename)
+        # File 저장 (같은 명부는 한번만 저장됩니다.)
+        store = UploadStore()
+        digest, filepath = store.save_upload(employee)
 
         # 사업자 가입 명부 파싱 및 파싱 결과 저장
-        deduction, tax, table_df = deductio_and_tax(filepath, None)
+        # 동시 계산 수 / 비용 제한을 넘으면 차례를 기다립니다. (info.admission, admit_uncached 참조)
+        cache_dir = array_cache_dir(store, digest, year)
+        try:
+            with admit_uncached(request, filepath, cache_dir):
+                summary = workers.run('deductio_and_tax_summary', filepath, None, target_year=year,
+                                      backend=settings.CALCULATION_BACKEND,
+                                      cache_dir=cache_dir,
+                                      index_dir=store.index_path(digest),
+                                      n_shards=settings.CALCULATION_SHARDS)
+        except Saturated as e:
+            return saturated_response(e)
+        except RosterValidationError as e:
+            return HttpResponseBadRequest(str(e), content_type='text/plain; charset=utf-8')
+
+        # 계산 결과 요약을 저장합니다. (회사별 이력, 연도별 비교)
+        record_result(company_name, year, digest, summary)
 
-        context = {'table_df': table_df,
+        context = {'table': summary['table'],
                    'company_name': company_name,
                    'target_year': year,
-                   'deduction': deduction,
-                   'tax': tax,
-                   'filename': filename}
+                   'deduction': summary['deduction'],
+                   'tax': summary['tax'],
+                   'filename': digest}
         return render(request, template_name='info/index.html', context=context)
 
 
+def target_year(request):
+    """
+    Description:
+        요청의 공제 적용 연도를 반환합니다. 없으면 END_DATE 연도입니다.
+        숫자가 아니거나 공제 금액 테이블로 계산할 수 없는 연도(target_years 참조)이면 None 입니다.
+    """
+    try:
+        year = int(request.POST.get('year') or END_DATE[:4])
+    except ValueError:
+        return None
+    return year if year in target_years() else None
+
+
+def array_cache_dir(store, digest, year):
+    """
+    Description:
+        명부의 계산 중간 결과 cache 디렉토리를 반환합니다.
+        결과 조회(index) 후 다운로드(download)하면 명부 파싱, 근로표 계산을 다시 하지 않습니다.
+        (자격상실일이 없는 인원은 오늘 날짜까지 근무한 것으로 계산하므로 계산 날짜도 key 에 포함합니다.)
+    """
+    start_date, end_date = calculation_period(year)
+    key = result_key(digest, start_date=start_date, end_date=end_date, as_of=date.today(), on_error='raise',
+                     format='arrays')
+    return store.array_path(key)
+
+
+def admit_uncached(request, filepath, cache_dir):
+    """
+    Description:
+        중간 결과 cache(cache_dir)가 없을 때만 admission 을 거칩니다. (info.admission.admit 참조)
+        cache 가 있으면 명부 파싱, 근로표 계산을 건너뛰므로 계산 슬롯을 차지하지 않습니다.
+    """
+    if os.path.isdir(cache_dir):
+        return contextlib.nullcontext()
+    return admit(request, filepath)
+
+
+def record_result(company_name, year, digest, summary):
+    """
+    Description:
+        deductio_and_tax_summary 결과의 공제 금액, 추가 납부 금액과 연도별 상시/청년 근로 달 수, 최초 공제를
+        공제 적용 연도(year)의 결과로 저장합니다.
+    """
+    return Result.record(company=company_name or '',
+                         year=year,
+                         roster_digest=digest,
+                         deduction=summary['deduction'],
+                         clawback=summary['tax'],
+                         n_employees=summary['n_employees'],
+                         years=summary['years'],
+                         n_workers=summary['n_workers'],
+                         n_youngs=summary['n_youngs'],
+                         first_deductions=summary['first_deductions'])
+
+
+def employed_frame(digest, date, end=None, categories=None):
+    """
+    Description:
+        업로드 명부의 interval index 로 date 에 (end 가 있으면 date ~ end 기간 중) 근무한 인원과 인정 기간을 조회합니다.
+        index 가 없으면(보관 기간이 지났거나 계산 전인 명부) Http404, 날짜나 구분이 잘못되면 ValueError 가 발생합니다.
+
+    :param str digest: 명부 sha256
+    :param str date: yyyy-mm-dd
+    :param str end: yyyy-mm-dd
+    :param list categories: ['상시', '청년', '노인', '장애인'] 중 조회할 구분, None 이면 전체
+    :DataFrame return: RosterIntervalIndex._frame 참조
+    """
+    # 조회 요청에서만 numpy, pandas 를 import 합니다. (계산은 worker 프로세스에서 실행됩니다.)
+    from tax_refund.engine.intervals import CATEGORIES, RosterIntervalIndex
+
+    if not re.fullmatch(r'[0-9a-f]{64}', digest):
+        raise Http404
+    index = RosterIntervalIndex.load(UploadStore().index_path(digest))
+    if index is None:
+        raise Http404
+    if categories and not set(categories) <= set(CATEGORIES):
+        raise ValueError('category 는 {} 중 하나입니다.'.format(', '.join(CATEGORIES)))
+    date = datetime.strptime(date or '', '%Y-%m-%d')
+    if end:
+        return index.between(date, datetime.strptime(end, '%Y-%m-%d'), categories)
+    return index.at(date, categories)
+
+
+def employed_records(df):
+    """
+    Description:
+        employed_frame 결과를 [{'index', 'name', 'category', 'start', 'end'}, ...] 로 변환합니다.
+        날짜는 yyyy-mm-dd, 종료일이 없으면(자격상실일 없음) None 입니다.
+    """
+    # NaT != NaT
+    return [{'index': int(row['index']),
+             'name': row['이름'],
+             'category': row['구분'],
+             'start': row['시작일'].date().isoformat(),
+             'end': row['종료일'].date().isoformat() if row['종료일'] == row['종료일'] else None}
+            for _, row in df.iterrows()]
+
+
+@staff_member_required
+@require_GET
+def employed(request, digest):
+    """
+    Description:
+        업로드 명부의 시점별 인원을 JSON 으로 제공합니다.
+        인원 이름과 근무 기간을 제공하므로 staff 계정만 조회할 수 있습니다. (로그인하지 않으면 admin 로그인으로 이동합니다.)
+            ?date=2022-12-31                    : 해당 날짜(월말)에 근무한 인원
+            ?date=2022-01-01&end=2022-12-31     : 기간 중 하루라도 근무한 인원
+            &category=청년&category=노인          : 조회할 구분, 없으면 전체
+    """
+    try:
+        df = employed_frame(digest, request.GET.get('date'), request.GET.get('end'),
+                            request.GET.getlist('category'))
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e), content_type='text/plain; charset=utf-8')
+
+    return JsonResponse({'digest': digest,
+                         'date': request.GET.get('date'),
+                         'end': request.GET.get('end'),
+                         'counts': {category: int(n) for category, n in df.groupby('구분')['index'].nunique().items()},
+                         'employees': employed_records(df)},
+                        json_dumps_params={'ensure_ascii': False})
+
+
+@require_GET
+def metrics(request):
+    """
+    Description:
+        요청 처리 시간, 계산 단계별 처리 시간, 명부 행 수, cache 조회 결과 등을 Prometheus text format 으로 제공합니다.
+        (요청 처리 프로세스별 값입니다. tax_refund.engine.metrics 참조)
+    """
+    return HttpResponse(REGISTRY.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
 def logout(request):
     return ""
 
@@ -49,25 +216,162 @@ def graph(request):
 
 
 @csrf_exempt
+@timed('download')
 def download(request):
     # 파일 저장
     company_name = request.POST.get('company')
+    year = target_year(request)
+    if year is None:
+        return HttpResponseBadRequest('연도가 올바르지 않습니다.', content_type='text/plain; charset=utf-8')
     employee = request.FILES.getlist('employee')[0]
 
-    # 사업자 가입 명부 파일 저장
-    dirpath = './media'
-    fs = FileSystemStorage(location=dirpath)
-    filename = fs.save(employee.name, employee)
-    filename_ext = os.path.splitext(filename)[-1]
-    filepath = os.path.join(dirpath, filename)
-
-    # 사업자 가입 명부 파싱 및 파싱 결과 저장
-    save_name = company_name + '{}'.format(filename_ext)
-    save_path = os.path.join(dirpath, save_name)
-    _ = deductio_and_tax(filepath, save_path=save_path)
-
-    # 다운로드 제공
-    fs = FileSystemStorage(dirpath)
-    response = FileResponse(fs.open(save_name, 'rb'), content_type='application/force-download')
-    response['Content-Disposition'] = 'attachment; filename="{}"'.format(save_name).encode('utf-8')
+    # 사업자 가입 명부 파일 저장 (같은 명부는 한번만 저장됩니다.)
+    store = UploadStore()
+    digest, filepath = store.save_upload(employee)
+
+    # 결과 파일 형식 (xlsx, 연동용 csv / parquet / ndjson, tax_refund.engine.exports 참조)
+    export_format = request.POST.get('format') or DEFAULT_FORMAT
+    if export_format not in available_formats():
+        return HttpResponseBadRequest('지원하지 않는 형식입니다: {}'.format(export_format),
+                                      content_type='text/plain; charset=utf-8')
+    ext = FORMATS[export_format][0]
+
+    # 같은 명부, 같은 계산 조건의 결과가 있으면 다시 계산하지 않습니다.
+    # (자격상실일이 없는 인원은 오늘 날짜까지 근무한 것으로 계산하므로 계산 날짜도 조건에 포함합니다.)
+    start_date, end_date = calculation_period(year)
+    result_id = result_key(digest, start_date=start_date, end_date=end_date, as_of=date.today(),
+                           format=export_format)
+    cached = os.path.exists(store.result_path(result_id, ext))
+    CACHE_REQUESTS.inc(cache='result', result='hit' if cached else 'miss')
+    if not cached:
+        # 사업자 가입 명부 파싱 및 파싱 결과 저장 (동시 계산 수 / 비용 제한을 넘으면 차례를 기다립니다.)
+        try:
+            cache_dir = array_cache_dir(store, digest, year)
+            with admit_uncached(request, filepath, cache_dir):
+                save_path = store.temp_path(ext)
+                try:
+                    workers.run('deductio_and_tax_summary', filepath, save_path=save_path, include_table=False,
+                                target_year=year, backend=settings.CALCULATION_BACKEND, cache_dir=cache_dir,
+                                index_dir=store.index_path(digest), export_format=export_format,
+                                n_shards=settings.CALCULATION_SHARDS)
+                except RosterValidationError as e:
+                    os.remove(save_path)
+                    return HttpResponseBadRequest(str(e), content_type='text/plain; charset=utf-8')
+                except Exception:
+                    # 계산 / 저장 중 오류가 나면 만들다 만 결과 파일을 남기지 않습니다.
+                    if os.path.exists(save_path):
+                        os.remove(save_path)
+                    raise
+        except Saturated as e:
+            return saturated_response(e)
+        store.save_result(save_path, result_id, ext)
+
+    # 다운로드는 result id 주소(GET)로 제공합니다.
+    url = reverse('info:result', args=[result_id])
+    return redirect(url + '?' + urlencode({'name': company_name}), permanent=False)
+
+
+class RangeFile:
+    """
+    파일의 start 부터 length bytes 만 읽는 file-like 객체 (Range 요청 응답용)
+    """
+
+    def __init__(self, file, start, length):
+        self.file = file
+        self.file.seek(start)
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """
+    Description:
+        Range header 에서 하나의 byte 범위를 추출합니다. (여러 범위 요청은 지원하지 않습니다.)
+
+    :param str header: example) 'bytes=0-1023', 'bytes=1024-', 'bytes=-512'
+    :param int size: 파일 크기
+    :return: (start, end) 또는 범위가 잘못된 경우 None
+    """
+    match = re.fullmatch(r'bytes=(\d*)-(\d*)', header.strip())
+    if not match or match.group(1) == match.group(2) == '':
+        return None
+    if match.group(1) == '':
+        start, end = max(size - int(match.group(2)), 0), size - 1
+    else:
+        start = int(match.group(1))
+        end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+    if start > end or start >= size:
+        return None
+    return start, end
+
+
+def _result_path(request, result_id):
+    """
+    Description:
+        result id 의 결과 파일 경로와 형식을 반환합니다. (result id 에 형식이 포함되어 있으므로 하나만 있습니다.)
+    """
+    if not re.fullmatch(r'[0-9a-f]{64}', result_id):
+        raise Http404
+    store = UploadStore()
+    for export_format, (ext, _, _) in FORMATS.items():
+        path = store.result_path(result_id, ext)
+        if os.path.exists(path):
+            return path, export_format
+    raise Http404
+
+
+def _result_etag(request, result_id):
+    # 결과 파일 내용은 명부 hash 와 계산 조건(result id)으로 정해집니다.
+    return result_id
+
+
+def _result_last_modified(request, result_id):
+    path, _ = _result_path(request, result_id)
+    return datetime.fromtimestamp(os.path.getmtime(path), tz=timezone.utc)
+
+
+@require_GET
+@condition(etag_func=_result_etag, last_modified_func=_result_last_modified)
+def result(request, result_id):
+    """
+    Description:
+        생성된 결과 파일(엑셀 등)을 result id 로 제공합니다.
+        ETag, Last-Modified 조건부 요청에는 304, Range 요청에는 206 으로 응답합니다.
+    """
+    path, export_format = _result_path(request, result_id)
+    ext, content_type, _ = FORMATS[export_format]
+    size = os.path.getsize(path)
+    filename = (request.GET.get('name') or result_id) + ext
+
+    # If-Range 가 현재 ETag 와 다르면 전체 파일을 제공합니다.
+    byte_range = None
+    if 'HTTP_RANGE' in request.META and request.META.get('HTTP_IF_RANGE', '"{}"'.format(result_id)) in (
+            '"{}"'.format(result_id), http_date(os.path.getmtime(path))):
+        byte_range = parse_range(request.META['HTTP_RANGE'], size)
+        if byte_range is None:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = 'bytes */{}'.format(size)
+            return response
+
+    if byte_range is None:
+        # 전체 파일은 wsgi.file_wrapper(sendfile) 로 복사 없이 전송됩니다.
+        response = FileResponse(open(path, 'rb'), content_type=content_type, as_attachment=True,
+                                filename=filename)
+    else:
+        start, end = byte_range
+        response = FileResponse(RangeFile(open(path, 'rb'), start, end - start + 1), status=206,
+                                content_type=content_type, as_attachment=True, filename=filename)
+        response['Content-Length'] = str(end - start + 1)
+        response['Content-Range'] = 'bytes {}-{}/{}'.format(start, end, size)
+    response['Accept-Ranges'] = 'bytes'
+    response['Cache-Control'] = 'private, max-age=86400'
     return response
@@ -0,0 +1,138 @@
+"""
+세액 공제 계산 worker pool
+
+pandas, numpy 와 parser 를 미리 import 하고 달력/공제율 cache 를 준비해 둔 프로세스들이 계산을 처리합니다.
+view 는 로컬 IPC(pipe) 로 작업을 전달하고 결과를 기다리므로 요청 처리 프로세스가 무거운 계산과 import 비용을 지지 않습니다.
+
+settings:
+    CALCULATION_WORKERS: worker 프로세스 수, 0 이면 요청 처리 프로세스에서 직접 계산합니다.
+    CALCULATION_MAX_JOBS_PER_WORKER: worker 하나가 처리할 최대 작업 수, 이후 새 worker 로 교체되어 메모리 증가를 제한합니다.
+    CALCULATION_BACKEND: 계산 backend ('numpy' 또는 'pandas'), view 가 작업마다 전달합니다.
+    CALCULATION_SHARDS: 큰 명부 하나를 나눠 계산할 최대 프로세스 수, worker 가 shard 프로세스를 추가로 사용합니다.
+
+worker 는 서버 시작시(wsgi, asgi) start 로 미리 실행해 첫 요청이 프로세스 시작과 import 비용을 지지 않습니다.
+결과는 view 에서 사용하는 값만 기본 자료형으로 돌려받습니다. (parser.deductio_and_tax_summary 참조)
+
+worker 에서 기록한 계산 단계 metric 은 결과와 함께 돌려받아 요청 처리 프로세스의 registry 에 반영합니다.
+(tax_refund.engine.metrics 참조)
+
+worker 는 여러 계산에 재사용되므로 메모리 증가를 확인할 때는 TAX_REFUND_MEMORY_TRACE=1 로 서버를 실행합니다.
+계산마다 단계별 최대 사용 메모리와 해제되지 않은 메모리가 출력됩니다. (tax_refund.engine.memory 참조)
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+from tax_refund.engine.errors import RosterValidationError
+from tax_refund.engine.metrics import REGISTRY, capture
+
+_pool = None
+_pool_lock = threading.Lock()
+
+CALCULATIONS = REGISTRY.counter('tax_refund_calculations_total', '계산 요청 수 (result: ok / invalid / error)',
+                                ['func', 'result'])
+
+
+def warm_up():
+    """
+    Description:
+        worker 프로세스 시작시 parser, pandas 를 import 하고 공제 계산 기간의 달력, 공제율 테이블 cache 를 채웁니다.
+    """
+    # 계산 backend 모듈도 미리 import 합니다.
+    from tax_refund.engine import backends, parser  # noqa: F401
+
+    parser.calendar_grid(parser.START_DATE, parser.END_DATE)
+    parser.deduction_table(True)
+    parser.deduction_table(False)
+
+
+def call(func_name, args, kwargs):
+    """
+    Description:
+        parser 의 func_name 함수를 호출합니다. (worker 프로세스에서 실행됩니다.)
+        함수 결과와 함께 실행 중 기록한 metric 을 반환합니다. 함수에서 예외가 발생하면 metric 은 버립니다.
+
+    :return: (함수 결과, metrics.capture 참조)
+    """
+    from tax_refund.engine import parser
+
+    with capture() as events:
+        result = getattr(parser, func_name)(*args, **kwargs)
+    return result, events
+
+
+def get_pool():
+    """
+    Description:
+        worker pool 을 반환합니다. 처음 호출될 때 생성합니다.
+
+    :ProcessPoolExecutor return:
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=settings.CALCULATION_WORKERS,
+                                        mp_context=multiprocessing.get_context('spawn'),
+                                        initializer=warm_up,
+                                        max_tasks_per_child=settings.CALCULATION_MAX_JOBS_PER_WORKER)
+    return _pool
+
+
+def start():
+    """
+    Description:
+        worker pool 을 만들고 worker 수 만큼 warm-up 작업을 보내 worker 프로세스를 미리 시작합니다.
+        (worker 는 시작시 warm_up 을 실행합니다.) 작업이 끝날때 까지 기다리지 않습니다.
+
+    :list return: warm-up 작업 Future 목록, CALCULATION_WORKERS 가 0 이면 빈 list
+    """
+    if not settings.CALCULATION_WORKERS:
+        return []
+    pool = get_pool()
+    return [pool.submit(os.getpid) for _ in range(settings.CALCULATION_WORKERS)]
+
+
+def shutdown(wait=True):
+    """
+    Description:
+        worker pool 을 종료합니다. 진행 중인 작업은 wait=True 이면 끝날때 까지 기다립니다.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=wait)
+            _pool = None
+
+
+def run(func_name, *args, **kwargs):
+    """
+    Description:
+        parser 의 func_name 함수를 worker 에서 실행하고 결과를 반환합니다.
+
+    Usage:
+        >>> summary = run('deductio_and_tax_summary', filepath, None)
+    """
+    try:
+        if not settings.CALCULATION_WORKERS:
+            result, events = call(func_name, args, kwargs)
+        else:
+            result, events = get_pool().submit(call, func_name, args, kwargs).result()
+    except RosterValidationError:
+        CALCULATIONS.inc(func=func_name, result='invalid')
+        raise
+    except BrokenProcessPool:
+        # worker 가 비정상 종료되면 다음 요청을 위해 pool 을 새로 만듭니다.
+        CALCULATIONS.inc(func=func_name, result='error')
+        shutdown(wait=False)
+        raise
+    except Exception:
+        CALCULATIONS.inc(func=func_name, result='error')
+        raise
+
+    REGISTRY.replay(events)
+    CALCULATIONS.inc(func=func_name, result='ok')
+    return result
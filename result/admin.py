@@ -1,3 +1,79 @@
 from django.contrib import admin
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils.html import format_html
 
 # Register your models here.
+from info.views import employed_frame, employed_records
+from result.models import FirstDeduction, Result, YearlyHeadcount
+
+
+class YearlyHeadcountInline(admin.TabularInline):
+    model = YearlyHeadcount
+    extra = 0
+
+
+class FirstDeductionInline(admin.TabularInline):
+    model = FirstDeduction
+    extra = 0
+
+
+class ResultAdmin(admin.ModelAdmin):
+    model = Result
+    list_display = ['company',
+                    'year',
+                    'deduction',
+                    'clawback',
+                    'n_employees',
+                    'created_at',
+                    'employed_link']
+    list_filter = ['year']
+    search_fields = ['company']
+    inlines = [YearlyHeadcountInline, FirstDeductionInline]
+
+    def get_urls(self):
+        urls = [path('<int:result_id>/employed/', self.admin_site.admin_view(self.employed_view),
+                     name='result_result_employed')]
+        return urls + super().get_urls()
+
+    @admin.display(description='시점별 인원')
+    def employed_link(self, obj):
+        return format_html('<a href="{}">조회</a>', reverse('admin:result_result_employed', args=[obj.pk]))
+
+    def employed_view(self, request, result_id):
+        """
+        Description:
+            계산 결과의 명부로 특정 날짜(월말)에 상시 / 청년 근로자로 인정된 인원과 인정 기간을 조회합니다.
+            (info.views.employed_frame 참조)
+        """
+        from tax_refund.engine.intervals import CATEGORIES
+
+        result = get_object_or_404(Result, pk=result_id)
+        date = request.GET.get('date') or '{}-12-31'.format(result.year)
+        end = request.GET.get('end') or ''
+        categories = request.GET.getlist('category')
+
+        rows, error = None, None
+        try:
+            rows = employed_records(employed_frame(result.roster_digest, date, end or None, categories))
+        except ValueError as e:
+            error = str(e)
+        except Http404:
+            error = '명부 index 가 없습니다. (보관 기간이 지났거나 index 저장 전에 계산된 명부입니다.)'
+
+        context = dict(self.admin_site.each_context(request),
+                       opts=self.model._meta,
+                       title='{} {} 시점별 인원'.format(result.company, result.year),
+                       result=result,
+                       date=date,
+                       end=end,
+                       categories=categories,
+                       all_categories=CATEGORIES,
+                       rows=rows,
+                       error=error)
+        return TemplateResponse(request, 'admin/result/result/employed.html', context)
+
+
+admin.site.register(Result, ResultAdmin)
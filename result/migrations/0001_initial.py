@@ -0,0 +1,77 @@
+# Generated by Django 4.1.4 on 2026-10-19 14:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FirstDeduction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField()),
+                ('young', models.IntegerField()),
+                ('etc', models.IntegerField()),
+            ],
+            options={
+                'ordering': ['year'],
+            },
+        ),
+        migrations.CreateModel(
+            name='Result',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('company', models.CharField(max_length=100)),
+                ('year', models.IntegerField()),
+                ('roster_digest', models.CharField(max_length=64)),
+                ('deduction', models.FloatField()),
+                ('clawback', models.FloatField()),
+                ('n_employees', models.IntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-year', '-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='YearlyHeadcount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.IntegerField()),
+                ('workers', models.IntegerField()),
+                ('youngs', models.IntegerField()),
+                ('result', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='headcounts', to='result.result')),
+            ],
+            options={
+                'ordering': ['year'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(fields=['company', 'year', '-created_at'], name='result_company_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='result',
+            index=models.Index(fields=['year'], name='result_year_idx'),
+        ),
+        migrations.AddField(
+            model_name='firstdeduction',
+            name='result',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='first_deductions', to='result.result'),
+        ),
+        migrations.AddConstraint(
+            model_name='yearlyheadcount',
+            constraint=models.UniqueConstraint(fields=('result', 'year'), name='headcount_result_year_unique'),
+        ),
+        migrations.AddIndex(
+            model_name='firstdeduction',
+            index=models.Index(fields=['result', 'year'], name='first_deduction_year_idx'),
+        ),
+    ]
@@ -1,3 +1,85 @@
-from django.db import models
+from django.db import models, transaction
+
 
 # Create your models here.
+
+class Result(models.Model):
+    """
+    업로드된 명부별 공제 계산 결과 요약
+
+    회사별 이력, 연도별 비교는 company, year index 로 조회합니다. (명부를 다시 계산하지 않습니다.)
+    """
+    company = models.CharField(max_length=100)  # 회사 이름
+    year = models.IntegerField()  # 공제 적용 연도
+    roster_digest = models.CharField(max_length=64)  # 명부 sha256 (info.storage 참조)
+    deduction = models.FloatField()  # 공제 금액
+    clawback = models.FloatField()  # 추가 납부 금액
+    n_employees = models.IntegerField()  # 명부 인원 수
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-year', '-created_at']
+        indexes = [models.Index(fields=['company', 'year', '-created_at'], name='result_company_year_idx'),
+                   models.Index(fields=['year'], name='result_year_idx')]
+
+    def __str__(self):
+        return '{} {}'.format(self.company, self.year)
+
+    @classmethod
+    def record(cls, company, year, roster_digest, deduction, clawback, n_employees, years, n_workers, n_youngs,
+               first_deductions):
+        """
+        Description:
+            계산 결과와 연도별 상시/청년 근로 달 수, 최초 공제 정보를 한번에 저장합니다.
+
+        Args:
+            :param str company: 회사 이름
+            :param int year: 공제 적용 연도
+            :param str roster_digest: 명부 sha256
+            :param float deduction: 공제 금액
+            :param float clawback: 추가 납부 금액
+            :param int n_employees: 명부 인원 수
+            :param list years: [int, int, ... int]
+            :param list n_workers: 연도별 상시 근로 달 수 합계
+            :param list n_youngs: 연도별 청년 근로 달 수 합계
+            :param list first_deductions: [[최초 공제 연도, 청년 공제 증가, 기타 공제 증가], ...]
+                (parser.deductio_and_tax_summary 결과를 그대로 사용합니다.)
+
+        :Result return:
+        """
+        with transaction.atomic():
+            result = cls.objects.create(company=company, year=year, roster_digest=roster_digest,
+                                        deduction=deduction, clawback=clawback, n_employees=n_employees)
+            YearlyHeadcount.objects.bulk_create(
+                [YearlyHeadcount(result=result, year=year_, workers=workers, youngs=youngs)
+                 for year_, workers, youngs in zip(years, n_workers, n_youngs)])
+            FirstDeduction.objects.bulk_create(
+                [FirstDeduction(result=result, year=year_, young=young, etc=etc)
+                 for year_, young, etc in first_deductions])
+        return result
+
+
+class YearlyHeadcount(models.Model):
+    result = models.ForeignKey(Result, on_delete=models.CASCADE, related_name='headcounts')
+    year = models.IntegerField()
+    workers = models.IntegerField()  # 상시 근로 달 수 합계
+    youngs = models.IntegerField()  # 청년 근로 달 수 합계
+
+    class Meta:
+        ordering = ['year']
+        constraints = [models.UniqueConstraint(fields=['result', 'year'], name='headcount_result_year_unique')]
+
+    @property
+    def etc(self):
+        return self.workers - self.youngs  # 기타 근로 달 수 합계
+
+
+class FirstDeduction(models.Model):
+    result = models.ForeignKey(Result, on_delete=models.CASCADE, related_name='first_deductions')
+    year = models.IntegerField()  # 최초 공제 연도
+    young = models.IntegerField()  # 작년 대비 청년 근로 달 수 차이
+    etc = models.IntegerField()  # 작년 대비 기타 근로 달 수 차이
+
+    class Meta:
+        ordering = ['year']
+        indexes = [models.Index(fields=['result', 'year'], name='first_deduction_year_idx')]
@@ -1,3 +1,114 @@
-from django.test import TestCase
+import os
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from result.models import Result
 
 # Create your tests here.
+
+YEARS = [2018, 2019, 2020, 2021, 2022]
+
+
+class ResultTest(TestCase):
+    def record(self, company, year, deduction, clawback):
+        return Result.record(company=company, year=year, roster_digest='0' * 64, deduction=deduction,
+                             clawback=clawback, n_employees=103, years=YEARS,
+                             n_workers=[288, 293, 299, 310, 323], n_youngs=[73, 66, 65, 68, 77],
+                             first_deductions=[[2019, -7, 12], [2020, -1, 7], [2021, 3, 8], [2022, 9, 4]])
+
+    def test_record(self):
+        result = self.record('A', 2022, 16000.0, 8400.0)
+        self.assertEqual([(h.year, h.workers, h.youngs, h.etc) for h in result.headcounts.all()][-1],
+                         (2022, 323, 77, 246))
+        self.assertEqual([(f.year, f.young, f.etc) for f in result.first_deductions.all()],
+                         [(2019, -7, 12), (2020, -1, 7), (2021, 3, 8), (2022, 9, 4)])
+
+    def test_history_by_company(self):
+        self.record('A', 2021, 13100.0, 7700.0)
+        self.record('A', 2022, 16000.0, 8400.0)
+        self.record('B', 2022, 1.0, 0.0)
+
+        # 회사 이력 조회 1번 + headcounts, first_deductions prefetch 2번
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('result:index'), {'company': 'A'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result.year for result in response.context['results']], [2022, 2021])
+        comparison = response.context['comparisons'][-1]
+        self.assertEqual((comparison['result'].year, comparison['deduction_diff'], comparison['clawback_diff']),
+                         (2022, 2900.0, 700.0))
+
+    def test_index_upload_records_result(self):
+        # 업로드 후 계산 결과가 저장되는지 확인합니다. (worker 없이 직접 계산)
+        with tempfile.TemporaryDirectory() as root, \
+                override_settings(CALCULATION_WORKERS=0, UPLOAD_STORE_ROOT=root), \
+                open(os.path.join(settings.BASE_DIR, 'data', '사업장가입자명부.xls'), 'rb') as f:
+            response = self.client.post(reverse('info:index'), {'company': '새마을금고', 'year': 2022, 'employee': f})
+        self.assertContains(response, '합계')
+
+        result = Result.objects.get(company='새마을금고')
+        self.assertEqual((result.year, result.deduction, result.clawback), (2022, 16000.0, 8400.0))
+        self.assertEqual([h.workers for h in result.headcounts.all()], [288, 293, 299, 310, 323])
+        # 최초 공제는 계산 엔진(parser.first_deduction) 결과를 저장합니다.
+        self.assertEqual([(f.year, f.young, f.etc) for f in result.first_deductions.all()],
+                         [(2019, -7, 12), (2020, -1, 7), (2021, 3, 8), (2022, 9, 4)])
+
+    def test_index_upload_compares_years(self):
+        # 같은 명부를 2021년, 2022년 공제 적용 연도로 업로드하면 연도별 비교에 작년 결과가 사용됩니다.
+        with tempfile.TemporaryDirectory() as root, \
+                override_settings(CALCULATION_WORKERS=0, UPLOAD_STORE_ROOT=root):
+            for year in [2021, 2022]:
+                with open(os.path.join(settings.BASE_DIR, 'data', '사업장가입자명부.xls'), 'rb') as f:
+                    self.client.post(reverse('info:index'), {'company': '새마을금고', 'year': year, 'employee': f})
+            self.assertEqual(self.client.post(reverse('info:index'), {'company': '새마을금고', 'year': '2022년'}).status_code,
+                             400)
+            # 공제 금액 테이블로 계산할 수 없는 연도는 계산하지 않습니다.
+            for year in ['1', '2016', '2020', '2024']:
+                with self.subTest(year=year):
+                    response = self.client.post(reverse('info:index'), {'company': '새마을금고', 'year': year})
+                    self.assertEqual(response.status_code, 400)
+
+        result_2021 = Result.objects.get(company='새마을금고', year=2021)
+        self.assertEqual((result_2021.deduction, result_2021.clawback), (13100.0, 7700.0))
+        self.assertEqual([h.year for h in result_2021.headcounts.all()], [2017, 2018, 2019, 2020, 2021])
+
+        response = self.client.get(reverse('result:index'), {'company': '새마을금고'})
+        comparison = response.context['comparisons'][-1]
+        self.assertEqual((comparison['result'].year, comparison['deduction_diff'], comparison['clawback_diff']),
+                         (2022, 2900.0, 700.0))
+
+    def test_employed_after_upload(self):
+        # 업로드한 명부의 interval index 로 시점별 인원을 조회합니다. (API, admin)
+        with tempfile.TemporaryDirectory() as root, \
+                override_settings(CALCULATION_WORKERS=0, UPLOAD_STORE_ROOT=root):
+            with open(os.path.join(settings.BASE_DIR, 'data', '사업장가입자명부.xls'), 'rb') as f:
+                self.client.post(reverse('info:index'), {'company': '새마을금고', 'year': 2022, 'employee': f})
+            result = Result.objects.get(company='새마을금고')
+
+            # 로그인하지 않았거나 staff 가 아니면 admin 로그인으로 이동합니다.
+            url = reverse('info:employed', args=[result.roster_digest])
+            self.assertRedirects(self.client.get(url, {'date': '2022-12-31'}),
+                                 reverse('admin:login') + '?next=' + url + '%3Fdate%3D2022-12-31',
+                                 fetch_redirect_response=False)
+            self.client.force_login(User.objects.create_user('user', 'user@example.com', 'user'))
+            self.assertEqual(self.client.get(url, {'date': '2022-12-31'}).status_code, 302)
+
+            self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'admin'))
+            response = self.client.get(reverse('info:employed', args=[result.roster_digest]),
+                                       {'date': '2022-12-31', 'category': '상시'})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()['counts']['상시'], len(response.json()['employees']))
+            self.assertEqual(self.client.get(reverse('info:employed', args=[result.roster_digest]),
+                                             {'date': '2022-12'}).status_code, 400)
+            self.assertEqual(self.client.get(reverse('info:employed', args=['0' * 64]),
+                                             {'date': '2022-12-31'}).status_code, 404)
+
+            response = self.client.get(reverse('admin:result_result_employed', args=[result.pk]),
+                                       {'date': '2022-12-31', 'category': '상시'})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.context['rows']), len(self.client.get(
+                reverse('info:employed', args=[result.roster_digest]),
+                {'date': '2022-12-31', 'category': '상시'}).json()['employees']))
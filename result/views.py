@@ -1,8 +1,33 @@
-from django.http import HttpResponse
 from django.shortcuts import render
 
+from result.models import Result
+
 
 # Create your views here.
 
 def index(request):
-    return HttpResponse(200)
+    """
+    Description:
+        회사별 계산 이력과 연도별 비교를 보여줍니다.
+        (company, year) index 로 한번에 조회하며 명부를 다시 계산하지 않습니다.
+        같은 연도 결과가 여러개면 가장 최근 결과로 연도별 비교를 합니다.
+    """
+    company = request.GET.get('company')
+    results = Result.objects.all()
+    if company:
+        results = results.filter(company=company)
+    results = list(results.prefetch_related('headcounts', 'first_deductions')[:100])
+
+    # 연도별 최근 결과, 작년 대비 공제 금액 / 추가 납부 금액 차이
+    latest = {}
+    for result in results:
+        latest.setdefault((result.company, result.year), result)
+    comparisons = []
+    for (company_, year), result in sorted(latest.items()):
+        previous = latest.get((company_, year - 1))
+        comparisons.append({'result': result,
+                            'deduction_diff': result.deduction - previous.deduction if previous else None,
+                            'clawback_diff': result.clawback - previous.clawback if previous else None})
+
+    context = {'company': company, 'results': results, 'comparisons': comparisons}
+    return render(request, template_name='results/index.html', context=context)
@@ -0,0 +1,42 @@
+"""
+세액 공제 계산 엔진
+
+pandas, numpy 를 사용하는 무거운 모듈이므로 이 package 는 아무것도 import 하지 않습니다.
+필요한 곳에서 `from tax_refund.engine import parser` 처럼 직접 import 하세요.
+"""
+
+# 공제 계산 기간
+START_DATE = '2018-01-01'
+END_DATE = '2022-12-31'
+
+# 공제 금액 테이블(parser.deduction_table)이 있는 연도
+DEDUCTION_YEARS = range(2018, 2024)
+
+# 엑셀 변환 없이 직접 읽는 명부 확장자 (parser.csv_rows 참조)
+CSV_EXTENSIONS = ['.csv', '.tsv', '.txt']
+
+
+def calculation_period(target_year=None):
+    """
+    Description:
+        target_year 를 마지막 연도로 하는 공제 계산 기간을 반환합니다. (START_DATE ~ END_DATE 와 같은 연도 수)
+
+    :param int target_year: 공제 적용 연도, None 이면 END_DATE 연도
+    :return: (start_date, end_date) yyyy-mm-dd
+    """
+    if target_year is None:
+        return START_DATE, END_DATE
+    n_years = int(END_DATE[:4]) - int(START_DATE[:4])
+    return '{}-01-01'.format(int(target_year) - n_years), '{}-12-31'.format(int(target_year))
+
+
+def target_years():
+    """
+    Description:
+        공제 적용 연도로 계산할 수 있는 연도를 반환합니다.
+        계산 기간의 첫 연도는 작년 대비 증감의 기준으로만 사용되므로 나머지 연도의 공제 금액이 DEDUCTION_YEARS 에 있어야 합니다.
+
+    :range return:
+    """
+    n_years = int(END_DATE[:4]) - int(START_DATE[:4])
+    return range(DEDUCTION_YEARS.start + n_years - 1, DEDUCTION_YEARS.stop)
@@ -0,0 +1,67 @@
+"""
+계산 중간 결과(ndarray) 디렉토리 cache
+
+명부별 인원 index, 이름, 연도별 상시/청년 근무 달 수 등을 .npy 파일로 저장하고 읽기 전용 memory-map 으로 로드합니다.
+    - 같은 명부를 다시 export 할 때 명부 파싱, 근로표 계산 단계를 건너뜁니다.
+    - memory-map 은 복사 없이 page cache 를 공유하므로 여러 worker 프로세스가 같은 파일을 동시에 사용할 수 있습니다.
+
+디렉토리는 임시 디렉토리에 모두 저장한 뒤 이름을 바꾸므로 일부만 저장된 cache 는 보이지 않습니다.
+"""
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+
+def save_arrays(directory, **arrays):
+    """
+    Description:
+        arrays 를 directory/<name>.npy 로 저장합니다. 이미 directory 가 있으면 저장하지 않습니다.
+
+    :param str directory: cache 디렉토리
+    :param arrays: {name: ndarray} (object dtype 은 저장할 수 없습니다.)
+    """
+    if os.path.isdir(directory):
+        return
+    parent = os.path.dirname(directory)
+    os.makedirs(parent, exist_ok=True)
+    temp_dir = tempfile.mkdtemp(dir=parent, prefix='.tmp-')
+    try:
+        for name, array in arrays.items():
+            np.save(os.path.join(temp_dir, name + '.npy'), np.asarray(array), allow_pickle=False)
+        os.replace(temp_dir, directory)
+    except OSError:
+        # 다른 프로세스가 먼저 저장한 경우
+        if not os.path.isdir(directory):
+            raise
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def load_arrays(directory, names):
+    """
+    Description:
+        directory 의 .npy 파일들을 읽기 전용 memory-map 으로 로드합니다.
+        파일이 하나라도 없으면 (보관 기간이 지나 삭제된 경우 등) None 을 반환하고 불완전한 cache 를 삭제합니다.
+
+    :param str directory: cache 디렉토리
+    :param list names: [name, name ... name]
+    :dict return: {name: np.memmap} 또는 None
+    """
+    if not os.path.isdir(directory):
+        return None
+    try:
+        arrays = {name: np.load(os.path.join(directory, name + '.npy'), mmap_mode='r', allow_pickle=False)
+                  for name in names}
+    except (OSError, ValueError):
+        shutil.rmtree(directory, ignore_errors=True)
+        return None
+
+    # 사용 시간을 갱신해 보관 기간(mtime 기준) 동안 유지되도록 합니다.
+    for name in names:
+        try:
+            os.utime(os.path.join(directory, name + '.npy'))
+        except OSError:
+            pass
+    return arrays
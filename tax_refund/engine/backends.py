@@ -0,0 +1,229 @@
+"""
+계산 backend
+
+근로표(calendar), 연도별 집계(aggregation), 공제 계산(deduction) 단계를 backend 로 나눠 실행 시 선택합니다.
+    pandas : 기존 parser 함수(DataFrame)를 그대로 사용하는 기준(reference) 구현, 검증/감사용
+    numpy  : Roster 의 ndarray 만 사용하는 구현
+             연도별 근무 달 수는 인원 x 달(month) 근로표를 만들지 않고 각 인정 기간에 포함되는 월말 날짜 수로 계산합니다.
+
+두 backend 의 결과는 같아야 합니다. (tax_refund/engine/tests/test_backends.py 참조)
+
+Usage:
+    >>> backend = get_backend('numpy')
+    >>> work_sums, young_sums = backend.year_sums(roster, START_DATE, END_DATE, curr_date)
+
+backend 이름을 지정하지 않으면 TAX_REFUND_BACKEND 환경 변수, 없으면 DEFAULT_BACKEND 를 사용합니다.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from tax_refund.engine import parser
+
+DEFAULT_BACKEND = 'numpy'
+
+
+class PandasBackend:
+    """
+    parser 의 DataFrame 함수를 사용하는 기준 구현
+    """
+    name = 'pandas'
+
+    def calendars(self, roster, start_date, end_date, curr_date):
+        """
+        Description:
+            상시 근로, 통합 청년 근로 달(month)별 근무 여부를 반환합니다.
+
+        :return:
+            : DataFrame workdate_df: 상시 근로자 각 달별 근무 여부
+            : DataFrame young_workdate_df: 통합 청년 근로자 각 달별 근무 여부
+        """
+        category_df = parser.classify_categories(roster, curr_date)
+        return parser.category_calendar(start_date, end_date, category_df)
+
+    def year_sums(self, roster, start_date, end_date, curr_date):
+        """
+        Description:
+            인원별, 연도별 상시 / 통합 청년 근무 달 수를 반환합니다.
+
+        :return:
+            : ndarray work_sums: shape (인원 수, 연도 수)
+            : ndarray young_sums: shape (인원 수, 연도 수)
+        """
+        _, workdate_sum_df, _, young_workdate_sum_df = parser.generate_workdate(roster, start_date, end_date,
+                                                                                curr_date)
+        return workdate_sum_df.values, young_workdate_sum_df.values
+
+    def extend_totals(self, young_sums, etc_sums, years, target_index=-1):
+        """
+        Description:
+            parser.extend_workdate_totals 와 같습니다.
+
+        :dict return: {year_index: ndarray, year_index: ndarray ... }
+        """
+        return parser.extend_workdate_totals(pd.DataFrame(young_sums), pd.DataFrame(etc_sums), years, target_index)
+
+    def deduction(self, n_workers, n_youngs, extend_young_totals, years, capital_area=True):
+        """
+        Description:
+            parser.deduction_and_tax_from_totals 와 같습니다.
+        """
+        return parser.deduction_and_tax_from_totals(n_workers, n_youngs, extend_young_totals, years, capital_area)
+
+
+class NumpyBackend:
+    """
+    Roster ndarray 를 사용하는 구현
+    """
+    name = 'numpy'
+
+    def calendars(self, roster, start_date, end_date, curr_date):
+        """
+        Description:
+            상시 근로, 통합 청년 근로 달(month)별 근무 여부를 반환합니다.
+
+        :return:
+            : ndarray work_mask: bool, shape (인원 수, 달 수)
+            : ndarray young_mask: bool, shape (인원 수, 달 수)
+        """
+        dates = parser.calendar_grid(start_date, end_date).dates.astype('datetime64[D]')
+        periods = parser.category_periods(roster, curr_date)
+
+        def within(period):
+            start, end = periods[period]
+            return (start[:, None] <= dates) & (end[:, None] >= dates)
+
+        work_mask = within('work')
+        young_mask = within('young') & ~(roster.executive | roster.contract)[:, None]
+        young_mask |= within('elder')
+        young_mask |= work_mask & roster.disabled[:, None]
+        return work_mask, young_mask
+
+    def year_sums(self, roster, start_date, end_date, curr_date):
+        """
+        Description:
+            인원별, 연도별 상시 / 통합 청년 근무 달 수를 반환합니다.
+            각 인정 기간 [start, end] 에 포함되는 월말 날짜 수를 연도별로 셉니다. (인원 x 달 근로표를 만들지 않습니다.)
+            청년 / 노인 기간이 겹치는 달은 한번만 셉니다.
+
+        :return:
+            : ndarray work_sums: shape (인원 수, 연도 수)
+            : ndarray young_sums: shape (인원 수, 연도 수)
+        """
+        grid = parser.calendar_grid(start_date, end_date)
+        dates = grid.dates.astype('datetime64[D]')
+        lower_bounds = grid.year_bounds[:-1]
+        upper_bounds = grid.year_bounds[1:]
+
+        def count(start, end):
+            # 연도별 start <= 월말 <= end 인 달 수, 기간이 없으면(NaT) 0
+            lo = np.searchsorted(dates, start, side='left')[:, None]
+            hi = np.searchsorted(dates, end, side='right')[:, None]
+            counts = np.minimum(hi, upper_bounds) - np.maximum(lo, lower_bounds)
+            counts = np.clip(counts, 0, None)
+            counts[np.isnat(start) | np.isnat(end)] = 0
+            return counts.astype(np.int64)
+
+        periods = parser.category_periods(roster, curr_date)
+        (young_start, young_end), (elder_start, elder_end) = periods['young'], periods['elder']
+        work_sums = count(*periods['work'])
+
+        # 통합 청년 = (청년 & ~임원/계약직) | 노인 | (상시 & 장애인)
+        young_sums = count(young_start, young_end)
+        young_sums[roster.executive | roster.contract] = 0
+        overlap_sums = count(np.maximum(young_start, elder_start), np.minimum(young_end, elder_end))
+        overlap_sums[roster.executive | roster.contract] = 0
+        young_sums = young_sums + count(elder_start, elder_end) - overlap_sums
+        young_sums[roster.disabled] = work_sums[roster.disabled]
+        return work_sums, young_sums
+
+    def extend_totals(self, young_sums, etc_sums, years, target_index=-1):
+        """
+        Description:
+            parser.extend_workdate_totals 와 같습니다.
+            각 연도 청년 유예 근로 달수 = min(max(작년도, 해당년도 청년 근로 달수), 해당년도 상시 근로 달수)
+
+        :dict return: {year_index: ndarray, year_index: ndarray ... }
+        """
+        target_index = target_index % len(years)
+        extend_totals = {}
+        for year_index in range(max(target_index - 2, 0), target_index + 1):
+            young = young_sums[:, year_index:target_index + 1]
+            etc = etc_sums[:, year_index:target_index + 1]
+            extend_young = young.copy()
+            extend_young[:, :-1] = np.clip(np.maximum(young[:, :-1], young[:, 1:]), 0, young[:, 1:] + etc[:, 1:])
+            extend_totals[year_index] = extend_young.sum(axis=0)
+        return extend_totals
+
+    def deduction(self, n_workers, n_youngs, extend_young_totals, years, capital_area=True):
+        """
+        Description:
+            parser.deduction_and_tax_from_totals 와 같은 결과를 공제 테이블 ndarray 로 계산합니다.
+            (반환되는 공제 테이블, 최초 공제 정보는 엑셀 변환을 위해 DataFrame 으로 변환합니다.)
+        """
+        n_youngs = np.asarray(n_youngs)
+        n_etc = np.asarray(n_workers) - n_youngs
+        yng_diff = parser.get_diff(n_youngs)
+        etc_diff = parser.get_diff(n_etc)
+        wkr_diff = yng_diff + etc_diff
+        first_indices = np.flatnonzero(wkr_diff > 0)
+        target_index = len(years) - 1
+
+        # axis=0 최초 공제, axis=1 (young, etc), axis=2 연도
+        tables = np.full((len(first_indices), 2, len(years)), np.nan)
+        for j, index in enumerate(first_indices):
+            # deduction_mask : 최초 공제 이후 2년 동안 공제 자격 여부, 상시 근로자가 줄면 -1 후 중단
+            for i in range(index, min(index + 3, len(years))):
+                if wkr_diff[index] <= wkr_diff[i]:
+                    tables[j, 0, i] = yng_diff[index] <= yng_diff[i]
+                    tables[j, 1, i] = etc_diff[index] <= etc_diff[i]
+                else:
+                    tables[j, :, i] = -1
+                    break
+            young_tax, etc_tax = parser.calculate_deduction(years[index], capital_area, yng_diff[index],
+                                                            etc_diff[index])
+            tables[j] *= np.array([[young_tax], [etc_tax]])
+
+        # 공제 금액 : 해당 년도 -1, NaN 은 0
+        received = np.nan_to_num(np.where(tables < 0, 0, tables))
+        deduction_tax = received[:, :, target_index].sum()
+
+        # 최초 공제 중 마지막 연도와 2년전 사이 최초 공제의 청년 근로 달(Month) 수 감소 여부
+        clawback_indices = []
+        for j, index in enumerate(first_indices):
+            if years[index] >= years[target_index] - 2:
+                extend_young_total = extend_young_totals[index]
+                if not (extend_young_total - extend_young_total[0] >= 0).all():
+                    clawback_indices.append(j)
+
+        # 추가 납부 금액 : 해당 년도 'young' 이 -1 인 공제는 받았던 모든 공제를 반납합니다.
+        marked = tables.copy()
+        marked[clawback_indices, :, target_index] = -1
+        lost = marked[:, 0, target_index] == -1
+        refund_tax = np.nan_to_num(np.where(marked == -1, 0, marked))[lost].sum()
+
+        deduction_tables = [pd.DataFrame(table, index=['young', 'etc'], columns=years) for table in tables]
+        first_deduction_info_df = pd.DataFrame(
+            np.stack([first_indices, yng_diff[first_indices], etc_diff[first_indices],
+                      np.asarray(years)[first_indices]], axis=-1),
+            columns=['year_index', 'young', 'etc', 'year'])
+        return deduction_tax, refund_tax, deduction_tables, first_deduction_info_df, clawback_indices
+
+
+BACKENDS = {backend.name: backend for backend in (PandasBackend(), NumpyBackend())}
+
+
+def get_backend(name=None):
+    """
+    Description:
+        이름으로 backend 를 반환합니다.
+
+    :param str name: 'pandas' 또는 'numpy', None 이면 TAX_REFUND_BACKEND 환경 변수 또는 DEFAULT_BACKEND
+    :return: PandasBackend | NumpyBackend
+    """
+    name = name or os.environ.get('TAX_REFUND_BACKEND') or DEFAULT_BACKEND
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise ValueError('backend 는 {} 중 하나입니다. ({})'.format(', '.join(BACKENDS), name))
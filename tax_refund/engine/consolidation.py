@@ -0,0 +1,157 @@
+"""
+여러 사업장(사업자 등록번호)을 가진 기업 집단의 연결 공제 계산
+
+각 사업장 명부를 하나의 Roster 로 합친 뒤 연도별 상시/청년 근무 달 수를 한번만 계산합니다.
+    1. 사업장별 : 사업장 안의 인원을 더합니다. (사업장 명부를 따로 계산한 결과와 같습니다.)
+    2. 연결     : 주민등록번호가 같은 인원은 한명으로 봅니다. 계열사 간 전출/전입, 겸직은 같은 달에 한번만 셉니다.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from tax_refund.engine import calculation_period, parser
+from tax_refund.engine.roster import Roster
+
+# 연결 결과 행(row) 이름, 사업장 이름으로 사용할 수 없습니다.
+CONSOLIDATED = '연결'
+
+
+def load_group(rosters, curr_date=None):
+    """
+    Description:
+        사업장별 사업자가입명부를 로드해 하나의 Roster 로 합칩니다.
+
+    :param dict|list rosters: {사업장 이름: 명부 경로} 또는 [명부 경로, 명부 경로 ...]
+        list 이면 파일 이름이 사업장 이름이 됩니다. 사업장 이름이 CONSOLIDATED('연결')이면 ValueError 가 발생합니다.
+    :param Timestamp curr_date: 복무 중인 인원의 전역 날짜 (Roster.from_workdate 참조), None 이면 오늘
+    :return:
+        : Roster group_roster: 합쳐진 명부, index 는 0 부터 시작합니다.
+        : ndarray entities: 각 행(row)의 사업장 이름
+    """
+    if not isinstance(rosters, dict):
+        rosters = {os.path.splitext(os.path.basename(path))[0]: path for path in rosters}
+    if CONSOLIDATED in rosters:
+        raise ValueError("'{}' 은 연결 결과 이름이므로 사업장 이름으로 사용할 수 없습니다.".format(CONSOLIDATED))
+
+    loaded = []
+    entities = []
+    for entity, path in rosters.items():
+        roster, _ = parser.load_roster(path, curr_date=curr_date)
+        loaded.append(roster)
+        entities.append(np.full(len(roster), entity, dtype=object))
+
+    return Roster.concat(loaded), np.concatenate(entities)
+
+
+def employee_keys(roster):
+    """
+    Description:
+        사업장 간 동일 인원 판단 key 를 반환합니다.
+        주민등록번호 뒷자리가 가려진(*) 명부는 생년월일, 성별만 남아있으므로 이름을 함께 사용합니다.
+
+    :param Roster roster:
+    :ndarray return:
+    """
+    resident_codes = np.char.decode(roster.resident_codes, 'ascii')
+    masked = np.char.find(resident_codes, '*') >= 0
+    return np.where(masked, np.char.add(np.char.add(resident_codes, '/'), roster.names), resident_codes)
+
+
+def merged_year_sums(backend, roster, keys, work_sums, young_sums, start_date, end_date, curr_date):
+    """
+    Description:
+        같은 인원(key)의 행(row)들을 한명으로 합친 인원별 연도별 상시 / 통합 청년 근무 달 수를 반환합니다.
+        여러 행이 있는 인원만 달(month)별 근무 여부를 합치고(or), 나머지 인원은 행별 연도 합계를 그대로 사용합니다.
+
+    :param Backend backend:
+    :param Roster roster: 합쳐진 명부
+    :param ndarray keys: employee_keys 결과
+    :param ndarray work_sums: 행별 연도별 상시 근무 달 수, shape (행 수, 연도 수)
+    :param ndarray young_sums: 행별 연도별 통합 청년 근무 달 수, shape (행 수, 연도 수)
+    :return:
+        : ndarray work_sums: shape (인원 수, 연도 수)
+        : ndarray young_sums: shape (인원 수, 연도 수)
+    """
+    _, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    shared = counts[inverse] > 1
+    if not shared.any():
+        return work_sums, young_sums
+
+    # 여러 행이 있는 인원의 행만 key 순서로 정렬해 근로표를 만들고, key 별로 달(month)별 근무 여부를 합칩니다.
+    order = np.flatnonzero(shared)[np.argsort(inverse[shared], kind='stable')]
+    key_starts = np.flatnonzero(np.r_[True, np.diff(inverse[order]) != 0])
+    year_bounds = parser.calendar_grid(start_date, end_date).year_bounds
+    merged_sums = []
+    for calendar in backend.calendars(roster[order], start_date, end_date, curr_date):
+        merged = np.logical_or.reduceat(np.asarray(calendar, dtype=bool), key_starts, axis=0)
+        merged_sums.append(np.add.reduceat(merged.astype(np.int64), year_bounds[:-1], axis=1))
+
+    return (np.concatenate([work_sums[~shared], merged_sums[0]]),
+            np.concatenate([young_sums[~shared], merged_sums[1]]))
+
+
+def consolidate(rosters, save_path=None, capital_area=True, backend=None, curr_date=None, target_year=None):
+    """
+    Description:
+        사업장별, 연결 기준 연도별 상시/청년 근로 달 수와 공제 금액, 추가 납부 금액을 계산합니다.
+        연도별 근무 달 수는 합쳐진 명부에 대해 한번만 계산하고 사업장별로 더합니다.
+        연결은 여러 사업장에 있는 인원만 달(month)별 근로표로 합칩니다. (merged_year_sums 참조)
+
+    Args:
+        :param dict|list rosters: {사업장 이름: 명부 경로} 또는 [명부 경로, 명부 경로 ...]
+        :param str save_path: 엑셀 파일 저장 경로, None 이면 저장하지 않습니다.
+        :param bool capital_area: 수도권 여부, 수도권이면 True
+        :param str backend: 'numpy' 또는 'pandas'(기준 구현), None 이면 기본 backend (backends.get_backend 참조)
+        :param Timestamp curr_date: 계산 날짜 (상실/전역 날짜가 없는 인원의 종료 날짜), None 이면 오늘
+        :param int target_year: 공제 적용 연도 (calculation_period 참조), None 이면 END_DATE 연도
+
+    :return:
+        : DataFrame headcount_df: 사업장별, 연결 연도별 상시/청년 근로 달 수
+            +--------+------------+-----+------------+------------+-----+
+            |        | (상시)2018 | ... | (상시)2022 | (청년)2018 | ... |
+            +--------+------------+-----+------------+------------+-----+
+            | A사    | 120        | ... | 130        | 36         | ... |
+            +--------+------------+-----+------------+------------+-----+
+            | 연결   | 230        | ... | 250        | 60         | ... |
+            +--------+------------+-----+------------+------------+-----+
+        : DataFrame deduction_df: 사업장별, 연결 공제 금액 / 추가 납부 금액
+    """
+    from tax_refund.engine.backends import get_backend
+    backend = get_backend(backend)
+
+    start_date, end_date = calculation_period(target_year)
+    curr_date = pd.Timestamp.today() if curr_date is None else pd.Timestamp(curr_date)
+    years = parser.get_years(start_date, end_date)
+
+    group_roster, entities = load_group(rosters, curr_date)
+    keys = employee_keys(group_roster)
+
+    # 합쳐진 명부에 대해 한번만 행(row)별 연도별 근무 달 수를 계산합니다. (backend 집계 단계)
+    work_sums, young_sums = backend.year_sums(group_roster, start_date, end_date, curr_date)
+
+    # 사업장별 : 사업장 행(row) 들의 근무 달 수, 연결 : 같은 인원을 한명으로 합친 근무 달 수
+    year_sums = {entity: (work_sums[entities == entity], young_sums[entities == entity])
+                 for entity in pd.unique(entities)}
+    year_sums[CONSOLIDATED] = merged_year_sums(backend, group_roster, keys, work_sums, young_sums,
+                                               start_date, end_date, curr_date)
+
+    # 사업장별, 연결 공제 금액 / 추가 납부 금액 (backend 공제 계산 단계)
+    headcounts = []
+    deductions = []
+    for entity_work_sums, entity_young_sums in year_sums.values():
+        n_workers = entity_work_sums.sum(axis=0)
+        n_youngs = entity_young_sums.sum(axis=0)
+        extend_young_totals = backend.extend_totals(entity_young_sums, entity_work_sums - entity_young_sums, years)
+        deduction_tax, refund_tax, _, _, _ = backend.deduction(n_workers, n_youngs, extend_young_totals, years,
+                                                               capital_area)
+        headcounts.append(np.concatenate([n_workers, n_youngs]))
+        deductions.append([deduction_tax, refund_tax])
+
+    columns = ['(상시)' + str(year) for year in years] + ['(청년)' + str(year) for year in years]
+    headcount_df = pd.DataFrame(headcounts, index=list(year_sums), columns=columns)
+    deduction_df = pd.DataFrame(deductions, index=headcount_df.index, columns=['공제금액', '추가납부금액'])
+
+    if save_path:
+        parser.df2excel(save_path, 공제및추가납부=deduction_df, 근로합계=headcount_df)
+    return headcount_df, deduction_df
@@ -0,0 +1,23 @@
+"""
+계산 엔진 예외
+
+view 에서 pandas 를 import 하지 않고 예외를 처리할 수 있도록 별도 모듈로 둡니다.
+"""
+
+
+class RosterValidationError(ValueError):
+    """
+    명부 검증에 실패한 경우 발생합니다. report 에 오류 행 목록이 있습니다.
+        [{'row': 엑셀 행 번호, 'column': column 이름, 'value': 값, 'error': 오류 내용}, ...]
+    worker 프로세스에서 요청 처리 프로세스로 pickle 되어 전달되므로 pandas 객체 대신 기본 자료형만 담습니다.
+    """
+
+    def __init__(self, report):
+        super().__init__(report)
+        self.report = report
+
+    def __str__(self):
+        lines = ['사업자가입명부 검증 오류 {}건'.format(len(self.report))]
+        for error in self.report:
+            lines.append('{}행 {}: {} ({})'.format(error['row'], error['column'], error['error'], error['value']))
+        return '\n'.join(lines)
@@ -0,0 +1,94 @@
+"""
+계산 결과 export 형식
+
+엑셀(xlsx) 외에 서식이 필요 없는 연동(급여, ERP)용 형식으로 같은 시트들을 저장합니다.
+    xlsx    : 시트별 worksheet (parser.df2excel)
+    csv     : 시트별 <시트 이름>.csv 를 묶은 zip
+    parquet : 시트별 <시트 이름>.parquet 를 묶은 zip (pyarrow 필요)
+    ndjson  : 한 줄에 한 행(row), {"sheet": 시트 이름, "index": index, column: 값 ...}
+
+view 에서 pandas 를 import 하지 않고 형식을 확인할 수 있도록 이 모듈은 pandas 를 import 하지 않습니다.
+(writer 는 DataFrame 을 받으므로 pandas 를 사용하는 곳에서만 호출됩니다.)
+"""
+import importlib.util
+import io
+import zipfile
+
+DEFAULT_FORMAT = 'xlsx'
+
+# {형식: (파일 확장자, content type, 필요한 module)}
+FORMATS = {'xlsx': ('.xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', 'xlsxwriter'),
+           'csv': ('.csv.zip', 'application/zip', None),
+           'parquet': ('.parquet.zip', 'application/zip', 'pyarrow'),
+           'ndjson': ('.ndjson', 'application/x-ndjson', None)}
+
+
+def available_formats():
+    """
+    Description:
+        필요한 module 이 설치된 형식 목록을 반환합니다. (module 을 import 하지 않고 확인합니다.)
+
+    :list return: ['xlsx', 'csv', ... ]
+    """
+    return [name for name, (_, _, module) in FORMATS.items() if module is None or importlib.util.find_spec(module)]
+
+
+def _columns(df):
+    # csv / parquet / json column 이름은 문자열이어야 합니다. (연도 column 등)
+    df = df.copy(deep=False)
+    df.columns = [str(column) for column in df.columns]
+    return df
+
+
+def df2csvzip(save_path, **dataframes):
+    """
+    Description:
+        시트별 DataFrame 을 <시트 이름>.csv 로 변환해 zip 으로 저장합니다. (엑셀에서 열 수 있도록 utf-8-sig)
+
+    :param str save_path: zip 파일 저장 경로
+    :param dataframes: {시트 이름: DataFrame}
+    """
+    with zipfile.ZipFile(save_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for sheet_name, df in dataframes.items():
+            zf.writestr(sheet_name + '.csv', df.to_csv().encode('utf-8-sig'))
+
+
+def df2parquet(save_path, **dataframes):
+    """
+    Description:
+        시트별 DataFrame 을 <시트 이름>.parquet 로 변환해 zip 으로 저장합니다.
+        parquet 파일은 이미 압축되어 있으므로 zip 은 압축하지 않습니다.
+
+    :param str save_path: zip 파일 저장 경로
+    :param dataframes: {시트 이름: DataFrame}
+    """
+    with zipfile.ZipFile(save_path, 'w', compression=zipfile.ZIP_STORED) as zf:
+        for sheet_name, df in dataframes.items():
+            buffer = io.BytesIO()
+            _columns(df).to_parquet(buffer, engine='pyarrow')
+            zf.writestr(sheet_name + '.parquet', buffer.getvalue())
+
+
+def df2ndjson(save_path, **dataframes):
+    """
+    Description:
+        모든 시트의 행(row)을 한 줄에 하나씩 JSON 으로 저장합니다. 날짜는 ISO 형식, NaN 은 null 입니다.
+
+        {"sheet":"상시근로표","index":1,"이름":"홍길동","(상시)2018":12, ... }
+
+    :param str save_path: ndjson 파일 저장 경로
+    :param dataframes: {시트 이름: DataFrame}
+    """
+    with open(save_path, 'w', encoding='utf-8') as f:
+        for sheet_name, df in dataframes.items():
+            if not len(df):
+                continue
+            df = _columns(df)
+            df.index = df.index.rename('index')
+            df = df.reset_index()
+            df.insert(0, 'sheet', sheet_name)
+            lines = df.to_json(orient='records', lines=True, force_ascii=False, date_format='iso')
+            f.write(lines.rstrip('\n') + '\n')
+
+
+WRITERS = {'csv': df2csvzip, 'parquet': df2parquet, 'ndjson': df2ndjson}
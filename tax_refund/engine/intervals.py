@@ -0,0 +1,229 @@
+"""
+시점별 인원 조회 interval index
+
+명부의 인원별 상시 / 청년 / 노인 / 장애인 인정 기간으로 category 별 interval tree 를 만들어
+"특정 월말에 누가 상시 / 청년 근로자였는지, 어떤 기간 때문인지" 를 근로표 없이 O(log n + k) 로 조회합니다.
+
+자격상실일이 없는 인원은 종료일이 없는 기간(OPEN_END)으로 저장하므로 계산 날짜와 관계없이 같은 index 를 사용합니다.
+index 는 .npy 파일(arrays 참조)로 저장해 업로드 명부와 함께 보관합니다. (info.storage 참조)
+
+Usage:
+    >>> index = RosterIntervalIndex.from_roster(roster)
+    >>> index.at('2022-12-31', categories=['청년'])
+    >>> index.between('2022-01-01', '2022-12-31')
+"""
+import numpy as np
+import pandas as pd
+
+from tax_refund.engine.arrays import load_arrays, save_arrays
+from tax_refund.engine.parser import category_periods
+
+# 통합 청년 = 청년(임원/계약직 제외) | 노인 | 장애인(상시 기간 전체)
+CATEGORIES = ['상시', '청년', '노인', '장애인']
+YOUNG_CATEGORIES = ['청년', '노인', '장애인']
+OPEN_END = np.datetime64(pd.Timestamp.max.date(), 'D')
+INDEX_ARRAYS = ['index', 'names'] + ['{}_{}'.format(side, i) for i in range(len(CATEGORIES)) for side in
+                                      ('start', 'end')]
+
+
+def roster_intervals(roster):
+    """
+    Description:
+        인원별 category 인정 기간을 반환합니다. 해당 category 가 아니면 시작일이 NaT 입니다.
+        장애인은 청년 / 노인 기간 대신 상시 기간 전체가 통합 청년 기간입니다.
+
+    :param Roster roster:
+    :dict return: {'상시': (start, end), '청년': (start, end), '노인': (start, end), '장애인': (start, end)}
+    """
+    periods = category_periods(roster, OPEN_END)
+    excluded = roster.executive | roster.contract
+    disabled = roster.disabled
+
+    def only(period, rows):
+        start, end = periods[period]
+        return np.where(rows, start, np.datetime64('NaT')), end
+
+    return {'상시': periods['work'],
+            '청년': only('young', ~(excluded | disabled)),
+            '노인': only('elder', ~disabled),
+            '장애인': only('work', disabled)}
+
+
+class IntervalIndex:
+    """
+    정적 centered interval tree
+
+    각 node 는 중심 날짜(center)를 포함하는 기간을 시작일 오름차순, 종료일 내림차순으로 정렬해 보관하고
+    중심보다 앞 / 뒤에 끝나는 기간은 왼쪽 / 오른쪽 node 로 나눕니다.
+    """
+
+    def __init__(self, start, end):
+        """
+        :param ndarray start: datetime64[D], NaT 이거나 start > end 인 기간은 제외합니다.
+        :param ndarray end: datetime64[D]
+        """
+        start = np.asarray(start, dtype='datetime64[D]')
+        end = np.asarray(end, dtype='datetime64[D]')
+        rows = np.flatnonzero(~(np.isnat(start) | np.isnat(end)) & (start <= end))
+        self.start = start.astype(np.int64)
+        self.end = end.astype(np.int64)
+
+        # 범위(range) 조회용 시작일 정렬
+        self.by_start = rows[np.argsort(self.start[rows], kind='stable')]
+        self.sorted_starts = self.start[self.by_start]
+
+        # node: [center, 시작일 오름차순 rows, 시작일, 종료일 내림차순 rows, -종료일, left, right]
+        self.nodes = []
+        self.root = self._build(rows)
+
+    def _build(self, rows):
+        if not len(rows):
+            return -1
+        starts, ends = self.start[rows], self.end[rows]
+        center = np.median(np.concatenate([starts, ends])).astype(np.int64)
+        here = (starts <= center) & (ends >= center)
+
+        by_start = rows[here][np.argsort(starts[here], kind='stable')]
+        by_end = rows[here][np.argsort(-ends[here], kind='stable')]
+        node = len(self.nodes)
+        self.nodes.append([center, by_start, self.start[by_start], by_end, -self.end[by_end], -1, -1])
+        self.nodes[node][5] = self._build(rows[ends < center])
+        self.nodes[node][6] = self._build(rows[starts > center])
+        return node
+
+    def __len__(self):
+        return len(self.by_start)
+
+    def at(self, date):
+        """
+        Description:
+            date 가 기간 [start, end] 에 포함되는 행(row) 위치를 반환합니다.
+
+        :param date: datetime64, Timestamp, str
+        :ndarray return: 정렬된 행 위치
+        """
+        day = np.datetime64(pd.Timestamp(date).date(), 'D').astype(np.int64)
+        found = []
+        node = self.root
+        while node != -1:
+            center, by_start, starts, by_end, neg_ends, left, right = self.nodes[node]
+            if day < center:
+                # 중심을 포함하는 기간 중 시작일이 day 이전인 기간
+                found.append(by_start[:np.searchsorted(starts, day, side='right')])
+                node = left
+            elif day > center:
+                # 중심을 포함하는 기간 중 종료일이 day 이후인 기간
+                found.append(by_end[:np.searchsorted(neg_ends, -day, side='right')])
+                node = right
+            else:
+                found.append(by_start)
+                break
+        return np.sort(np.concatenate(found)) if found else np.array([], dtype=np.int64)
+
+    def between(self, start_date, end_date):
+        """
+        Description:
+            기간 [start_date, end_date] 와 겹치는 기간의 행(row) 위치를 반환합니다.
+            (start_date 에 포함되는 기간) + (start_date 와 end_date 사이에 시작하는 기간)
+
+        :ndarray return: 정렬된 행 위치
+        """
+        lower = np.datetime64(pd.Timestamp(start_date).date(), 'D').astype(np.int64)
+        upper = np.datetime64(pd.Timestamp(end_date).date(), 'D').astype(np.int64)
+        starting = self.by_start[np.searchsorted(self.sorted_starts, lower, side='left'):
+                                 np.searchsorted(self.sorted_starts, upper, side='right')]
+        return np.union1d(self.at(start_date), starting)
+
+
+class RosterIntervalIndex:
+    """
+    명부의 category 별 IntervalIndex
+    """
+
+    def __init__(self, index, names, intervals):
+        """
+        :param ndarray index: 명부 index
+        :param ndarray names: 이름
+        :param dict intervals: roster_intervals 결과
+        """
+        self.index = np.asarray(index)
+        self.names = np.asarray(names)
+        self.intervals = intervals
+        self.trees = {category: IntervalIndex(*intervals[category]) for category in CATEGORIES}
+
+    @classmethod
+    def from_roster(cls, roster):
+        return cls(roster.index, roster.names, roster_intervals(roster))
+
+    def save(self, directory):
+        """
+        Description:
+            index 를 directory 에 .npy 파일로 저장합니다. (save_arrays 참조)
+        """
+        arrays = {'index': self.index, 'names': self.names}
+        for i, category in enumerate(CATEGORIES):
+            arrays['start_{}'.format(i)], arrays['end_{}'.format(i)] = self.intervals[category]
+        save_arrays(directory, **arrays)
+
+    @classmethod
+    def load(cls, directory):
+        """
+        Description:
+            저장된 index 를 로드합니다. 없으면 None 을 반환합니다.
+
+        :RosterIntervalIndex return:
+        """
+        arrays = load_arrays(directory, INDEX_ARRAYS)
+        if arrays is None:
+            return None
+        intervals = {category: (arrays['start_{}'.format(i)], arrays['end_{}'.format(i)])
+                     for i, category in enumerate(CATEGORIES)}
+        return cls(arrays['index'], arrays['names'], intervals)
+
+    def _frame(self, found):
+        """
+        Description:
+            category 별 조회 결과를 인원별 인정 기간 table 로 변환합니다.
+
+            ---------------------------------------------------
+            | index | 이름  | 구분 |   시작일    |   종료일    |
+            |    12 | 홍길동 | 상시 | 2019-03-02 |        NaT |
+            |    12 | 홍길동 | 청년 | 2019-03-02 | 2024-05-07 |
+            ---------------------------------------------------
+            종료일 NaT : 자격상실일이 없는 인원
+        """
+        frames = []
+        for category, rows in found.items():
+            start, end = self.intervals[category]
+            end = np.asarray(end)[rows]
+            frames.append(pd.DataFrame({'index': self.index[rows],
+                                        '이름': self.names[rows],
+                                        '구분': category,
+                                        '시작일': np.asarray(start)[rows],
+                                        '종료일': np.where(end >= OPEN_END, np.datetime64('NaT'), end)}))
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+            columns=['index', '이름', '구분', '시작일', '종료일'])
+        order = {category: i for i, category in enumerate(CATEGORIES)}
+        df = df.sort_values(['index', '구분'], key=lambda s: s.map(order) if s.name == '구분' else s)
+        return df.reset_index(drop=True)
+
+    def at(self, date, categories=None):
+        """
+        Description:
+            date 에 근무한 인원과 인정 기간을 반환합니다. (월말 날짜로 조회하면 근로표의 해당 달과 같습니다.)
+
+        :param date: 조회 날짜
+        :param list categories: 조회할 category, None 이면 전체 (CATEGORIES 참조)
+        :DataFrame return: _frame 참조
+        """
+        return self._frame({category: self.trees[category].at(date) for category in categories or CATEGORIES})
+
+    def between(self, start_date, end_date, categories=None):
+        """
+        Description:
+            기간 [start_date, end_date] 중 하루라도 근무한 인원과 인정 기간을 반환합니다.
+
+        :DataFrame return: _frame 참조
+        """
+        return self._frame({category: self.trees[category].between(start_date, end_date)
+                            for category in categories or CATEGORIES})
@@ -0,0 +1,244 @@
+"""
+계산 단계 측정 및 메모리 진단
+
+stage 는 계산 단계의 처리 시간을 기록합니다. (metrics.STAGE_SECONDS)
+TAX_REFUND_MEMORY_TRACE 환경 변수를 켜면(1) tracemalloc 으로 다음을 추가로 측정해 출력합니다.
+    - 단계별 최대 사용 메모리(peak), 단계 전후 증가량과 단계가 끝난 뒤 남아있는 할당 위치 상위 목록
+    - 계산 전후 snapshot 비교로 계산이 끝난 뒤에도 해제되지 않은 메모리(retained)와 할당 위치
+    - TAX_REFUND_MEMORY_BUDGET_MB 가 있으면 계산의 최대 사용 메모리가 예산을 넘었는지
+
+Usage:
+    >>> @traced
+    >>> def deductio_and_tax(path, save_path, ...):
+    >>>     with stage('load'):
+    >>>         roster, error_report = load_roster(path)
+
+    TAX_REFUND_MEMORY_TRACE=1 TAX_REFUND_MEMORY_BUDGET_MB=256 python -m tax_refund.engine.parser <명부> <저장 경로>
+    # [memory] load          peak    12.4 MiB  net     +3.1 MiB
+    #         +2.9 MiB  tax_refund/engine/parser.py:250
+    # ...
+    # [memory] deductio_and_tax peak 41.0 MiB, retained +96.0 KiB (budget 256.0 MiB)
+
+측정값은 tracemalloc 이 추적하는 Python / numpy 할당이며 RSS 와 다를 수 있습니다.
+retained 에는 반환값(table_df 등)이 포함됩니다.
+처음 계산에는 계산 중 import 되는 module(xlrd, xlsxwriter 등)도 포함되므로 반복 계산의 retained 를 봅니다.
+shard 프로세스(shards)에서 실행되는 근로표 계산은 측정하지 않습니다.
+tracemalloc 은 프로세스 전체에 하나이므로 여러 thread 가 동시에 측정하면 마지막 측정이 끝날 때 멈춥니다.
+동시에 측정 중인 계산이 있으면 peak 는 다른 계산의 사용 메모리를 포함할 수 있습니다.
+tracemalloc 은 계산을 느리게 하므로 진단할 때만 켭니다.
+"""
+import functools
+import gc
+import os
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+from tax_refund.engine.metrics import MEMORY_BUDGET_EXCEEDED, RUN_RETAINED_BYTES, STAGE_PEAK_BYTES, STAGE_SECONDS
+
+# 출력할 할당 위치 수 (단계별 / 계산 전체)
+TOP_STAGE_SITES = 3
+TOP_RUN_SITES = 10
+
+MIB = 2 ** 20
+
+# tracemalloc 내부, 측정 기록(이 module), import 할당은 제외합니다.
+_FILTERS = [tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+            tracemalloc.Filter(False, '<unknown>')]
+
+_current = threading.local()
+
+# tracemalloc 을 사용 중인 측정 수, 이 module 이 tracemalloc 을 시작했는지 여부
+_users = 0
+_owned = False
+_lock = threading.Lock()
+
+
+def enabled():
+    return os.environ.get('TAX_REFUND_MEMORY_TRACE', '') not in ('', '0')
+
+
+def budget_bytes():
+    budget = os.environ.get('TAX_REFUND_MEMORY_BUDGET_MB')
+    return int(float(budget) * MIB) if budget else None
+
+
+def _start():
+    # 첫 측정이 tracemalloc 을 시작합니다. (이미 추적 중이면 그대로 사용하고 멈추지 않습니다.)
+    global _users, _owned
+    with _lock:
+        if _users == 0:
+            _owned = not tracemalloc.is_tracing()
+            if _owned:
+                tracemalloc.start()
+        _users += 1
+
+
+def _stop():
+    # 마지막 측정이 끝나면 시작했던 tracemalloc 을 멈춥니다.
+    global _users, _owned
+    with _lock:
+        _users -= 1
+        if _users == 0 and _owned:
+            tracemalloc.stop()
+            _owned = False
+
+
+def _reset_peak():
+    # 다른 측정(다른 thread, 외부에서 시작한 tracemalloc)의 peak 를 지우지 않도록 혼자 측정할 때만 초기화합니다.
+    with _lock:
+        if _owned and _users == 1:
+            tracemalloc.reset_peak()
+
+
+def _snapshot():
+    try:
+        return tracemalloc.take_snapshot().filter_traces(_FILTERS)
+    except RuntimeError:
+        # tracemalloc 이 멈춘 경우 (외부에서 stop 한 경우)
+        return None
+
+
+def _top_sites(after, before, limit):
+    # 증가량이 큰 할당 위치 (파일:줄, 증가 bytes)
+    if after is None or before is None:
+        return []
+    stats = [stat for stat in after.compare_to(before, 'lineno') if stat.size_diff > 0]
+    return [('{}:{}'.format(stat.traceback[0].filename, stat.traceback[0].lineno), stat.size_diff)
+            for stat in stats[:limit]]
+
+
+def _size(size, sign=False):
+    # 1 MiB 미만은 KiB 로 출력합니다.
+    unit, scale = ('MiB', MIB) if abs(size) >= MIB else ('KiB', 1024)
+    return ('{:+.1f} {}' if sign else '{:.1f} {}').format(size / scale, unit)
+
+
+def _short(filename):
+    # 출력용 상대 경로
+    return os.path.relpath(filename) if filename.startswith(os.getcwd()) else filename
+
+
+class MemoryTrace:
+    """
+    계산 한 번의 메모리 측정 결과
+
+    stages: {단계: {'peak': bytes, 'net': bytes, 'sites': [(파일:줄, bytes), ... ]}}
+    peak: 계산 중 최대 사용 메모리 (계산 시작 시점 대비, bytes)
+    retained: 계산 후 해제되지 않은 메모리 (bytes)
+    sites: 해제되지 않은 메모리의 할당 위치 [(파일:줄, bytes), ... ]
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.stages = {}
+        self.peak = 0
+        self.retained = 0
+        self.sites = []
+        self.base = 0
+
+    def lines(self, budget=None):
+        lines = []
+        for stage_name, stage_trace in self.stages.items():
+            lines.append('[memory] {:<13} peak {:>11}  net {:>12}'.format(
+                stage_name, _size(stage_trace['peak']), _size(stage_trace['net'], sign=True)))
+            lines += ['    {:>12}  {}'.format(_size(size, sign=True), _short(site))
+                      for site, size in stage_trace['sites']]
+        lines.append('[memory] {} peak {}, retained {}{}'.format(
+            self.name, _size(self.peak), _size(self.retained, sign=True),
+            '' if budget is None else ' (budget {})'.format(_size(budget))))
+        lines += ['    {:>12}  {}'.format(_size(size, sign=True), _short(site)) for site, size in self.sites]
+        if budget is not None and self.peak > budget:
+            lines.append('[memory] ⚠️ 메모리 예산 초과: {} > {}'.format(_size(self.peak), _size(budget)))
+        return lines
+
+
+@contextmanager
+def trace_run(name):
+    """
+    Description:
+        메모리 진단 모드이면 with 문 안의 계산을 tracemalloc 으로 측정하고 결과를 출력합니다.
+        진단 모드가 아니면 아무것도 하지 않습니다.
+
+    :param str name: 출력할 계산 이름
+    :MemoryTrace return: 진단 모드가 아니면 None
+    """
+    if not enabled() or getattr(_current, 'trace', None) is not None:
+        yield None
+        return
+
+    _start()
+    trace = MemoryTrace(name)
+    try:
+        gc.collect()
+        before = _snapshot()
+        trace.base = tracemalloc.get_traced_memory()[0]
+        _reset_peak()
+        _current.trace = trace
+        try:
+            yield trace
+        finally:
+            _current.trace = None
+            trace.peak = max([tracemalloc.get_traced_memory()[1] - trace.base] +
+                             [stage_trace['top'] for stage_trace in trace.stages.values()])
+            # snapshot 도 메모리를 사용하므로 snapshot 전에 측정합니다.
+            gc.collect()
+            trace.retained = tracemalloc.get_traced_memory()[0] - trace.base
+            after = _snapshot()
+            trace.sites = _top_sites(after, before, TOP_RUN_SITES)
+    finally:
+        _stop()
+
+    budget = budget_bytes()
+    RUN_RETAINED_BYTES.observe(max(trace.retained, 0))
+    if budget is not None and trace.peak > budget:
+        MEMORY_BUDGET_EXCEEDED.inc()
+    print('\n'.join(trace.lines(budget)))
+
+
+def traced(func):
+    """
+    Description:
+        함수 실행을 trace_run 으로 측정합니다. (함수 이름으로 출력합니다.)
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with trace_run(func.__name__):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+@contextmanager
+def stage(name):
+    """
+    Description:
+        계산 단계의 처리 시간을 기록합니다. 메모리 진단 중이면(trace_run) 단계의 메모리도 측정합니다.
+            peak : 단계 시작 시점 대비 단계 중 최대 사용 메모리
+            net  : 단계가 끝난 뒤 증가한 메모리 (단계 결과, 해제되지 않은 중간 결과)
+            sites: net 의 할당 위치 상위 TOP_STAGE_SITES 개
+
+    :param str name: 단계 이름
+    """
+    trace = getattr(_current, 'trace', None)
+    if trace is None:
+        with STAGE_SECONDS.time(stage=name):
+            yield
+        return
+
+    before = _snapshot()
+    start, run_peak = tracemalloc.get_traced_memory()
+    _reset_peak()
+    try:
+        with STAGE_SECONDS.time(stage=name):
+            yield
+    finally:
+        current, peak = tracemalloc.get_traced_memory()
+        after = _snapshot()
+        trace.stages[name] = {'peak': peak - start, 'net': current - start, 'top': max(peak, run_peak) - trace.base,
+                              'sites': _top_sites(after, before, TOP_STAGE_SITES)}
+        STAGE_PEAK_BYTES.observe(max(peak - start, 0), stage=name)
@@ -0,0 +1,281 @@
+"""
+프로세스 내 metric registry (counter / gauge / histogram)
+
+Prometheus text exposition format(0.0.4) 으로 출력합니다. (REGISTRY.render, info 의 /info/metrics/ 참조)
+
+계산은 worker 프로세스(info.workers)에서 실행되므로 worker 에서 기록한 값은 capture 로 모아
+요청 처리 프로세스로 돌려보내고 REGISTRY.replay 로 반영합니다.
+
+Usage:
+    >>> with STAGE_SECONDS.time(stage='load'):
+    >>>     roster, error_report = load_roster(path)
+    >>> CACHE_REQUESTS.inc(cache='arrays', result='hit')
+    >>> print(REGISTRY.render())
+    # # HELP tax_refund_stage_seconds ...
+    # # TYPE tax_refund_stage_seconds histogram
+    # tax_refund_stage_seconds_bucket{stage="load",le="0.005"} 0
+    # ...
+
+view 에서 pandas 를 import 하지 않고 사용할 수 있도록 이 모듈은 표준 라이브러리만 사용합니다.
+"""
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+# 처리 시간(초) histogram 기본 구간
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# 명부 행(row) 수 histogram 구간
+ROW_BUCKETS = (10, 100, 1000, 10000, 50000, 100000, 250000, 500000, 1000000)
+
+# 메모리(bytes) histogram 구간, 1 MiB ~ 1 GiB
+MEMORY_BUCKETS = tuple(2 ** 20 * n for n in (1, 4, 16, 64, 256, 1024))
+
+_capture = threading.local()
+
+
+def _format_value(value):
+    if value == math.inf:
+        return '+Inf'
+    if value == -math.inf:
+        return '-Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def _format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join('{}="{}"'.format(name, _escape(value)) for name, value in pairs) + '}'
+
+
+class Metric:
+    """
+    label 별 값을 가지는 metric 의 공통 부분, counter / gauge / histogram 이 상속합니다.
+    """
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.lock = threading.Lock()
+        self.values = {}  # {label 값 tuple: 값}
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError('{} labels 는 {} 입니다: {}'.format(self.name, list(self.labelnames), sorted(labels)))
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _record(self, op, labels, value):
+        # capture 중이면 바로 반영하지 않고 모아둡니다. (worker 프로세스 → 요청 처리 프로세스)
+        events = getattr(_capture, 'events', None)
+        key = self._key(labels)
+        if events is not None:
+            events.append((self.name, op, key, value))
+        else:
+            self.apply(op, key, value)
+
+    def apply(self, op, key, value):
+        raise NotImplementedError
+
+    def samples(self):
+        """
+        :list return: [(sample 이름, label 문자열, 값), ... ]
+        """
+        raise NotImplementedError
+
+    def render(self):
+        lines = ['# HELP {} {}'.format(self.name, self.documentation.replace('\\', r'\\').replace('\n', r'\n')),
+                 '# TYPE {} {}'.format(self.name, self.type)]
+        lines += ['{}{} {}'.format(name, labels, _format_value(value)) for name, labels, value in self.samples()]
+        return '\n'.join(lines)
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        if amount < 0:
+            raise ValueError('counter 는 감소할 수 없습니다.')
+        self._record('inc', labels, amount)
+
+    def apply(self, op, key, value):
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + value
+
+    def samples(self):
+        with self.lock:
+            return [(self.name, _format_labels(self.labelnames, key), value)
+                    for key, value in sorted(self.values.items())]
+
+
+class Gauge(Metric):
+    type = 'gauge'
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self.function = None
+
+    def set(self, value, **labels):
+        self._record('set', labels, value)
+
+    def inc(self, amount=1, **labels):
+        self._record('inc', labels, amount)
+
+    def dec(self, amount=1, **labels):
+        self._record('inc', labels, -amount)
+
+    def set_function(self, function):
+        """
+        Description:
+            출력할 때 function() 값을 사용합니다. (label 이 없는 gauge 만 사용할 수 있습니다.)
+        """
+        self.function = function
+
+    def apply(self, op, key, value):
+        with self.lock:
+            self.values[key] = value if op == 'set' else self.values.get(key, 0) + value
+
+    def samples(self):
+        if self.function is not None:
+            return [(self.name, '', self.function())]
+        with self.lock:
+            return [(self.name, _format_labels(self.labelnames, key), value)
+                    for key, value in sorted(self.values.items())]
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))  # +Inf 는 _count 와 같으므로 따로 저장하지 않습니다.
+
+    def observe(self, value, **labels):
+        self._record('observe', labels, value)
+
+    @contextmanager
+    def time(self, **labels):
+        """
+        Description:
+            with 문 안의 실행 시간(초)을 기록합니다. 예외가 발생해도 기록합니다.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def apply(self, op, key, value):
+        with self.lock:
+            counts, total, n = self.values.get(key) or ([0] * len(self.buckets), 0, 0)
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(counts):
+                counts[index] += 1
+            self.values[key] = (counts, total + value, n + 1)
+
+    def samples(self):
+        samples = []
+        with self.lock:
+            for key, (counts, total, n) in sorted(self.values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    samples.append((self.name + '_bucket',
+                                    _format_labels(self.labelnames, key, [('le', _format_value(float(bound)))]),
+                                    cumulative))
+                samples.append((self.name + '_bucket', _format_labels(self.labelnames, key, [('le', '+Inf')]), n))
+                samples.append((self.name + '_sum', _format_labels(self.labelnames, key), total))
+                samples.append((self.name + '_count', _format_labels(self.labelnames, key), n))
+        return samples
+
+
+class Registry:
+    """
+    이름별 metric 목록
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.metrics = {}
+
+    def register(self, metric):
+        with self.lock:
+            if metric.name in self.metrics:
+                raise ValueError('이미 등록된 metric 입니다: {}'.format(metric.name))
+            self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def replay(self, events):
+        """
+        Description:
+            capture 로 모은 기록을 반영합니다.
+
+        :param list events: capture 참조
+        """
+        for name, op, key, value in events:
+            self.metrics[name].apply(op, key, value)
+
+    def render(self):
+        """
+        :str return: Prometheus text exposition format
+        """
+        with self.lock:
+            metrics = list(self.metrics.values())
+        return ''.join(metric.render() + '\n' for metric in metrics)
+
+
+@contextmanager
+def capture():
+    """
+    Description:
+        with 문 안에서 (현재 thread 가) 기록한 값을 반영하지 않고 list 로 모읍니다.
+        모은 값은 다른 프로세스로 전달해 REGISTRY.replay 로 반영합니다.
+
+    Usage:
+        >>> with capture() as events:
+        >>>     result = deductio_and_tax(path, None)
+        >>> REGISTRY.replay(events)
+
+    :list return: [(metric 이름, 'inc' / 'set' / 'observe', label 값 tuple, 값), ... ]
+    """
+    previous = getattr(_capture, 'events', None)
+    _capture.events = []
+    try:
+        yield _capture.events
+    finally:
+        _capture.events = previous
+
+
+REGISTRY = Registry()
+
+# 계산 단계 metric (parser.deductio_and_tax)
+STAGE_SECONDS = REGISTRY.histogram('tax_refund_stage_seconds', '세액 공제 계산 단계별 처리 시간(초)', ['stage'])
+ROSTER_ROWS = REGISTRY.histogram('tax_refund_roster_rows', '계산한 명부 행(row) 수', buckets=ROW_BUCKETS)
+CACHE_REQUESTS = REGISTRY.counter('tax_refund_cache_requests_total', 'cache 조회 수 (result: hit / miss)',
+                                  ['cache', 'result'])
+
+# 메모리 진단 metric (memory 참조, TAX_REFUND_MEMORY_TRACE 가 켜진 경우만 기록합니다.)
+STAGE_PEAK_BYTES = REGISTRY.histogram('tax_refund_stage_peak_bytes', '계산 단계별 최대 사용 메모리(bytes, tracemalloc)',
+                                      ['stage'], buckets=MEMORY_BUCKETS)
+RUN_RETAINED_BYTES = REGISTRY.histogram('tax_refund_run_retained_bytes', '계산 후 해제되지 않은 메모리(bytes, tracemalloc)',
+                                        buckets=MEMORY_BUCKETS)
+MEMORY_BUDGET_EXCEEDED = REGISTRY.counter('tax_refund_memory_budget_exceeded_total', '메모리 예산을 넘은 계산 수')
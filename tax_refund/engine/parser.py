@@ -0,0 +1,1624 @@
+"""
+상시 근로 인정 예외 대상
+    1. 임원 여부(제외),
+    2. 1년 미만 계약직(제외)
+
+청년 인정기간에 제한이 없는 대상 및 청년인정기간 추가 대상
+    1. 장애인 여부(청년 인정 기간 평생)
+    2. 60세 이상(청년 인정 기간 평생)
+    3. 군 복무 기간(추가 대상)
+"""
+import codecs
+import csv
+import functools
+import logging
+import os
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from tax_refund.engine import CSV_EXTENSIONS, START_DATE, END_DATE, calculation_period, exports
+from tax_refund.engine.arrays import load_arrays, save_arrays
+from tax_refund.engine.errors import RosterValidationError
+from tax_refund.engine.memory import stage, traced
+from tax_refund.engine.metrics import CACHE_REQUESTS, ROSTER_ROWS
+from tax_refund.engine.roster import Roster, add_years
+from tax_refund.engine.validation import HEADER_ROWS, REPORT_COLUMNS, clean_workdate
+
+# 기간(start_date ~ end_date) 별 달력 정보
+#   dates: 각 달의 기준 날짜 (datetime64[ns], 읽기 전용)
+#   years: 시작년도 ~ 마지막 년도 (tuple)
+#   year_bounds: 각 년도에 해당하는 dates 의 범위, dates[year_bounds[i]:year_bounds[i + 1]] 가 years[i] 에 해당합니다.
+#   month_year_index: 각 달(month)이 속한 years 의 index
+CalendarGrid = namedtuple('CalendarGrid', ['dates', 'years', 'year_bounds', 'month_year_index'])
+
+# 사업자가입명부 column
+WORKDATE_COLUMNS = ['주민등록번호', '이름', '자격취득일', '자격상실일', '장애인', '임원', '계약직', '입대', '전역']
+
+logger = logging.getLogger(__name__)
+
+# deductio_and_tax 중간 결과 cache 로 저장하는 ndarray
+CACHE_ARRAYS = ['index', 'names', 'work_sums', 'young_sums'] + ['report_' + column for column in REPORT_COLUMNS]
+
+
+def nan2boolean(series):
+    """
+    Description:
+        DataFrame Series 을 datatype 을 boolean 으로 변환합니다.
+        NaN 은 False 로 변환합니다. 그 이외는 True 로 변환합니다.
+
+    :param pd.Series series:
+    :pd.Series return:
+    """
+    series = series.copy()
+    nan_mask = series.isna()
+    series.loc[nan_mask] = False
+    series.loc[~nan_mask] = True
+    series = series.astype(bool)
+    return series
+
+
+def load_workdate(path):
+    """
+    Description:
+        사업자가입명부 엑셀 파일을 로드 합니다.
+        장애인, 임원, 계약직 boolean mask 으로 변환합니다.
+
+    :param str path: 사업자 가입자 명부
+    :pd.Dataframe return:
+    """
+
+    return format_workdate(read_workdate(path))
+
+
+def read_workdate(path):
+    """
+    Description:
+        사업자가입명부 엑셀 파일을 변환 없이 로드 합니다. (column 이름만 지정합니다.)
+        csv / tsv 파일은 엑셀 변환 없이 직접 읽습니다. (read_workdate_csv 참조)
+
+    :param str path: 사업자 가입자 명부
+    :pd.Dataframe return:
+    """
+    if is_csv(path):
+        return read_workdate_csv(path)
+
+    # 엑셀 파일 로드
+    xls = pd.ExcelFile(path)
+    sheets = xls.sheet_names
+    sheet = sheets[0]
+    sh_df = xls.parse(sheet_name=sheet)
+    df = sh_df.iloc[1:, 3:]
+    df.columns = WORKDATE_COLUMNS
+    return df
+
+
+def load_roster(path, on_error='raise', curr_date=None):
+    """
+    Description:
+        사업자가입명부 엑셀 파일을 로드하고 검증한 뒤 Roster 로 반환합니다.
+        주민등록번호, 날짜 등은 이때 한번만 파싱됩니다.
+        검증한 명부 column 으로 바로 Roster 를 만듭니다. (format_workdate 로 DataFrame 을 변환하지 않습니다.)
+
+    :param str path: 사업자 가입자 명부
+    :param str on_error: 검증 오류 처리 방법, 'raise' 또는 'quarantine' (clean_workdate 참조)
+    :param Timestamp curr_date: 복무 중인 인원의 전역 날짜 (Roster.from_workdate 참조), None 이면 오늘
+    :return:
+        : Roster roster:
+        : DataFrame report: 검증 오류 목록
+    """
+    employee_df, report = clean_workdate(read_workdate(path), on_error=on_error)
+    return Roster.from_workdate(employee_df, curr_date), report
+
+
+def format_workdate(df):
+    """
+    Description:
+        사업자가입명부 column 이름을 지정하고 장애인, 임원, 계약직 boolean mask, 입대/전역 날짜로 변환합니다.
+
+    :param pd.DataFrame df: 사업자 가입자 명부 중 주민등록번호 column 부터 시작하는 table
+    :pd.Dataframe return:
+    """
+    df.columns = WORKDATE_COLUMNS
+
+    df.isetitem(4, nan2boolean(df.iloc[:, 4]))  # 장애인 여부
+    df.isetitem(5, nan2boolean(df.iloc[:, 5]))  # 임원 여부
+    df.isetitem(6, nan2boolean(df.iloc[:, 6]))  # 계약직 여부
+    df.isetitem(7, pd.to_datetime(df.iloc[:, 7]))  # 입대 날짜
+    df.isetitem(8, pd.to_datetime(df.iloc[:, 8]))  # 전역 날짜
+
+    return df
+
+
+def sheet_rows(path):
+    """
+    Description:
+        사업자가입명부 엑셀 파일의 첫번째 sheet 를 한 행(row)씩 읽어 반환합니다.
+        sheet 전체를 DataFrame 으로 만들지 않습니다.
+        (.xls 는 xlrd, .xlsx 는 openpyxl read-only 모드로 읽습니다.)
+        ⚠️ xlrd 는 행 단위로 읽을 수 없어 .xls 는 workbook 전체를 메모리에 로드한 뒤 한 행씩 반환합니다.
+
+    :param str path: 사업자 가입자 명부
+    :generator return: [cell, cell, ... cell]
+    """
+    xls = pd.ExcelFile(path)
+    book = xls.book
+
+    # .xls (xlrd)
+    if hasattr(book, 'sheet_by_index'):
+        import xlrd
+        sheet = book.sheet_by_index(0)
+        for i in range(sheet.nrows):
+            row = []
+            for cell in sheet.row(i):
+                if cell.ctype in (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK, xlrd.XL_CELL_ERROR):
+                    row.append(np.nan)
+                elif cell.ctype == xlrd.XL_CELL_DATE:
+                    row.append(xlrd.xldate_as_datetime(cell.value, book.datemode))
+                elif cell.ctype == xlrd.XL_CELL_BOOLEAN:
+                    row.append(bool(cell.value))
+                else:
+                    row.append(cell.value)
+            yield row
+    # .xlsx (openpyxl)
+    else:
+        for row in book.worksheets[0].iter_rows(values_only=True):
+            yield [np.nan if cell is None else cell for cell in row]
+    xls.close()
+
+
+def is_csv(path):
+    return os.path.splitext(str(path))[-1].lower() in CSV_EXTENSIONS
+
+
+def detect_encoding(path, sample_size=64 * 1024):
+    """
+    Description:
+        csv 파일의 인코딩을 확인합니다. BOM 이 있으면 utf-8-sig, 앞부분이 utf-8 로 읽히면 utf-8, 아니면 cp949 입니다.
+
+    :param str path: csv 파일
+    :param int sample_size: 확인할 앞부분 bytes
+    :str return: 'utf-8-sig', 'utf-8', 'cp949'
+    """
+    with open(path, 'rb') as f:
+        sample = f.read(sample_size)
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    try:
+        # sample 끝에서 잘린 글자는 오류로 보지 않습니다. (final=False)
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'cp949'
+
+
+def csv_rows(path):
+    """
+    Description:
+        csv / tsv 파일을 한 행(row)씩 읽어 반환합니다. 빈 칸은 NaN 입니다. (sheet_rows 와 같은 형식)
+        인코딩은 detect_encoding, 구분자는 .tsv 이거나 첫 행에 tab 이 더 많으면 tab 입니다.
+
+    :param str path: csv 파일
+    :generator return: [cell, cell, ... cell]
+    """
+    encoding = detect_encoding(path)
+    with open(path, newline='', encoding=encoding) as f:
+        first_line = f.readline()
+        f.seek(0)
+        tsv = str(path).lower().endswith('.tsv') or first_line.count('\t') > first_line.count(',')
+        for row in csv.reader(f, delimiter='\t' if tsv else ','):
+            yield [cell.strip() or np.nan for cell in row]
+
+
+def csv_workdate_chunks(path, chunksize=10000):
+    """
+    Description:
+        csv 사업자가입명부를 chunksize 행(row) 단위로 나눠 변환 없이 로드 합니다.
+        '주민등록번호' header 가 있는 행(처음 HEADER_ROWS 행 중)과 column 위치를 찾아 다음 행부터 읽습니다.
+            1) 엑셀 명부를 csv 로 저장한 경우 : 2번째 행, 4번째 column 부터 (read_workdate 와 같습니다.)
+            2) header 가 한 행인 경우 : 1번째 행, 1번째 column 부터
+        index 는 검증 오류의 행 번호(index + HEADER_ROWS)가 csv 줄 번호가 되도록 지정합니다.
+
+    :param str path: csv 파일
+    :param int chunksize: 한번에 로드할 행(row) 수
+    :generator return: pd.DataFrame
+    """
+    rows = csv_rows(path)
+    header_row, offset = None, None
+    for line, row in enumerate(rows, start=1):
+        if WORKDATE_COLUMNS[0] in row:
+            header_row, offset = line, row.index(WORKDATE_COLUMNS[0])
+            break
+        if line >= HEADER_ROWS:
+            break
+    if header_row is None:
+        raise RosterValidationError([{'row': 1, 'column': WORKDATE_COLUMNS[0], 'value': '',
+                                      'error': 'header 행을 찾을 수 없음'}])
+
+    n_columns = len(WORKDATE_COLUMNS)
+    index, batch = [], []
+    for line, row in enumerate(rows, start=header_row + 1):
+        # 빈 행은 건너뛰고, 끝의 빈 column 이 생략된 행은 NaN 으로 채웁니다.
+        cells = row[offset:offset + n_columns]
+        if all(cell is np.nan for cell in cells):
+            continue
+        index.append(line - HEADER_ROWS)
+        batch.append(cells + [np.nan] * (n_columns - len(cells)))
+        if len(batch) == chunksize:
+            yield pd.DataFrame(batch, index=index, columns=WORKDATE_COLUMNS)
+            index, batch = [], []
+    if batch:
+        yield pd.DataFrame(batch, index=index, columns=WORKDATE_COLUMNS)
+
+
+def read_workdate_csv(path):
+    """
+    Description:
+        csv 사업자가입명부를 변환 없이 로드 합니다. read_workdate 와 같은 column 을 가집니다.
+
+    :param str path: csv 파일
+    :pd.Dataframe return:
+    """
+    chunks = list(csv_workdate_chunks(path))
+    if not chunks:
+        return pd.DataFrame(columns=WORKDATE_COLUMNS)
+    return pd.concat(chunks)
+
+
+def read_workdate_chunks(path, chunksize=10000):
+    """
+    Description:
+        사업자가입명부 엑셀 파일을 chunksize 행(row) 단위로 나눠 변환 없이 로드 합니다.
+        각 chunk 는 read_workdate 와 동일한 column, index 를 가집니다.
+        csv / tsv 파일은 csv_workdate_chunks 로 읽습니다.
+
+    :param str path: 사업자 가입자 명부
+    :param int chunksize: 한번에 로드할 행(row) 수
+    :generator return: pd.DataFrame
+    """
+    if is_csv(path):
+        yield from csv_workdate_chunks(path, chunksize)
+        return
+
+    rows = sheet_rows(path)
+
+    # header, 부제목 행을 제외합니다.
+    next(rows, None)
+    next(rows, None)
+
+    offset = 1
+    batch = []
+    for row in rows:
+        batch.append(row[3:12])
+        if len(batch) == chunksize:
+            yield pd.DataFrame(batch, index=range(offset, offset + len(batch)), columns=WORKDATE_COLUMNS)
+            offset += len(batch)
+            batch = []
+    if batch:
+        yield pd.DataFrame(batch, index=range(offset, offset + len(batch)), columns=WORKDATE_COLUMNS)
+
+
+def iter_workdate(path, chunksize=10000):
+    """
+    Description:
+        사업자가입명부 엑셀 파일을 chunksize 행(row) 단위로 나눠 로드 합니다.
+        각 chunk 는 load_workdate 와 동일한 column, dtype, index 를 가집니다.
+
+    :param str path: 사업자 가입자 명부
+    :param int chunksize: 한번에 로드할 행(row) 수
+    :generator return: pd.DataFrame
+    """
+    for df in read_workdate_chunks(path, chunksize):
+        yield format_workdate(df)
+
+
+def get_dates_by_month(start_date, end_date, option='end'):
+    """
+    Description:
+        지정된 기간 내 달(month) 단위로 날짜 정보(yyyy-mm-dd)를 제공합니다.
+    Usage:
+        >>> get_dates_by_month('2023-01-01', '2023-03-01', option='end')
+        # ['2018-01-31', '2018-02-28']
+
+    Args:
+        :param pd.datetime start_date: yyyy-mm-dd
+        :param pd.datetime end_date: yyyy-mm-dd
+        :param option:
+         1) end : 매달 마지막 날 정보를 제공
+         2) start : 매달 첫번째 날 정보를 제공
+
+    :list return:
+        [yyyy-mm-dd, yyyy-mm-dd, ... yyyy-mm-dd]
+
+    """
+    return list(pd.DatetimeIndex(calendar_grid(start_date, end_date, option).dates))
+
+
+def calendar_grid(start_date, end_date, option='end'):
+    """
+    Description:
+        지정된 기간의 달력 정보(CalendarGrid)를 제공합니다.
+        같은 기간, 같은 option 은 한번만 계산하고 이후에는 cache 된 결과를 공유합니다.
+        (반환되는 ndarray 는 읽기 전용입니다.)
+
+    Usage:
+        >>> grid = calendar_grid('2018-01-01', '2022-12-31')
+        >>> grid.years
+        # (2018, 2019, 2020, 2021, 2022)
+
+    Args:
+        :param str start_date: yyyy-mm-dd
+        :param str end_date: yyyy-mm-dd
+        :param option: get_dates_by_month 의 option 과 같습니다.
+
+    :CalendarGrid return:
+    """
+    return _calendar_grid(pd.Timestamp(start_date), pd.Timestamp(end_date), option)
+
+
+@functools.lru_cache(maxsize=64)
+def _calendar_grid(start_date, end_date, option):
+    month_starts = pd.date_range(start=start_date, end=end_date, freq='MS')
+    if option == 'end':
+        dates = (month_starts + pd.offsets.MonthEnd(0)).values
+    elif option == 'start':
+        dates = month_starts.values
+    else:
+        raise NotImplementedError
+
+    years = tuple(range(start_date.year, end_date.year + 1))
+    month_year_index = pd.DatetimeIndex(dates).year.values - start_date.year
+    year_bounds = np.searchsorted(month_year_index, np.arange(len(years) + 1))
+
+    for array in (dates, month_year_index, year_bounds):
+        array.setflags(write=False)
+    return CalendarGrid(dates, years, year_bounds, month_year_index)
+
+
+def check_workdate(start_date, end_date, acquisi_date, disqual_date):
+    """
+    Description:
+        시작 날짜와 종료 날짜 사이 각 달에 해당 인원이 근무 했는지를 파악해 반환합니다.
+        근무 여부 판단 상세 기준: 각 달의 마지막날이 기준 날짜가 됩니다. 기준 날짜 이전에 입사, 기준 날짜 퇴사 시 True 로 합니다.
+
+    Args:
+        :param datetime start_date: 시작 날짜
+        :param datetime end_date: 종료 날짜
+        :param DataFrame.Series acquisi_date:
+        :param DataFrame.Series disqual_date:
+
+    :return DataFrame:
+        지정된 기간동안에 각 달(month)별로 근무 여부가 check 되어 있는 table
+        example)
+            +--------+----------+----------+----------+----------+--------+
+            |        | 2018.1.1 | 2018.1.2 | 2018.1.3 | 2018.1.4 | 2018.1.5|
+            +--------+----------+----------+----------+----------+--------+
+            | 강대영 | TRUE     | FALSE    | FALSE    | FALSE    | FALSE  |
+            +--------+----------+----------+----------+----------+--------+
+            | 강혜진 | TRUE     | TRUE     | TRUE     | TRUE     | TRUE   |
+            +--------+----------+----------+----------+----------+--------+
+
+    """
+
+    # 지정된 기간내 마지막 날짜 추출
+    dates = calendar_grid(start_date, end_date, option='end').dates
+
+    # 각 달의 마지막날이 기준 날짜,
+    # 기준 날짜 이전에 입사 그리고 기준 날짜 퇴사했으면 True 아니면 False 을 준다.
+    acquisi = pd.to_datetime(acquisi_date).values[:, None]
+    disqual = pd.to_datetime(disqual_date).values[:, None]
+    mask = (acquisi <= dates) & (disqual >= dates)
+    calendar_df = pd.DataFrame(mask, index=acquisi_date.index, columns=pd.DatetimeIndex(dates))
+    return calendar_df
+
+
+def sum_by_yaer(calendar_df, years, prefix=None):
+    """
+    Description:
+        년도 별 근무자 수를 집계(sum)해 반환
+
+    :param DataFrame calendar_df:
+       ⚠️ calendar_df column 이름은 datatime 으로 이루어져야 한다.
+            example)
+            +--------+----------+----------+----------+----------+--------+
+            |        |2018.1.31| 018.2.28 |2018.3.31| 2018.4.30 |2018.5.31|
+            +--------+----------+----------+----------+----------+--------+
+            | 강대영 | TRUE     | FALSE    | FALSE    | FALSE    | FALSE  |
+            +--------+----------+----------+----------+----------+--------+
+            | 강혜진 | TRUE     | TRUE     | TRUE     | TRUE     | TRUE   |
+            +--------+----------+----------+----------+----------+--------+
+    :param list years: [int, int, ... int ]
+    :param str prefix: column 명 앞에 붙여질 접두사
+
+    :return DataFrame:
+        columns : years
+        index : calendar_df.index
+        values : 각 년도별 일한 개월 수
+    """
+
+    # 각 년도별 집계(total)테이블 생성
+    totalwork_df = pd.DataFrame()
+    totalwork_df.index = calendar_df.index
+    calendar_years = calendar_df.columns.map(lambda x: x.year)
+
+    # 각 년도별 근무 날짜 집계
+    for ind, year in enumerate(years):
+        # 각 년도에 해당 하는 column 을 추출
+        mask = (calendar_years == year)
+        sliced_df = calendar_df.loc[:, mask]
+        # 각 년도별 근무 달 수 집계(sum)
+        total_works = sliced_df.values.sum(axis=1)
+        # column 이름 변경
+        if prefix:
+            column_name = prefix + str(year)
+        else:
+            column_name = str(year)
+        totalwork_df[column_name] = total_works
+
+    return totalwork_df
+
+
+def resident2date(resident_codes):
+    """
+    Description:
+        주민등록번호를 날짜로 변환합니다.
+        (주민등록번호 샘플: 900117-1xxxxxx)
+        뒷번호가 1, 2, 3, 4 여부에 따라 19년도 출생인지 20년도 출생인지가 결정 됩니다.
+
+    :param pd.Series resident_codes:
+    example)
+        [900117-1xxxxxx, 900117-1xxxxxx, ... 900117-1xxxxxx]
+    :datetime return: yyyymmdd
+    example)
+        19900117
+    """
+
+    # 생년 월일을 계산한다.
+    birth_date = resident_codes.map(lambda x: x[:6])
+    birth_index = resident_codes.map(lambda x: x[7]).map(int)
+    prefix_mask = birth_index < 3
+    birth_date.loc[prefix_mask] = birth_date.loc[prefix_mask].map(lambda x: '19' + str(x))
+    birth_date.loc[~prefix_mask] = birth_date.loc[~prefix_mask].map(lambda x: '20' + str(x))
+    return birth_date
+
+
+def generate_work_calendar(start_date, end_date, acquisi_date, disqual_date):
+    """
+    Description:
+        각 인원별, 각 년도별 상시 근로자와 청년 근로자 총 근무 달수를 계산해 반환합니다.
+        ⚠️ Warning : 210살 이상 생존한 사람이 있다면 해당 기능에 문제가 생길수 있습니다.
+
+    Args:
+        :param str start_date: yyyy-mm-dd, example) '2017-01-01'
+        :param str end_date: yyyy-mm-dd, example) '2022-12-31'
+        :param pd.Series acquisi_date: 자격취득일
+            example) [timestamp, timestamp, ... timestamp]
+        :param pd.Series disqual_date: 자격상실일
+            example) [timestamp, timestamp, ... timestamp]
+
+    :DataFrame return:
+        workdate_df: 근무 달수 별로 일한 달에 True, 일하지 않은 달에 False
+            +----------+----------+----------+----------+--------+
+            | 2018.1.1 | 2018.1.2 | 2018.1.3 | 2018.1.4 | 2018.1.5|
+            +----------+----------+----------+----------+--------+
+            | TRUE     | FALSE    | FALSE    | FALSE    | FALSE  |
+            +--------+----------+----------+----------+----------+
+            | TRUE     | TRUE     | TRUE     | TRUE     | TRUE   |
+            +----------+----------+----------+----------+--------+
+
+        workdate_sum_df: 근무 달수를 연도별로 더함
+            +--------+--------+--------+--------+--------+
+            | 2018년 | 2019년 | 2020년 | 2021년 | 2022년    |
+            +--------+--------+--------+--------+--------+
+            | 12     | 12     | 12     | 12     | 12     |
+            +--------+--------+--------+--------+--------+
+            | 12     | 12     | 12     | 12     | 12     |
+            +--------+--------+--------+--------+--------+
+
+    """
+    # 적용 연도
+    years = get_years(start_date, end_date)
+
+    # 인원별 상시 근무 날짜 체크 합니다.
+    workdate_df = check_workdate(start_date, end_date, acquisi_date, disqual_date)
+    workdate_sum_df = sum_by_yaer(workdate_df, years, prefix='(상시)')
+
+    return workdate_df, workdate_sum_df
+
+
+def category_periods(roster, curr_date):
+    """
+    Description:
+        인원별 상시 / 청년 / 노인 인정 기간을 datetime64[D] ndarray 로 반환합니다.
+        각 기간은 근무 기간과 겹치는 기간(intersection)이며, 시작 날짜가 종료 날짜보다 늦으면 겹치는 기간이 없는 것입니다.
+        기간이 없으면(생년월일 변환 불가 등) 시작 또는 종료 날짜가 NaT 입니다.
+
+    :param Roster roster:
+    :param Timestamp curr_date: 자격상실일이 없는 인원의 자격상실일
+    :dict return: {'work': (start, end), 'young': (start, end), 'elder': (start, end)}
+    """
+    birth_date = roster.birth_dates  # 생년월일
+    acquisi_date = roster.acquisi_dates  # 자격취득날짜
+    curr_date = pd.Timestamp(curr_date).to_datetime64().astype('datetime64[D]')
+    disqual_date = np.where(np.isnat(roster.disqual_dates), curr_date, roster.disqual_dates)  # 자격상실날짜
+
+    # 청년 인정 기간 (30세 미만, 군복무 기간 추가)
+    young_disqual_date = add_years(birth_date, 30) + roster.military_days.astype('timedelta64[D]')
+
+    # 노인 인정 기간 (60세 이상, 60세 이후 근무 기간 전체)
+    elder_acquisi_date = add_years(birth_date, 60)
+
+    return {'work': (acquisi_date, disqual_date),
+            'young': (np.maximum(acquisi_date, birth_date), np.minimum(disqual_date, young_disqual_date)),
+            'elder': (np.maximum(acquisi_date, elder_acquisi_date), disqual_date)}
+
+
+def classify_categories(roster, curr_date):
+    """
+    Description:
+        사업자가입명부를 한번에 읽어 인원별 상시/청년/노인 인정 기간과 장애인, 청년 제외(임원, 계약직) 여부를 계산해 반환합니다.
+        인정 기간은 category_periods 와 같습니다.
+
+    Args:
+        :param Roster roster: 사업자가입명부 (load_workdate 결과 DataFrame 도 가능합니다.)
+        :param Timestamp curr_date: 자격상실일이 없는 인원의 자격상실일
+
+    :DataFrame return:
+        +----------+----------+-------------+-----------+-------------+-----------+----------+----------+
+        |work_start|work_end  | young_start | young_end | elder_start | elder_end | disabled | excluded |
+        +----------+----------+-------------+-----------+-------------+-----------+----------+----------+
+        |2018-01-01|2022-10-19| 2018-01-01  | 2021-05-03| 2082-05-03  | 2022-10-19| False    | False    |
+        +----------+----------+-------------+-----------+-------------+-----------+----------+----------+
+    """
+    if not isinstance(roster, Roster):
+        roster = Roster.from_workdate(roster, curr_date)
+
+    category_df = pd.DataFrame(index=roster.index)
+    for period, (start, end) in category_periods(roster, curr_date).items():
+        category_df[period + '_start'] = start
+        category_df[period + '_end'] = end
+    category_df['disabled'] = roster.disabled  # 장애인 여부
+    category_df['excluded'] = roster.executive | roster.contract  # 임원, 계약직 여부
+    return category_df
+
+
+def category_calendar(start_date, end_date, category_df):
+    """
+    Description:
+        classify_categories 결과로 상시 근로 테이블과 통합 청년(청년, 노인, 장애인) 근로 테이블을 한번에 생성합니다.
+        임원, 계약직은 청년 근로에서 제외합니다.
+
+    Args:
+        :param str start_date: yyyy-mm-dd, example) '2017-01-01'
+        :param str end_date: yyyy-mm-dd, example) '2022-12-31'
+        :param DataFrame category_df: classify_categories 결과
+
+    :return:
+        :DataFrame workdate_df: 상시 근로자 각 달별 근무 여부
+        :DataFrame young_workdate_df: 통합 청년 근로자 각 달별 근무 여부
+    """
+    dates = calendar_grid(start_date, end_date, option='end').dates
+
+    def within(start, end):
+        return (category_df[start].values[:, None] <= dates) & (category_df[end].values[:, None] >= dates)
+
+    work_mask = within('work_start', 'work_end')
+    young_mask = within('young_start', 'young_end') & ~category_df['excluded'].values[:, None]
+    young_mask |= within('elder_start', 'elder_end')
+    young_mask |= work_mask & category_df['disabled'].values[:, None]
+
+    columns = pd.DatetimeIndex(dates)
+    workdate_df = pd.DataFrame(work_mask, index=category_df.index, columns=columns)
+    young_workdate_df = pd.DataFrame(young_mask, index=category_df.index, columns=columns)
+    return workdate_df, young_workdate_df
+
+
+def get_diff(workers):
+    """
+    Description:
+        년도별 근로자 차이를 계산해 반환
+
+    Args:
+        :param ndarray workers:
+            example) [52, 64, .. , 58]
+        :ndarray return:
+    """
+    rolled_workers = np.roll(workers, 1)
+    diff = workers - rolled_workers
+    diff[0] = 0
+    return diff
+
+
+def get_years(start_date, end_date):
+    """
+    Description:
+        시작년도 이상 마지막 년도 이하 모든 년도를 찾아 반환합니다.
+        년도는 오름 차순으로 정렬되어 있습니다.
+        시작년도와 마지막년도를 모두 포함합니다.
+
+    :param str start_date: yyyy-mm-dd
+    :param str end_date: yyyy-mm-dd
+    :list return: [int, int, int]
+    """
+
+    return list(calendar_grid(start_date, end_date).years)
+
+
+def first_deduction(young_counts, etc_counts, years):
+    """
+    Description:
+        최초 공제 정보를 계산해 반환합니다.
+    Args:
+        :param ndarray young_counts: 연도별 청년 근로자, 값 순서는 연도순으로 나열되어 있어야 합니다.
+        :param ndarray etc_counts: 연도별 기타 근로자
+        :return:
+            [[index, 청년 공제 증가, 기타 공제 증가, 공제 년도],
+             [index, 청년 공제 증가, 기타 공제 증가, 공제 년도]]
+             ⚠️(청년 공제 증가, 기타 공제 증가 최소값 = 0)
+
+    """
+    yng_diff = get_diff(young_counts)
+    etc_diff = get_diff(etc_counts)
+    wkr_diff = yng_diff + etc_diff
+
+    # 최초 공제 시기
+    first_deduction_index = np.where(wkr_diff > 0)[0]
+    first_deduction_year = list(map(lambda x: years[x], first_deduction_index))
+
+    # 최초 공제 시기에 청년/기타 작년도 대비 근무 개월 수 차이
+    target_young_deductions = yng_diff[first_deduction_index]  # 청년
+    target_etc_deductions = etc_diff[first_deduction_index]  # 기타
+
+    # axis=0 최초 공제 연도, axis=1 (index, 작년도 대비 청년 근무 개월 수 차이, 작년도 대비 기타 근무 개월 수 차이)
+    first_deduction_infos = np.stack(
+        [first_deduction_index, target_young_deductions, target_etc_deductions, first_deduction_year], axis=-1)
+    first_deduction_infos = pd.DataFrame(first_deduction_infos)
+    first_deduction_infos.columns = ['year_index', 'young', 'etc', 'year']
+
+    return first_deduction_infos
+
+
+def deduction_mask(young_counts, etc_counts, index, projected_from=None):
+    """
+    Description:
+        최초 공제 시기 이후 2년동안 청년 공제, 기타 공제 자격여부를 파악해 반환합니다.
+        공제 규칙은 wiki 을 참조하세요.
+        추정 연도(projected_from 이후)는 작년도 대비 증가량이 아니라 최초 공제 연도 대비 근무 달 수로 확인합니다.
+        (추정 근무 달 수가 최초 공제 연도보다 줄어든 경우에만 자격을 상실합니다.)
+
+    Args:
+    :param ndarray young_counts: 연도별 청년 근무 달(month) 수
+    :param ndarray etc_counts: 연도별 기타 근무 달(month) 수
+    :param int index: 최초 공제를 받은 연도 인덱스
+    :param int projected_from: 첫번째 추정 연도 인덱스, None 이면 추정 연도가 없습니다.
+
+    :ndarray return:
+        +--+------+------+------+------+------+
+        |  | 2019 | 2020 | 2021 | 2022 | 2023 |
+        +--+------+------+------+------+------+
+        |  | NaN  |  NaN | True | True | -1  |
+        +--+------+------+------+------+------+
+        |  | NaN  |  NaN | True | False| -1  |
+        +--+------+------+------+------+------+
+    NaN 은 공제 계산을 하지 않은것
+    """
+    year_length = len(young_counts)
+    deduction_year = 2  # 추가 공제 년도
+
+    # axis 0 에 0th index => 청년 공제, axis 0 에 1th index => 기타 공제
+    deduction_calendar = np.zeros(shape=(len(young_counts), 2)) + np.nan
+
+    yng_diff = get_diff(young_counts)
+    etc_diff = get_diff(etc_counts)
+    wkr_diff = yng_diff + etc_diff
+
+    # 최초 공제시 근로 개월수 작녀 대비 차이
+    wrk_diff_std = wkr_diff[index]
+    yng_diff_std = yng_diff[index]
+    etc_diff_std = etc_diff[index]
+
+    for i in np.arange(index, np.minimum(index + deduction_year + 1, year_length)):
+        # 공제 자격 여부를 검토합니다.
+        # 공제 자격을 유지 합니다.
+        # 청년 공제 가능 여부를 검토 합니다.
+        if projected_from is not None and i >= projected_from:
+            # 추정 연도 : 최초 공제 연도보다 근무 달 수가 줄었는지 확인합니다.
+            if young_counts[index] + etc_counts[index] <= young_counts[i] + etc_counts[i]:
+                deduction_calendar[i, 0] = young_counts[index] <= young_counts[i]
+                deduction_calendar[i, 1] = etc_counts[index] <= etc_counts[i]
+            else:
+                deduction_calendar[i, 0] = -1
+                deduction_calendar[i, 1] = -1
+                break
+        elif wrk_diff_std <= wkr_diff[i]:
+            # 청년 공제 가능시 deduction_calendar 에 청년 공제 비율을 기록합니다.
+            if yng_diff_std <= yng_diff[i]:
+                deduction_calendar[i, 0] = True
+            else:
+                deduction_calendar[i, 0] = False
+                # 기타 공제 가능시 deduction_calendar 에 기타 공제 비율을 기록합니다.
+
+            if etc_diff_std <= etc_diff[i]:
+                deduction_calendar[i, 1] = True
+            else:
+                deduction_calendar[i, 1] = False
+        # 상시 근로자가 한명이라도 2년안에 줄면 공제 자격을 상실 합니다.
+        else:
+            deduction_calendar[i, 0] = -1
+            deduction_calendar[i, 1] = -1
+            break
+    return deduction_calendar
+
+
+@functools.lru_cache(maxsize=None)
+def deduction_table(capital_area):
+    """
+    Description:
+        공제 금액 테이블을 반환합니다.
+        (⚠️ 중소 기업 이하만 적용 가능하다. 매년 년도별 공제 금액을 업데이트 해야 한다.
+            연도를 추가하면 공제 적용 연도 검사에 사용하는 DEDUCTION_YEARS 도 업데이트 해야 한다.)
+        또한 수도권 / 비수도권이 나눠어져 있다.
+        공제율(중소 기업 이하):
+            2018~2020, 2023년
+                +----------+------------+--------+
+                |          | 수도권 밖  | 수도권 |
+                +----------+------------+--------+
+                | 청년     | 1200       | 1100   |
+                +----------+------------+--------+
+                | 청년 외  | 770        | 700    |
+                +----------+------------+--------+
+            2021,2022
+                +----------+------------+--------+
+                |          | 수도권 밖  | 수도권 |
+                +----------+------------+--------+
+                | 청년     | 1300       | 1100   |
+                +----------+------------+--------+
+                | 청년 외  | 770        | 700    |
+                +----------+------------+--------+
+    Args:
+        :param capital_area:
+        :return:
+            ⚠️ cache 된 테이블이 공유되므로 반환된 테이블을 수정하지 마세요.
+    """
+    capital_df = pd.DataFrame()
+    capital_df.index = ['young', 'etc']
+    capital_df[2018] = [1100, 700]
+    capital_df[2019] = [1100, 700]
+    capital_df[2020] = [1100, 700]
+    capital_df[2021] = [1100, 700]
+    capital_df[2022] = [1100, 700]
+    capital_df[2023] = [1100, 700]
+
+    noncptl_df = pd.DataFrame()
+    noncptl_df.index = ['young', 'etc']
+    noncptl_df[2018] = [1200, 770]
+    noncptl_df[2019] = [1200, 770]
+    noncptl_df[2020] = [1200, 770]
+    noncptl_df[2021] = [1300, 770]
+    noncptl_df[2022] = [1300, 770]
+    noncptl_df[2023] = [1200, 770]
+
+    if capital_area:
+        tax_table = capital_df
+    else:
+        tax_table = noncptl_df
+
+    return tax_table
+
+
+def deduction_tax(year, type, capital_area):
+    """
+    Description:
+        해당년도의 청년 또는 기타 공제 금액을 산정해 반환한다.
+        (⚠️ 중소 기업 이하만 적용 가능하다. 매년 년도별 공제 금액을 업데이트 해야 한다.)
+
+    Args:
+        :param int year: 적용 연도
+        :param str type: 'young' or 'etc'
+        :param bool capital_area: 수도권 여부, 수도권이면 True
+
+        :int return: 공제 금액
+    """
+    assert (type == 'young') or (type == 'etc'), 'type 값으로는 "young" , "etc" 만 가능합니다.'
+
+    tax_table_df = deduction_table(capital_area)
+    # 공제 금액이 정해지지 않은 이후 연도(추정)는 마지막 연도 공제 금액을 적용합니다.
+    year = min(year, tax_table_df.columns.max())
+    tax = tax_table_df.loc[type, year]
+    return tax
+
+
+def calculate_deduction(year, capital_area, yng_diff, etc_diff):
+    """
+    Description:
+        공제 받을 세금을 계산해 반환
+        공제 금액은 최대 상시 근로자 수에 비례한다.
+
+    Args:
+        :param int year: 적용 연도
+        :param bool capital_area: 수도권 여부, 수도권이면 True
+        :param ndarray yng_diff: 연도별 청년 근로자, 값 순서는 연도순으로 나열되어 있어야 합니다.
+        :param ndarray etc_diff: 연도별 기타 근로자
+
+    :return:
+    """
+    # 청년/기타 근로 개월 수 차이
+    total_diff = yng_diff + etc_diff
+
+    # 해당 연도 및 지역의 청년/기타 공제 금액
+    young_tax = deduction_tax(year, 'young', capital_area)
+    etc_tax = deduction_tax(year, 'etc', capital_area)
+
+    if yng_diff >= 0 and etc_diff >= 0:
+        young_diff_tax = young_tax * yng_diff
+        etc_diff_tax = etc_tax * etc_diff
+
+    elif yng_diff <= 0 and etc_diff >= 0:
+        young_diff_tax = 0
+        etc_diff_tax = etc_tax * total_diff
+
+    elif yng_diff >= 0 and etc_diff <= 0:
+        young_diff_tax = young_tax * total_diff
+        etc_diff_tax = 0
+
+    elif yng_diff <= 0 and etc_diff <= 0:
+        young_diff_tax = 0
+        etc_diff_tax = 0
+    else:
+        raise NotImplementedError
+
+    return young_diff_tax, etc_diff_tax
+
+
+def calculate_deduction_sum(deductions, year):
+    """
+    Description:
+        해당 년도에 받은 총 공제 금액을 더한다.
+
+    Args:
+        :param list deductions:
+            [deduction, deduction ... deduction]
+            deduction:
+                +--+------+------+------+------+------+
+                |  | 2019 | 2020 | 2021 | 2022 | 2023 |
+                +--+------+------+------+------+------+
+                |  | NaN  |  NaN | 1100 | 1100 | -1   |
+                +--+------+------+------+------+------+
+                |  | NaN  |  NaN | 700 | 0     | -1   |
+                +--+------+------+------+------+------+
+        :param int year:
+
+    :int return:
+    """
+
+    tax = []
+
+    # 지정된 연도의 공제 금액을 모두 더합니다.
+    for deduction_df in deductions:
+        # 해당 년도에 -1, NaN 을 0으로 변환 (추가 납부 표시(-1)가 지워지지 않도록 복사본을 수정합니다.)
+        deduction_df = deduction_df.mask(deduction_df < 0, 0).fillna(0)
+        # 지정된 연도의 공제 금액 합
+        tax.append(deduction_df.loc[:, year].sum())
+
+    total_tax = np.sum(tax)
+    return total_tax
+
+
+def calculate_tax_sum(deductions, year):
+    """
+    Description:
+        환급해야 할 세금 금액을 계산합니다.
+        :param list deductions:
+            [deduction, deduction ... deduction]
+            deduction:
+                +--+------+------+------+------+------+
+                |       | 2019 | 2020 | 2021 | 2022 | 2023 |
+                +--+------+------+------+------+------+
+                | young | NaN  |  NaN | True | True | NaN  |
+                +--+------+------+------+------+------+
+                | etc   | NaN  |  NaN | True | False| NaN  |
+                +--+------+------+------+------+------+
+        :param int year:
+    :return:
+    """
+
+    # 환급 받아야 할 공제을 추출합니다.
+    refund_index = []
+    refund_taxs = []
+    for ind, deduction_df in enumerate(deductions):
+
+        # 추가 징수
+        if deduction_df.loc['young', year] == -1:  # 'young' 이 -1 이면 'etc' 도 반드시 -1 입니다.
+            deduction_df = deduction_df.replace({-1: 0})
+            deduction_df = deduction_df.fillna(0)
+            refund_index.append(ind)
+            # 환급 해야 할 돈을 계산합니다. 받았던 모든 공제를 반납해야 합니다.
+            tax = deduction_df.values.sum(axis=None)
+            refund_taxs.append(tax)
+        else:
+            refund_taxs.append(0)
+
+    # 환급 해야 할 돈을 반환합니다.
+    refund_tax = np.sum(refund_taxs)
+
+    return refund_tax
+
+
+def get_deductions(n_youngs, n_etc, capital_area, years, projected_from=None):
+    """
+    Description:
+        공제 테이블을 추출해 반환합니다.
+    Args:
+        :param n_youngs: 각 년도 별 청년 근로자 수
+        :param n_etc: 각 년도 별 기타 근로자 수
+        :param capital_area: 수도권 여부
+        :param years: 각 년도
+        :param projected_from: 첫번째 추정 연도 인덱스 (deduction_mask 참조)
+        :list return:
+            [공제 테이블, 공제 테이블 ... ,공제 테이블]
+
+            공제 테이블 예시)
+                +--+------+------+------+------+------+
+                |  | 2019 | 2020 | 2021 | 2022 | 2023 |
+                +--+------+------+------+------+------+
+                |  | NaN  |  NaN | 1100 | 1100 | -1   |
+                +--+------+------+------+------+------+
+                |  | NaN  |  NaN | 700 | 0     | -1   |
+                +--+------+------+------+------+------+
+    """
+    # 최초 공제 리스트 추출
+    first_deduction_info_df = first_deduction(n_youngs, n_etc, years)
+    first_deduction_infos = first_deduction_info_df.values
+
+    # 최초 공제 리스트를 활용합니다.
+    deduction_tables = []
+    for info in first_deduction_infos:
+        # 각 최초 공제 별 정보 추출
+        index = info[0]
+        yng_diff = info[1]
+        etc_diff = info[2]
+        mask = deduction_mask(n_youngs, n_etc, index, projected_from)
+        deduction_df = pd.DataFrame(mask.T, columns=years, index=['young', 'etc'])
+
+        # 최초 공제에 대한 기타 공제 금액, 청년 공제 금액을 계산합니다.
+        young_tax, etc_tax = calculate_deduction(year=years[index],
+                                                 capital_area=capital_area,
+                                                 yng_diff=yng_diff,
+                                                 etc_diff=etc_diff)
+
+        # 기타공제 금액, 청년 공제금액을 곱합니다.
+        deduction_df.iloc[:, :] = np.array([[young_tax], [etc_tax]]) * deduction_df.values
+        deduction_tables.append(deduction_df)
+
+    return deduction_tables, first_deduction_info_df
+
+
+def generate_workdate(roster, start_date, end_date, curr_date, n_shards=1):
+    """
+    Description:
+        :param Roster roster: 사업자가입명부 (load_workdate 결과 DataFrame 도 가능합니다.)
+            path = './data/사업장가입자명부_20221222 (상실자포함).xls'
+        :param str start_date:
+            start_date = '2018-01-01'
+        :param str end_date:
+            end_date = '2022-12-31'
+        :param Timestamp curr_date:
+            curr_date = pd.Timestamp.today()
+        :param int n_shards: 1 보다 크면 명부를 행(row) 구간으로 나눠 여러 프로세스에서 계산합니다. (shards 참조)
+        :return:
+    """
+    if n_shards > 1:
+        from tax_refund.engine import shards
+        if not isinstance(roster, Roster):
+            roster = Roster.from_workdate(roster, curr_date)
+        return shards.generate_workdate(roster, start_date, end_date, curr_date, n_shards)
+
+    # 인원별 상시/청년/노인 인정 기간 및 장애인, 임원, 계약직 여부
+    category_df = classify_categories(roster, curr_date)
+
+    # 시작년도 마지막 년도 사이 모든 연도 리스트
+    years = get_years(start_date, end_date)
+
+    # 상시 근로자 근무 표, 통합 청년 근로자(청년, 노인, 장애인) 근무 표
+    workdate_df, merged_young_workdate_df = category_calendar(start_date, end_date, category_df)
+    workdate_sum_df = sum_by_yaer(workdate_df, years, prefix='(상시)')
+    merged_young_workdate_sum_df = sum_by_yaer(merged_young_workdate_df, years, '(청년)')
+
+    return workdate_df, workdate_sum_df, merged_young_workdate_df, merged_young_workdate_sum_df
+
+
+def extend_workdate_sum(young_workdate_sum, etc_workdate_sum):
+    """
+    Description:
+        청년 유예 근로, 기타 유예 근로 달수 계산
+
+    :param young_workdate_sum:
+    :param etc_workdate_sum:
+    :return:
+        DataFrame extend_young_workdate_sum:
+        DataFrame extend_etc_workdate_sum:
+    """
+    assert young_workdate_sum.shape == etc_workdate_sum.shape
+    # workdate column 개 수가 하나시에 적용 년도가 하나 뿐이라 유예 알고리즘을 적용하지 않고 그대로 출력합니다.
+    if young_workdate_sum.shape[1] == 1:
+        extend_young_workdate_sum = young_workdate_sum
+        extend_etc_workdate_sum = etc_workdate_sum
+
+    # workdate column 개 수가 하나 이상 3개 이하이면 적용
+    elif (young_workdate_sum.shape[1] > 1) and (young_workdate_sum.shape[1] <= 3):
+
+        n_index = young_workdate_sum.shape[1]  # 적용 연도 수
+        extend_young_workdate_sum = young_workdate_sum.copy()  # 연도별 청년 유예 근로 달 수(base)
+        extend_etc_workdate_sum = etc_workdate_sum.copy()  # 연도별 기타 유예 근로 달 수(base)
+
+        # 최대 청년 근로 달수를 계산합니다.
+        batch_size = 2
+        for i in range(n_index - batch_size + 1):
+            # prev, post 연도별 청년 근로 달 수
+            prev_young_workdate_sum = young_workdate_sum.iloc[:, i]
+            post_young_workdate_sum = young_workdate_sum.iloc[:, i + 1]
+            # prev, post 연도별 기타 근로 달 수
+            prev_etc_workdate_sum = etc_workdate_sum.iloc[:, i]
+            post_etc_workdate_sum = etc_workdate_sum.iloc[:, i + 1]
+
+            # post 연도별 상시 근로 달 수
+            post_total_workdate_sum = post_young_workdate_sum + post_etc_workdate_sum
+
+            # 최대 청년 근로 달(month)수 (작년도와 해당년도 사이)
+            anchor_young_workdate_sum_np = np.stack([post_young_workdate_sum.values, prev_young_workdate_sum.values],
+                                                    axis=-1).max(axis=-1)
+            # 최대 청년 근로 달수를 상시근로자 수로 제한
+            anchor_young_workdate_sum_np = np.clip(anchor_young_workdate_sum_np, 0, post_total_workdate_sum.values)
+
+            # 기타 근로자 수 계산
+            anchor_etc_workdate_sum_np = post_total_workdate_sum.values - anchor_young_workdate_sum_np
+
+            # 해당 년도에 청년 유예 근로 달수 ,기타 유예 근로 달수를 저장
+            extend_young_workdate_sum.iloc[:, i] = anchor_young_workdate_sum_np
+            extend_etc_workdate_sum.iloc[:, i] = anchor_etc_workdate_sum_np
+
+    else:
+        raise ValueError
+
+    return extend_young_workdate_sum, extend_etc_workdate_sum
+
+
+def df2excel(save_path, **dataframes):
+    """
+    여러 datafarme을 excel로 변화 시켜 반환합니다.
+    :param str save_path: 엑셀 파일 저장 경로
+    :keys :
+        {시트 이름: Dataframe}
+
+    :return:
+    """
+
+    # Create a Pandas Excel writer using XlsxWriter as the engine.
+    writer = pd.ExcelWriter(save_path, engine='xlsxwriter')
+
+    # Write each dataframe to a different worksheet.
+    for sheet_name in dataframes:
+        dataframes[sheet_name].to_excel(writer, sheet_name=sheet_name)
+
+    # Close the Pandas Excel writer and output the Excel file.
+    writer.close()
+
+
+def save_sheets(save_path, export_format='xlsx', **dataframes):
+    """
+    Description:
+        시트들을 export_format 형식으로 저장합니다. (exports 참조)
+
+    :param str save_path: 저장 경로
+    :param str export_format: 'xlsx', 'csv', 'parquet', 'ndjson'
+    :keys :
+        {시트 이름: Dataframe}
+    """
+    if export_format == 'xlsx':
+        return df2excel(save_path, **dataframes)
+    return exports.WRITERS[export_format](save_path, **dataframes)
+
+
+def filter_valid_tax(deductions, year):
+    """
+    해당 년도에 적용되는 추가 납부를 찾아 반환합니다.
+
+    :param deductions:
+        [deduction, deduction ... deduction]
+            deduction:
+                +--+------+------+------+------+------+
+                |  | 2019 | 2020 | 2021 | 2022 | 2023 |
+                +--+------+------+------+------+------+
+                |  | NaN  |  NaN | 1100 | 1100 | -1   |
+                +--+------+------+------+------+------+
+                |  | NaN  |  NaN | 700 | 0     | -1   |
+                +--+------+------+------+------+------+
+
+    :param int year:
+    :return:
+        : list valid_taxs:
+        : list indices:
+    """
+
+    valid_taxs = []
+    indices = []
+    for ind, deduction in enumerate(deductions):
+        if (deduction[year] < 0).all():
+            valid_taxs.append(deduction)
+            indices.append(ind)
+    return valid_taxs, indices
+
+
+def filter_valid_deductions(deductions, year):
+    """
+    해당 년도에 적용되는 공제를 찾아 반환합니다.
+
+    :param deductions:
+        [deduction, deduction ... deduction]
+            deduction:
+                +--+------+------+------+------+------+
+                |  | 2019 | 2020 | 2021 | 2022 | 2023 |
+                +--+------+------+------+------+------+
+                |  | NaN  |  NaN | 1100 | 1100 | -1   |
+                +--+------+------+------+------+------+
+                |  | NaN  |  NaN | 700 | 0     | -1   |
+                +--+------+------+------+------+------+
+
+    :param int year:
+    :return:
+        : Dataframe valid_deductions:
+        : list indices:
+    """
+    valid_deductions = []
+    indices = []
+    for ind, deduction in enumerate(deductions):
+        if (deduction[year] >= 0).all() & ~(deduction[year].isna().any()):
+            valid_deductions.append(deduction)
+            indices.append(ind)
+    return valid_deductions, indices
+
+
+@traced
+def deductio_and_tax(path, save_path, on_error='raise', backend=None, cache_dir=None, index_dir=None,
+                     export_format='xlsx', n_shards=None, curr_date=None, target_year=None):
+    """
+    Description:
+        사업자가입자명부로 마지막 연도의 공제 금액과 추가 납부 금액을 계산하고 엑셀로 저장합니다.
+
+    Args:
+        :param str path: 사업자 가입자 명부
+        :param str save_path: 결과 파일 저장 경로, None 이면 저장하지 않습니다.
+        :param str on_error: 검증 오류 처리 방법, 'raise' 또는 'quarantine' (clean_workdate 참조)
+        :param str backend: 'numpy' 또는 'pandas'(기준 구현), None 이면 기본 backend (backends.get_backend 참조)
+        :param str cache_dir: 중간 결과 cache 디렉토리 (arrays 참조), None 이면 cache 하지 않습니다.
+            cache 가 있으면 명부 파싱, 근로표 계산 단계를 건너뜁니다.
+            ⚠️ 명부, 계산 기간, 계산 날짜, on_error 가 같을 때만 같은 cache_dir 을 사용해야 합니다.
+        :param str index_dir: 시점별 인원 조회 index 저장 디렉토리 (intervals 참조), None 이면 저장하지 않습니다.
+        :param str export_format: 저장 형식 'xlsx', 'csv', 'parquet', 'ndjson' (exports 참조)
+        :param int n_shards: 근로표 계산을 나눠 실행할 최대 프로세스 수 (shards 참조), None 이면 TAX_REFUND_SHARDS 환경 변수
+        :param Timestamp curr_date: 계산 날짜 (상실/전역 날짜가 없는 인원의 종료 날짜), None 이면 오늘
+        :param int target_year: 공제 적용 연도 (calculation_period 참조), None 이면 END_DATE 연도
+
+    :return:
+        : float deduction_tax: 공제 금액
+        : float refund_tax: 추가 납부 금액
+        : DataFrame table_df: 인원별 연도별 상시/청년 근로 달 수와 합계
+    """
+    from tax_refund.engine import shards
+    from tax_refund.engine.backends import get_backend
+    backend = get_backend(backend)
+
+    # 필요 정보를 입력합니다.
+    start_date, end_date = calculation_period(target_year)
+    curr_date = pd.Timestamp.today() if curr_date is None else pd.Timestamp(curr_date)
+    years = get_years(start_date, end_date)
+
+    # 단계별 처리 시간(메모리 진단 모드이면 사용 메모리), 계산한 명부 행 수, cache 조회 결과를 기록합니다.
+    # (memory, metrics 참조, cache 를 사용하면 명부 행 수는 기록하지 않습니다.)
+    roster = None
+    arrays = load_arrays(cache_dir, CACHE_ARRAYS) if cache_dir else None
+    if cache_dir:
+        CACHE_REQUESTS.inc(cache='arrays', result='miss' if arrays is None else 'hit')
+    if arrays is None:
+        # 사업자가입자명부를 로드하고 검증합니다. (on_error: 'raise' 또는 'quarantine')
+        with stage('load'):
+            roster, error_report = load_roster(path, on_error=on_error, curr_date=curr_date)
+        ROSTER_ROWS.observe(len(roster))
+
+        # 인원별 연도별 상시근로, 청년근로 달 수를 계산합니다. (backend 근로표, 집계 단계)
+        # 큰 명부는 행(row) 구간으로 나눠 여러 프로세스에서 계산하고 행 순서대로 합칩니다.
+        with stage('workdate'):
+            work_sums, young_sums = shards.year_sums(backend, roster, start_date, end_date, curr_date, n_shards)
+        arrays = {'index': roster.index, 'names': roster.names, 'work_sums': work_sums, 'young_sums': young_sums}
+        arrays.update({'report_' + column: np.asarray(error_report[column].values,
+                                                      dtype=np.int64 if column == 'row' else str)
+                       for column in REPORT_COLUMNS})
+        if cache_dir:
+            save_arrays(cache_dir, **arrays)
+    else:
+        error_report = pd.DataFrame({column: arrays['report_' + column] for column in REPORT_COLUMNS})
+
+    # 시점별 인원 조회 index 를 저장합니다. (계산 날짜와 관계없으므로 명부마다 한번만 저장합니다.)
+    if index_dir:
+        CACHE_REQUESTS.inc(cache='index', result='hit' if os.path.isdir(index_dir) else 'miss')
+    if index_dir and not os.path.isdir(index_dir):
+        from tax_refund.engine.intervals import RosterIntervalIndex
+        if roster is None:
+            roster, _ = load_roster(path, on_error=on_error, curr_date=curr_date)
+        with stage('index'):
+            RosterIntervalIndex.from_roster(roster).save(index_dir)
+
+    with stage('tables'):
+        name = pd.Series(arrays['names'], index=arrays['index'], name='이름')  # 이름
+        work_sums = arrays['work_sums']
+        young_sums = arrays['young_sums']
+        etc_sums = work_sums - young_sums
+        workdate_sum_df = pd.DataFrame(work_sums, index=name.index,
+                                       columns=['(상시)' + str(year) for year in years])
+        young_workdate_sum_df = pd.DataFrame(young_sums, index=name.index,
+                                             columns=['(청년)' + str(year) for year in years])
+        etc_workdate_sum_df = pd.DataFrame(etc_sums, index=name.index,
+                                           columns=['(기타)' + str(year) for year in years])
+
+        #  상시근로, 청년근로 총 인원수를 계산합니다.
+        table_df = pd.concat([name, workdate_sum_df, young_workdate_sum_df], axis=1)
+        total = table_df.sum(axis=0)
+        total.iloc[0] = '합계'
+        total.name = '합계'
+        table_df = table_df.append(total)
+
+        # 청년 근로 및 기타 근로자 수를 계산합니다.
+        n_workers = work_sums.sum(axis=0)
+        n_youngs = young_sums.sum(axis=0)
+
+    # 공제 금액, 추가 납부 금액, 최초 공제 별 공제 테이블, 최초 공제 정보 (backend 공제 계산 단계)
+    with stage('deduction'):
+        extend_young_totals = backend.extend_totals(young_sums, etc_sums, years)
+        deduction_tax, refund_tax, deduction_tables, first_deduction_info_df, clawback_indices = \
+            backend.deduction(n_workers, n_youngs, extend_young_totals, years)
+        target_year = years[-1]
+
+        # 연도별(추정 연도 포함) 공제 금액, 추가 납부 금액
+        yearly_extend_totals = {year: backend.extend_totals(young_sums, etc_sums, years, target_index)
+                                for target_index, year in enumerate(years)}
+        yearly_df = yearly_deduction_and_tax(n_workers, n_youngs, yearly_extend_totals, years)
+
+    with stage('sheets'):
+        # 엑셀로 변환하기 위해 지정 년도 받은 공제를 찾아 반환합니다.
+        valid_deduction_tables, valid_deduction_indices = filter_valid_deductions(deduction_tables, target_year)
+        # 해당 년도에 받은 공제가 없으면 빈 테이블을 저장합니다.
+        valid_deduction_table = pd.concat(valid_deduction_tables, axis=0) if valid_deduction_tables \
+            else pd.DataFrame(columns=years)
+        valid_first_deduction_info_df = first_deduction_info_df.iloc[valid_deduction_indices]
+
+        # 최초 공제 중 해당년도(2022)와 2년전(2020) 사이 최초 공제 별 청년 / 기타 유예 근무 달 수
+        target_info_df = first_deduction_info_df.loc[first_deduction_info_df['year'] >= target_year - 2]
+        map_year_merged = {}  # 엑셀 변환을 위해 연도와 매칭되는 청년/기타 유예 통합 테이블
+        for _, row in target_info_df.iterrows():
+            year_index = row['year_index']
+            extend_young_workdate_sum_df, extend_etc_workdate_sum_df = extend_workdate_sum(
+                young_workdate_sum_df.iloc[:, year_index:], etc_workdate_sum_df.iloc[:, year_index:])
+            extend_merged_workdate_sums = pd.concat(
+                [name, extend_young_workdate_sum_df, extend_etc_workdate_sum_df], axis=1)
+            map_year_merged[str(row['year']) + '유예근무달수'] = extend_merged_workdate_sums
+
+        # 엑셀로 변환하기 위해 지정 년도에 추가 납부할 공제를 찾아 반환합니다.
+        # 청년 근로 달(Month) 수가 감소한 공제는 해당 년도를 -1 로 표시합니다.
+        tax_tables = [deduction_df.copy() for deduction_df in deduction_tables]
+        for deduction_index in clawback_indices:
+            tax_tables[deduction_index][target_year] = -1
+        valid_tax_tables, valid_tax_indices = filter_valid_tax(tax_tables, target_year)
+        merged_valid_tax_table = pd.concat(valid_tax_tables, axis=0) if valid_tax_tables \
+            else pd.DataFrame(columns=years)
+        valid_first_tax_info_df = first_deduction_info_df.iloc[valid_tax_indices]
+
+        # 이름 column 추가
+        workdate_sum_df, young_workdate_sum_df, etc_workdate_sum_df = list(
+            map(lambda x: pd.concat([name, x], axis=1),
+                [workdate_sum_df, young_workdate_sum_df, etc_workdate_sum_df]))
+
+    if save_path:
+        with stage('export'):
+            save_sheets(save_path, export_format,
+                        공제및추가납부=pd.DataFrame({'공제금액': [deduction_tax], '추가납부금액': [refund_tax]}),
+                        연도별공제및추가납부=yearly_df,
+                        상시근로표=workdate_sum_df,
+                        청년근로표=young_workdate_sum_df,
+                        기타근로표=etc_workdate_sum_df,
+                        공제금액표=valid_deduction_table,
+                        공제정보=valid_first_deduction_info_df,
+                        추가납부금액표=merged_valid_tax_table,
+                        추가납부정보=valid_first_tax_info_df,
+                        **map_year_merged,
+                        **({'검증오류': error_report} if len(error_report) else {}),
+                        )
+    logger.debug('%s년 공제 받은 금액 : %s, 추가 납부 금액 : %s', target_year, deduction_tax, refund_tax)
+    return deduction_tax, refund_tax, table_df
+
+
+def deductio_and_tax_summary(path, save_path, include_table=True, target_year=None, **kwargs):
+    """
+    Description:
+        deductio_and_tax 를 실행하고 view 에서 사용하는 값만 기본 자료형(dict, list, int, float, str)으로 반환합니다.
+        worker 프로세스에서 table_df 를 그대로 돌려보내지 않으므로 요청 처리 프로세스는 pandas 를 import 하지 않습니다.
+
+    Args:
+        :param str path: 사업자 가입자 명부
+        :param str save_path: 결과 파일 저장 경로, None 이면 저장하지 않습니다.
+        :param bool include_table: 인원별 근로 달 수 표(table)를 포함할지 여부 (결과 화면에서만 사용합니다.)
+        :param int target_year: 공제 적용 연도 (calculation_period 참조), None 이면 END_DATE 연도
+        :param kwargs: deductio_and_tax 참조
+
+    :dict return:
+        {'deduction': 공제 금액, 'tax': 추가 납부 금액, 'n_employees': 인원 수, 'years': [2018, ... 2022],
+         'n_workers': 연도별 상시 근로 달 수 합계, 'n_youngs': 연도별 청년 근로 달 수 합계,
+         'first_deductions': [[최초 공제 연도, 청년 공제 증가, 기타 공제 증가], ...] (first_deduction 참조),
+         'table': {'columns': [...], 'rows': [[...], ...]} (include_table 이 False 이면 None)}
+    """
+    deduction, tax, table_df = deductio_and_tax(path, save_path, target_year=target_year, **kwargs)
+    years = [int(year) for year in get_years(*calculation_period(target_year))]
+    total = table_df.loc['합계']
+    n_workers = [int(total['(상시)' + str(year)]) for year in years]
+    n_youngs = [int(total['(청년)' + str(year)]) for year in years]
+    first_deduction_df = first_deduction(np.array(n_youngs), np.array(n_workers) - np.array(n_youngs), years)
+    table = {'columns': table_df.columns.tolist(), 'rows': table_df.values.tolist()} if include_table else None
+    return {'deduction': float(deduction),
+            'tax': float(tax),
+            'n_employees': len(table_df) - 1,
+            'years': years,
+            'n_workers': n_workers,
+            'n_youngs': n_youngs,
+            'first_deductions': first_deduction_df[['year', 'young', 'etc']].astype(int).values.tolist(),
+            'table': table}
+
+
+def extend_workdate_totals(young_workdate_sum_df, etc_workdate_sum_df, years, target_index=-1):
+    """
+    Description:
+        최초 공제 연도 후보(기준 연도와 2년전 사이)별 청년 유예 근로 달수의 연도별 합계를 계산해 반환합니다.
+        extend_workdate_sum 은 인원별로 독립적으로 계산되므로 chunk 별 합계를 더해도 결과가 같습니다.
+
+    :param DataFrame young_workdate_sum_df: 인원별, 연도별 청년 근무 달 수
+    :param DataFrame etc_workdate_sum_df: 인원별, 연도별 기타 근무 달 수
+    :param list years: [int, int, ... int ]
+    :param int target_index: 기준 연도 index, 기본값은 마지막 연도
+    :dict return:
+        {year_index: ndarray, year_index: ndarray ... }
+    """
+    target_index = target_index % len(years)
+    extend_totals = {}
+    for year_index in range(max(target_index - 2, 0), target_index + 1):
+        extend_young_workdate_sum_df, _ = extend_workdate_sum(
+            young_workdate_sum_df.iloc[:, year_index:target_index + 1],
+            etc_workdate_sum_df.iloc[:, year_index:target_index + 1])
+        extend_totals[year_index] = extend_young_workdate_sum_df.values.sum(axis=0)
+    return extend_totals
+
+
+def yearly_extend_workdate_totals(young_workdate_sum_df, etc_workdate_sum_df, years):
+    """
+    Description:
+        모든 연도를 기준 연도로 extend_workdate_totals 를 계산합니다.
+
+    :dict return:
+        {year: {year_index: ndarray ... }, year: {year_index: ndarray ... } ... }
+    """
+    return {year: extend_workdate_totals(young_workdate_sum_df, etc_workdate_sum_df, years, target_index)
+            for target_index, year in enumerate(years)}
+
+
+def yearly_deduction_and_tax(n_workers, n_youngs, yearly_extend_totals, years, capital_area=True,
+                             projection_years=2, projected_workers=None, projected_youngs=None):
+    """
+    Description:
+        계산 기간의 모든 연도와 이후 projection_years 년(추정)의 공제 금액, 추가 납부 금액을 한번에 계산합니다.
+        공제 테이블은 추정 연도까지 한번만 생성하고, 연도별로 테이블 복사본에 대해
+        deduction_and_tax_from_totals 와 같은 순서(공제 합계 → 청년 근로 달수 감소 확인 → 추가 납부)로 계산합니다.
+        계산 기간 마지막 연도의 결과는 deductio_and_tax 결과와 같습니다.
+
+        추정 연도:
+            1) 근로 달 수 : projected_workers, projected_youngs, 주어지지 않으면 마지막 연도 값을 유지합니다.
+            2) 공제 자격 상실 : 추정 근무 달 수가 최초 공제 연도보다 줄어든 경우에만 상실하고 받았던 공제를 반납합니다.
+               (deduction_mask 참조) 마지막 연도 값을 유지하면 추가 납부가 생기지 않습니다.
+            3) 청년 근로 달 수 감소 확인 : 인원별 근로표가 없으므로 확인하지 않습니다.
+               (계산 기간 마지막 연도의 확인 결과를 추정 연도에 다시 적용하지 않습니다.)
+            4) 공제 금액 : deduction_table 에 없는 연도는 마지막 연도 공제 금액을 적용합니다.
+
+    Args:
+        :param ndarray n_workers: 연도별 상시 근로 달 수 합계
+        :param ndarray n_youngs: 연도별 청년 근로 달 수 합계
+        :param dict yearly_extend_totals: yearly_extend_workdate_totals 결과
+        :param list years: [int, int, ... int ]
+        :param bool capital_area: 수도권 여부, 수도권이면 True
+        :param int projection_years: 추정 연도 수, projected_workers 가 주어지면 그 길이를 사용합니다.
+        :param ndarray projected_workers: 추정 연도별 상시 근로 달 수
+        :param ndarray projected_youngs: 추정 연도별 청년 근로 달 수
+
+    :DataFrame return:
+        +------+----------+--------------+-------+
+        |      | 공제금액 | 추가납부금액 | 추정  |
+        +------+----------+--------------+-------+
+        | 2022 | 16000    | 8400         | False |
+        +------+----------+--------------+-------+
+        | 2023 | 13200    | 0            | True  |
+        +------+----------+--------------+-------+
+    """
+    n_workers = np.asarray(n_workers)
+    n_youngs = np.asarray(n_youngs)
+    if projected_workers is None:
+        projected_workers = np.repeat(n_workers[-1:], projection_years)
+    if projected_youngs is None:
+        projected_youngs = np.repeat(n_youngs[-1:], len(projected_workers))
+    assert len(projected_workers) == len(projected_youngs)
+
+    all_years = list(years) + [years[-1] + i + 1 for i in range(len(projected_workers))]
+    all_workers = np.concatenate([n_workers, projected_workers])
+    all_youngs = np.concatenate([n_youngs, projected_youngs])
+    deduction_tables, first_deduction_info_df = get_deductions(all_youngs, all_workers - all_youngs, capital_area,
+                                                               all_years, projected_from=len(years))
+
+    rows = []
+    for target_index, target_year in enumerate(all_years):
+        # calculate_deduction_sum 이 테이블을 수정하므로 기준 연도까지 잘라낸 복사본을 사용합니다.
+        tables = [deduction_df.loc[:, :target_year].copy() for deduction_df in deduction_tables]
+        deduction_tax = calculate_deduction_sum(tables, target_year)
+
+        # 기준 연도와 2년전 사이 최초 공제의 청년 근로 달(Month) 수 감소 여부를 check 합니다.
+        # 추정 연도는 인원별 근로표가 없으므로 확인하지 않습니다.
+        extend_totals = yearly_extend_totals[target_year] if target_index < len(years) else {}
+        target_mask = (first_deduction_info_df['year'] >= target_year - 2) & \
+                      (first_deduction_info_df['year'] <= target_year)
+        for deduction_index, row in first_deduction_info_df.loc[target_mask].iterrows():
+            extend_young_total = extend_totals.get(row['year_index'])
+            if extend_young_total is None:
+                continue
+            if not (extend_young_total - extend_young_total[0] >= 0).all():
+                tables[deduction_index][target_year] = -1
+
+        # 추정 연도의 공제 자격 상실(deduction_mask 의 -1)에는 공제 금액이 곱해져 있으므로
+        # calculate_tax_sum 이 확인하는 추가 납부 표시(-1)로 바꿉니다. (계산 기간 연도는 바꾸지 않습니다.)
+        if target_index >= len(years):
+            for table in tables:
+                if (table[target_year] < 0).any():
+                    table[target_year] = -1
+
+        refund_tax = calculate_tax_sum(tables, target_year)
+        rows.append([deduction_tax, refund_tax, target_index >= len(years)])
+
+    return pd.DataFrame(rows, index=all_years, columns=['공제금액', '추가납부금액', '추정'])
+
+
+def deduction_and_tax_from_totals(n_workers, n_youngs, extend_young_totals, years, capital_area=True):
+    """
+    Description:
+        연도별 상시/청년 근로자 합계만으로 마지막 연도의 공제 금액과 추가 납부 금액을 계산합니다.
+        인원별 근로표 없이 deductio_and_tax 와 같은 결과를 제공합니다.
+
+    Args:
+        :param ndarray n_workers: 연도별 상시 근로 달 수 합계
+        :param ndarray n_youngs: 연도별 청년 근로 달 수 합계
+        :param dict extend_young_totals: extend_workdate_totals 결과
+        :param list years: [int, int, ... int ]
+        :param bool capital_area: 수도권 여부, 수도권이면 True
+
+    :return:
+        : float deduction_tax: 공제 금액
+        : float refund_tax: 추가 납부 금액
+        : list deduction_tables: [공제 테이블, 공제 테이블 ... ,공제 테이블]
+        : DataFrame first_deduction_info_df: 최초 공제 정보
+        : list clawback_indices: 청년 근로 달(Month) 수 감소로 추가 납부하는 공제 테이블 index
+            (deduction_tables 에는 표시(-1)되지 않습니다.)
+    """
+    n_etc = n_workers - n_youngs
+    deduction_tables, first_deduction_info_df = get_deductions(n_youngs, n_etc, capital_area, years)
+
+    # 총합 공제 금액 계산
+    target_year = years[-1]
+    deduction_tax = calculate_deduction_sum(deduction_tables, target_year)
+
+    # 최초 공제 중 해당년도와 2년전 사이 최초 공제의 청년 근로 달(Month) 수 감소 여부를 check 합니다.
+    target_mask = first_deduction_info_df['year'] >= target_year - 2
+    clawback_indices = []
+    for deduction_index, row in first_deduction_info_df.loc[target_mask].iterrows():
+        extend_young_total = extend_young_totals[row['year_index']]
+        mask = extend_young_total - extend_young_total[0] >= 0
+        if not mask.all():
+            clawback_indices.append(deduction_index)
+
+    # 추가 납무 금액 계산
+    tax_tables = [deduction_df.copy() for deduction_df in deduction_tables]
+    for deduction_index in clawback_indices:
+        tax_tables[deduction_index][target_year] = -1
+    refund_tax = calculate_tax_sum(tax_tables, target_year)
+    return deduction_tax, refund_tax, deduction_tables, first_deduction_info_df, clawback_indices
+
+
+def deductio_and_tax_chunked(path, save_path=None, chunksize=10000, spill_path=None, on_error='raise', backend=None,
+                             export_format='xlsx', curr_date=None, target_year=None):
+    """
+    Description:
+        사업자가입자명부를 chunksize 행(row) 단위로 나눠 공제 금액과 추가 납부 금액을 계산합니다.
+        chunk 별 근로표는 연도별 합계만 누적한 뒤 버리므로 근로표 메모리는 명부 크기가 아닌 chunksize 에 비례합니다.
+        ⚠️ .xlsx, csv / tsv 명부는 chunk 단위로 읽지만 .xls 명부는 xlrd 가 workbook 전체를 로드합니다. (sheet_rows 참조)
+            .xls 명부의 메모리는 chunksize 로 제한되지 않습니다.
+
+    Args:
+        :param str path: 사업자 가입자 명부
+        :param str save_path: 결과 파일 저장 경로, None 이면 저장하지 않습니다.
+        :param int chunksize: 한번에 계산할 행(row) 수
+        :param str spill_path: 인원별 상시/청년 근로표를 저장할 csv 경로, None 이면 저장하지 않습니다.
+        :param str on_error: chunk 별 검증 오류 처리 방법, 'raise' 또는 'quarantine' (clean_workdate 참조)
+        :param str backend: 'numpy' 또는 'pandas'(기준 구현), None 이면 기본 backend (backends.get_backend 참조)
+        :param str export_format: 저장 형식 'xlsx', 'csv', 'parquet', 'ndjson' (exports 참조)
+        :param Timestamp curr_date: 계산 날짜 (상실/전역 날짜가 없는 인원의 종료 날짜), None 이면 오늘
+        :param int target_year: 공제 적용 연도 (calculation_period 참조), None 이면 END_DATE 연도
+
+    :return:
+        : float deduction_tax: 공제 금액
+        : float refund_tax: 추가 납부 금액
+        : DataFrame total_df: 연도별 상시/청년 근로 달 수 합계
+    """
+    from tax_refund.engine.backends import get_backend
+    backend = get_backend(backend)
+
+    start_date, end_date = calculation_period(target_year)
+    curr_date = pd.Timestamp.today() if curr_date is None else pd.Timestamp(curr_date)
+    years = get_years(start_date, end_date)
+
+    n_workers = np.zeros(len(years), dtype=np.int64)
+    n_youngs = np.zeros(len(years), dtype=np.int64)
+    extend_young_totals = {}
+    error_reports = []
+    for ind, employee_df in enumerate(read_workdate_chunks(path, chunksize)):
+        employee_df, error_report = clean_workdate(employee_df, on_error=on_error)
+        error_reports.append(error_report)
+        roster = Roster.from_workdate(employee_df, curr_date)
+        work_sums, young_sums = backend.year_sums(roster, start_date, end_date, curr_date)
+
+        # 연도별 합계 누적
+        n_workers += work_sums.sum(axis=0)
+        n_youngs += young_sums.sum(axis=0)
+        for year_index, total in backend.extend_totals(young_sums, work_sums - young_sums, years).items():
+            extend_young_totals[year_index] = extend_young_totals.get(year_index, 0) + total
+
+        # 인원별 근로표는 디스크에 저장합니다.
+        if spill_path:
+            chunk_table_df = pd.concat(
+                [roster.name_series(),
+                 pd.DataFrame(work_sums, index=roster.index, columns=['(상시)' + str(year) for year in years]),
+                 pd.DataFrame(young_sums, index=roster.index, columns=['(청년)' + str(year) for year in years])],
+                axis=1)
+            chunk_table_df.to_csv(spill_path, mode='w' if ind == 0 else 'a', header=(ind == 0),
+                                  encoding='utf-8-sig' if ind == 0 else 'utf-8')
+
+    deduction_tax, refund_tax, _, first_deduction_info_df, _ = \
+        backend.deduction(n_workers, n_youngs, extend_young_totals, years)
+
+    total_df = pd.DataFrame([['합계'] + list(n_workers) + list(n_youngs)], index=['합계'],
+                            columns=['이름'] + ['(상시)' + str(year) for year in years]
+                                    + ['(청년)' + str(year) for year in years])
+    if save_path:
+        save_sheets(save_path, export_format,
+                    공제및추가납부=pd.DataFrame({'공제금액': [deduction_tax], '추가납부금액': [refund_tax]}),
+                    근로합계=total_df,
+                    공제정보=first_deduction_info_df,
+                    검증오류=pd.concat(error_reports, ignore_index=True),
+                    )
+    logger.debug('%s년 공제 받은 금액 : %s, 추가 납부 금액 : %s', years[-1], deduction_tax, refund_tax)
+    return deduction_tax, refund_tax, total_df
+
+
+if __name__ == '__main__':
+    # python -m tax_refund.engine.parser [사업자가입자명부] [저장 경로] [저장 형식 xlsx, csv, parquet, ndjson]
+    # 계산 backend 는 TAX_REFUND_BACKEND 환경 변수로 선택합니다. (기본 numpy, 기준 구현 pandas)
+    import sys
+
+    # 사업자가입자명부를 로드합니다.
+    filepath = sys.argv[1] if len(sys.argv) > 1 else './data/사업장가입자명부.xls'
+
+    # 사업가자입명부 파싱 및 저장
+    save_path = sys.argv[2] if len(sys.argv) > 2 else 'tmp.xlsx'
+    export_format = sys.argv[3] if len(sys.argv) > 3 else 'xlsx'
+    deduction, tax, table_df = deductio_and_tax(filepath, save_path=save_path, export_format=export_format)
+    print('{}년 공제 받은 금액 : {} \n{}년 추가 납부 금액 : {}'.format(END_DATE[:4], deduction, END_DATE[:4], tax))
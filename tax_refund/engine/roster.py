@@ -0,0 +1,165 @@
+"""
+사업자가입명부 인원 정보를 고정 크기 dtype 의 column 별 ndarray 로 보관하는 Roster
+
+    resident_codes : 주민등록번호, 고정 길이 bytes (S14)
+    names          : 이름, 고정 길이 unicode
+    birth_dates    : 생년월일, datetime64[D]
+    acquisi_dates  : 자격취득일, datetime64[D]
+    disqual_dates  : 자격상실일, datetime64[D] (상실하지 않았으면 NaT)
+    flags          : 장애인(DISABLED), 임원(EXECUTIVE), 계약직(CONTRACT) bit flag, uint8
+    military_days  : 군 복무 기간(일), int32
+
+명부는 로드할 때 한번만 파싱하고 이후 단계(근로표, 집계, 엑셀 변환)는 Roster 의 array 를 그대로 사용합니다.
+"""
+import numpy as np
+import pandas as pd
+
+# flags bit
+DISABLED = 1  # 장애인
+EXECUTIVE = 2  # 임원
+CONTRACT = 4  # 1년 미만 계약직
+
+
+def parse_birth_dates(resident_codes):
+    """
+    Description:
+        주민등록번호를 생년월일로 변환합니다. (resident2date 와 같은 규칙)
+        뒷번호 첫자리가 3 미만이면 1900년대, 이상이면 2000년대 출생입니다.
+        변환할 수 없는 주민등록번호는 NaT 가 됩니다.
+
+    :param pd.Series resident_codes: [900117-1xxxxxx, 900117-1xxxxxx, ... 900117-1xxxxxx]
+    :ndarray return: datetime64[D]
+    """
+    birth_index = pd.to_numeric(resident_codes.str[7], errors='coerce')
+    century = np.where(birth_index < 3, '19', '20')
+    birth_dates = pd.to_datetime(century + resident_codes.str[:6], format='%Y%m%d', errors='coerce')
+    return birth_dates.values.astype('datetime64[D]')
+
+
+def add_years(dates, years):
+    """
+    Description:
+        datetime64[D] 날짜에 years 년을 더합니다. pd.DateOffset(years=years) 와 같이 없는 날짜(2월 29일)는 그 달의 마지막 날이 됩니다.
+
+    :param ndarray dates: datetime64[D]
+    :param int years:
+    :ndarray return: datetime64[D]
+    """
+    months = dates.astype('datetime64[M]')
+    days = dates - months
+    shifted = months + 12 * years
+    month_length = (shifted + 1).astype('datetime64[D]') - shifted.astype('datetime64[D]')
+    return shifted.astype('datetime64[D]') + np.minimum(days, month_length - 1)
+
+
+class Roster:
+    """
+    사업자가입명부 (struct-of-arrays)
+
+    Usage:
+        >>> roster = Roster.from_workdate(read_workdate(path))
+        >>> roster.disabled  # 장애인 여부 bool ndarray
+    """
+    __slots__ = ('index', 'resident_codes', 'names', 'birth_dates', 'acquisi_dates', 'disqual_dates', 'flags',
+                 'military_days')
+
+    def __init__(self, index, resident_codes, names, birth_dates, acquisi_dates, disqual_dates, flags, military_days):
+        self.index = index
+        self.resident_codes = resident_codes
+        self.names = names
+        self.birth_dates = birth_dates
+        self.acquisi_dates = acquisi_dates
+        self.disqual_dates = disqual_dates
+        self.flags = flags
+        self.military_days = military_days
+
+    @classmethod
+    def from_workdate(cls, df, curr_date=None):
+        """
+        Description:
+            read_workdate 또는 load_workdate 결과를 Roster 로 변환합니다.
+            read_workdate 결과(변환 전 column)를 그대로 받아 각 column 을 한번만 파싱합니다.
+            장애인, 임원, 계약직 column 이 bool 이 아니면 값이 있는 행(nan2boolean 과 같은 규칙)이 True 입니다.
+            주민등록번호의 ASCII 가 아닌 문자는 '?' 로 바꿉니다. (검증 전 명부, validation 참조)
+            입대 날짜만 있는 인원(복무 중)은 curr_date 까지 복무한 것으로 계산합니다.
+
+        :param DataFrame df: read_workdate 또는 load_workdate 결과
+        :param Timestamp curr_date: 복무 중인 인원의 전역 날짜, None 이면 오늘
+        :Roster return:
+        """
+        resident_codes = df.iloc[:, 0].astype(str).str.strip()
+        names = df.iloc[:, 1].astype(str).str.strip()
+
+        def flag(column):
+            column = df.iloc[:, column]
+            return column.values if column.dtype == bool else column.notna().values
+
+        flags = np.zeros(len(df), dtype=np.uint8)
+        flags[flag(4)] |= DISABLED
+        flags[flag(5)] |= EXECUTIVE
+        flags[flag(6)] |= CONTRACT
+
+        enlist_date = pd.to_datetime(df.iloc[:, 7])
+        discharge_date = pd.to_datetime(df.iloc[:, 8])
+        serving = enlist_date.notna() & discharge_date.isna()
+        discharge_date = discharge_date.mask(serving, pd.Timestamp.today() if curr_date is None else curr_date)
+        military_period = discharge_date - enlist_date
+        military_days = military_period.dt.days.fillna(0).clip(lower=0).values.astype(np.int32)
+
+        return cls(index=np.asarray(df.index, dtype=np.int64),
+                   resident_codes=np.array(resident_codes.str.encode('ascii', errors='replace').values, dtype='S'),
+                   names=np.array(names.values, dtype='U'),
+                   birth_dates=parse_birth_dates(resident_codes),
+                   acquisi_dates=pd.to_datetime(df.iloc[:, 2]).values.astype('datetime64[D]'),
+                   disqual_dates=pd.to_datetime(df.iloc[:, 3]).values.astype('datetime64[D]'),
+                   flags=flags,
+                   military_days=military_days)
+
+    @classmethod
+    def concat(cls, rosters):
+        """
+        Description:
+            여러 Roster 를 하나로 합칩니다. index 는 0 부터 다시 부여합니다.
+
+        :param list rosters: [Roster, Roster ... Roster]
+        :Roster return:
+        """
+        columns = {name: np.concatenate([getattr(roster, name) for roster in rosters])
+                   for name in cls.__slots__ if name != 'index'}
+        length = len(columns['flags'])
+        return cls(index=np.arange(length, dtype=np.int64), **columns)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, rows):
+        """
+        Description:
+            slice, bool mask, 정수 index 로 선택한 행(row)들의 Roster 를 반환합니다.
+        """
+        return type(self)(**{name: getattr(self, name)[rows] for name in self.__slots__})
+
+    @property
+    def disabled(self):
+        return (self.flags & DISABLED) != 0
+
+    @property
+    def executive(self):
+        return (self.flags & EXECUTIVE) != 0
+
+    @property
+    def contract(self):
+        return (self.flags & CONTRACT) != 0
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in self.__slots__)
+
+    def name_series(self):
+        """
+        Description:
+            엑셀 변환 등 table 출력에 사용할 이름 column 을 반환합니다.
+
+        :pd.Series return:
+        """
+        return pd.Series(self.names, index=self.index, name='이름')
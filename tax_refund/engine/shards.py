@@ -0,0 +1,145 @@
+"""
+명부 행(row) 분할 병렬 계산
+
+인원별 근로표, 연도별 근무 달 수는 인원마다 독립적으로 계산되므로 큰 명부를 연속된 행 구간(shard)으로 나눠
+여러 프로세스에서 동시에 계산합니다. 결과는 shard 순서대로 이어 붙이므로 나누지 않고 계산한 결과와 같습니다.
+(연도별 합계는 이어 붙인 결과로 공제 계산 단계 전에 계산합니다.)
+
+shard 프로세스 pool 은 프로세스마다 처음 사용할 때 한번만 만들고 이후 계산에 재사용합니다.
+pool 크기보다 많은 shard 는 차례로 실행됩니다. worker pool(info.workers) 안에서 호출해도 됩니다.
+(worker 프로세스마다 shard pool 을 만들므로 전체 프로세스 수는 worker 수 x shard 수입니다.)
+
+Usage:
+    >>> work_sums, young_sums = year_sums(backend, roster, START_DATE, END_DATE, curr_date, n_shards=4)
+
+shard 수를 지정하지 않으면 TAX_REFUND_SHARDS 환경 변수, 없으면 1(나누지 않음)을 사용합니다.
+"""
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# shard 하나의 최소 행(row) 수, 작은 명부는 프로세스 간 전송 비용이 계산 시간보다 크므로 나누지 않습니다.
+MIN_SHARD_ROWS = 20000
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def default_shards():
+    return int(os.environ.get('TAX_REFUND_SHARDS', 1))
+
+
+def shard_slices(n_rows, n_shards):
+    """
+    Description:
+        n_rows 행을 최대 n_shards 개의 연속된 구간으로 나눕니다. 구간마다 최소 MIN_SHARD_ROWS 행입니다.
+
+    Usage:
+        >>> shard_slices(100000, 4)
+        # [slice(0, 25000), slice(25000, 50000), slice(50000, 75000), slice(75000, 100000)]
+
+    :param int n_rows: 명부 행 수
+    :param int n_shards: 최대 shard 수
+    :list return: [slice, slice ... slice]
+    """
+    n_shards = max(min(n_shards, n_rows // MIN_SHARD_ROWS), 1)
+    bounds = np.linspace(0, n_rows, n_shards + 1).astype(int)
+    return [slice(start, end) for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def _warm_up():
+    # shard 프로세스 시작시 계산 module 을 미리 import 합니다.
+    from tax_refund.engine import backends, parser  # noqa: F401
+
+
+def get_pool(n_shards):
+    """
+    Description:
+        shard 프로세스 pool 을 반환합니다.
+        pool 은 처음 호출할 때 max(n_shards, default_shards()) 크기로 한번만 만들고 바꾸지 않습니다.
+        (다른 thread 가 사용 중인 pool 을 닫지 않습니다.)
+
+    :ProcessPoolExecutor return:
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=max(n_shards, default_shards()),
+                                        mp_context=multiprocessing.get_context('spawn'), initializer=_warm_up)
+    return _pool
+
+
+@atexit.register
+def shutdown():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+
+
+def _generate_workdate(roster, start_date, end_date, curr_date):
+    from tax_refund.engine import parser
+
+    return parser.generate_workdate(roster, start_date, end_date, curr_date, n_shards=1)
+
+
+def _year_sums(roster, backend_name, start_date, end_date, curr_date):
+    from tax_refund.engine.backends import get_backend
+
+    return get_backend(backend_name).year_sums(roster, start_date, end_date, curr_date)
+
+
+def map_shards(func, roster, n_shards, *args):
+    """
+    Description:
+        roster 를 shard_slices 로 나눠 shard 별로 func(roster_shard, *args) 를 실행하고 결과를 shard 순서대로 반환합니다.
+        shard 가 하나이면 현재 프로세스에서 실행합니다.
+
+    :param func: module 최상위 함수 (프로세스 간 전달됩니다.)
+    :param Roster roster:
+    :param int n_shards: 최대 shard 수
+    :list return: [shard 결과, shard 결과 ... ]
+    """
+    slices = shard_slices(len(roster), n_shards)
+    if len(slices) == 1:
+        return [func(roster, *args)]
+    pool = get_pool(len(slices))
+    futures = [pool.submit(func, roster[rows], *args) for rows in slices]
+    return [future.result() for future in futures]
+
+
+def generate_workdate(roster, start_date, end_date, curr_date, n_shards=None):
+    """
+    Description:
+        parser.generate_workdate 를 shard 별로 계산해 이어 붙입니다. 결과는 parser.generate_workdate 와 같습니다.
+
+    :param Roster roster:
+    :param int n_shards: 최대 shard 수, None 이면 default_shards()
+    :return: parser.generate_workdate 참조
+    """
+    results = map_shards(_generate_workdate, roster, n_shards or default_shards(), start_date, end_date, curr_date)
+    return tuple(pd.concat(frames, axis=0) for frames in zip(*results))
+
+
+def year_sums(backend, roster, start_date, end_date, curr_date, n_shards=None):
+    """
+    Description:
+        backend.year_sums 를 shard 별로 계산해 행(row) 순서대로 이어 붙입니다. 결과는 backend.year_sums 와 같습니다.
+
+    :param backend: 계산 backend (backends.get_backend 참조)
+    :param Roster roster:
+    :param int n_shards: 최대 shard 수, None 이면 default_shards()
+    :return:
+        : ndarray work_sums: shape (인원 수, 연도 수)
+        : ndarray young_sums: shape (인원 수, 연도 수)
+    """
+    results = map_shards(_year_sums, roster, n_shards or default_shards(), backend.name, start_date, end_date,
+                         curr_date)
+    work_sums, young_sums = zip(*results)
+    return np.concatenate(work_sums, axis=0), np.concatenate(young_sums, axis=0)
@@ -0,0 +1,74 @@
+"""
+테스트, 부하 측정용 가상 사업자가입명부
+
+read_workdate 결과와 같은 column, 값 형식(문자열 날짜, 'O' 표시)의 DataFrame 을 seed 로 재현 가능하게 생성합니다.
+    주민등록번호 : yymmdd-g****** (g: 1900년대 1/2, 2000년대 3/4)
+    자격취득일   : 2010.01.01 ~ 2022.12.31
+    자격상실일   : 약 40% 인원, 자격취득일 이후 ~ 2024.12.31
+    장애인, 임원, 계약직 : 약 5% 인원 'O'
+    입대, 전역   : 약 10% 인원, 만 20세 전후 입대 후 약 21개월 복무
+"""
+import numpy as np
+import pandas as pd
+
+from tax_refund.engine.parser import WORKDATE_COLUMNS
+
+
+def _days(date):
+    # 1970-01-01 부터 지난 일 수
+    return np.datetime64(date, 'D').astype(np.int64)
+
+
+def _format_dates(days):
+    # yyyy.mm.dd 문자열, 날짜가 없으면 NaN
+    dates = pd.to_datetime(days, unit='D')
+    values = np.full(len(days), np.nan, dtype=object)
+    values[dates.notna()] = dates[dates.notna()].strftime('%Y.%m.%d')
+    return values
+
+
+def synthetic_workdate(n, seed=0):
+    """
+    Description:
+        n 명의 가상 사업자가입명부를 생성합니다.
+
+    :param int n: 인원 수
+    :param int seed: 난수 seed, 같은 seed 이면 항상 같은 명부가 생성됩니다.
+    :DataFrame return: read_workdate 결과와 같은 형식, index 는 1 부터 시작합니다.
+    """
+    rng = np.random.default_rng(seed)
+
+    # 생년월일, 주민등록번호
+    birth_days = rng.integers(_days('1950-01-01'), _days('2004-12-31'), n)
+    birth_dates = pd.to_datetime(birth_days, unit='D')
+    gender = rng.integers(1, 3, n) + np.where(birth_dates.year >= 2000, 2, 0)
+    resident_codes = birth_dates.strftime('%y%m%d') + '-' + pd.Index(gender.astype(str)) + '******'
+
+    # 자격취득일, 자격상실일
+    acquisi_days = rng.integers(_days('2010-01-01'), _days('2022-12-31'), n)
+    last_day = _days('2024-12-31')
+    disqual_days = acquisi_days + 1 + (rng.random(n) * (last_day - acquisi_days)).astype(np.int64)
+    disqual_days = np.where(rng.random(n) < 0.4, disqual_days, np.nan)
+
+    def flag(p):
+        values = np.full(n, np.nan, dtype=object)
+        values[rng.random(n) < p] = 'O'
+        return values
+
+    # 입대, 전역
+    served = rng.random(n) < 0.1
+    enlist_dates = birth_dates + pd.to_timedelta(20 * 365 + rng.integers(-365, 365, n), unit='D')
+    discharge_dates = enlist_dates + pd.to_timedelta(21 * 30 + rng.integers(-30, 30, n), unit='D')
+
+    df = pd.DataFrame({'주민등록번호': np.asarray(resident_codes),
+                       '이름': ['가상{}'.format(i) for i in range(1, n + 1)],
+                       '자격취득일': _format_dates(acquisi_days),
+                       '자격상실일': _format_dates(disqual_days),
+                       '장애인': flag(0.05),
+                       '임원': flag(0.05),
+                       '계약직': flag(0.05),
+                       '입대': pd.Series(enlist_dates).where(served, np.nan).astype(object).values,
+                       '전역': pd.Series(discharge_dates).where(served, np.nan).astype(object).values},
+                      index=range(1, n + 1))
+    df.columns = WORKDATE_COLUMNS
+    return df
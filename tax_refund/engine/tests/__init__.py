@@ -0,0 +1,19 @@
+"""
+계산 엔진 회귀 테스트
+
+계산 엔진 module 별로 test module 을 나눕니다. (tax_refund/engine/<module>.py -> tests/test_<module>.py)
+공용 상수와 함수는 support 에 있습니다.
+    test_golden : data/ 명부와 가상 명부(synthetic)로 deductio_and_tax 를 실행해 공제 금액, 추가 납부 금액과
+                  엑셀 sheet 를 goldens/ 에 저장된 결과와 비교합니다.
+                  인원별 sheet 는 앞 GOLDEN_ROWS 행과 column 별 합계(연도별 합계)만 저장합니다.
+                  계산 날짜는 CURR_DATE 로 고정합니다.
+                  goldens/baseline/ 은 리팩토링 이전 parser.py 로 계산한 결과로, UPDATE_GOLDENS 로 다시 생성하지 않습니다.
+                  (baseline parser.py 는 대상자가 없는 빈 목록을 pd.concat 하지 못해, 가상 명부는 빈 테이블로 대신해 계산했습니다.)
+    test_parser : 벡터화된 계산과 기존 pandas 계산(연도/인원별 반복)의 결과가 같은지 여러 seed 의 가상 명부로 확인합니다.
+    test_backends : 모든 backend(pandas 기준 구현, numpy)의 단계별 결과가 같은지 확인합니다.
+
+계산 결과를 의도적으로 바꾼 경우 golden 을 다시 생성합니다.
+    UPDATE_GOLDENS=1 python manage.py test tax_refund.engine.tests.test_golden
+
+⚠️ 사업장가입자명부_20221222 (상실자포함).xls 는 장애인/임원/계약직/입대/전역 column 이 없는 원본 양식이라 제외합니다.
+"""
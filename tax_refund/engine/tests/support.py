@@ -0,0 +1,74 @@
+"""
+계산 엔진 테스트 공용 상수와 함수
+"""
+import contextlib
+import json
+import os
+from unittest import mock
+
+import pandas as pd
+
+from tax_refund.engine import parser
+from tax_refund.engine.roster import Roster
+from tax_refund.engine.synthetic import synthetic_workdate
+
+ENGINE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASE_DIR = os.path.dirname(os.path.dirname(ENGINE_DIR))
+GOLDEN_DIR = os.path.join(ENGINE_DIR, 'goldens')
+
+GOLDEN_ROSTERS = ['사업장가입자명부.xls']
+# {golden 이름: (인원 수, seed)}
+SYNTHETIC_ROSTERS = {'synthetic_50_0': (50, 0), 'synthetic_300_1': (300, 1), 'synthetic_500_2': (500, 2)}
+PROPERTY_SEEDS = range(5)
+# golden 에 전체 행을 저장할 sheet 최대 행 수
+GOLDEN_ROWS = 10
+CURR_DATE = pd.Timestamp('2023-06-15')
+
+
+def snapshot_frame(df):
+    """
+    Description:
+        DataFrame 을 json 으로 저장할 수 있는 dict 로 변환합니다. (날짜는 iso 문자열, 실수는 소수점 6자리)
+    """
+    return json.loads(df.to_json(orient='split', date_format='iso', double_precision=6))
+
+
+def golden_sheet(sheet):
+    """
+    Description:
+        golden 에 저장할 sheet 를 반환합니다.
+        GOLDEN_ROWS 행보다 긴 sheet 는 앞 GOLDEN_ROWS 행, 전체 행 수, 숫자 column 별 합계만 남깁니다.
+    """
+    if len(sheet['index']) <= GOLDEN_ROWS:
+        return sheet
+    df = pd.DataFrame(sheet['data'], columns=sheet['columns'])
+    total = df.select_dtypes('number').sum(axis=0)
+    return {'columns': sheet['columns'], 'index': sheet['index'][:GOLDEN_ROWS], 'data': sheet['data'][:GOLDEN_ROWS],
+            'n_rows': len(sheet['index']), 'total': [round(float(value), 6) for value in total.values]}
+
+
+def run_deductio_and_tax(path, workdate_df=None, backend='pandas', cache_dir=None):
+    """
+    Description:
+        deductio_and_tax 를 실행하고 엑셀로 저장될 sheet 들을 반환합니다.
+        workdate_df 가 주어지면 path 대신 workdate_df 를 명부로 사용합니다.
+
+    :dict return: {'deduction': float, 'refund': float, 'sheets': {sheet 이름: dict}}
+    """
+    patches = [mock.patch.object(parser, 'df2excel')]
+    if workdate_df is not None:
+        patches.append(mock.patch.object(parser, 'read_workdate', return_value=workdate_df.copy()))
+
+    with contextlib.ExitStack() as stack:
+        df2excel = [stack.enter_context(patch) for patch in patches][0]
+        deduction, refund, table_df = parser.deductio_and_tax(path, save_path='golden.xlsx', backend=backend,
+                                                              cache_dir=cache_dir, curr_date=CURR_DATE)
+
+    sheets = {name: snapshot_frame(df) for name, df in df2excel.call_args.kwargs.items()}
+    sheets['table_df'] = snapshot_frame(table_df)
+    return {'deduction': float(deduction), 'refund': float(refund), 'sheets': sheets}
+
+
+def synthetic_roster(n, seed):
+    workdate_df = parser.format_workdate(synthetic_workdate(n, seed))
+    return workdate_df, Roster.from_workdate(workdate_df)
@@ -0,0 +1,31 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from tax_refund.engine import parser
+from tax_refund.engine.backends import BACKENDS
+from tax_refund.engine.synthetic import synthetic_workdate
+from tax_refund.engine.tests.support import run_deductio_and_tax
+
+
+class CacheTest(unittest.TestCase):
+    def test_cached_export_skips_calendar(self):
+        workdate_df = synthetic_workdate(300, 0)
+        expected = run_deductio_and_tax('synthetic', workdate_df)
+        with tempfile.TemporaryDirectory() as root:
+            cache_dir = os.path.join(root, 'cache')
+            self.assertEqual(run_deductio_and_tax('synthetic', workdate_df, cache_dir=cache_dir), expected)
+
+            # cache 가 있으면 명부 로드, 근로표 계산을 하지 않습니다.
+            with mock.patch.object(parser, 'load_roster', side_effect=AssertionError), \
+                    mock.patch.object(parser, 'generate_workdate', side_effect=AssertionError):
+                for backend in BACKENDS:
+                    with self.subTest(backend=backend):
+                        self.assertEqual(run_deductio_and_tax('synthetic', backend=backend, cache_dir=cache_dir),
+                                         expected)
+
+            # 불완전한 cache 는 다시 계산합니다.
+            os.remove(os.path.join(cache_dir, 'work_sums.npy'))
+            self.assertEqual(run_deductio_and_tax('synthetic', workdate_df, cache_dir=cache_dir), expected)
+            self.assertTrue(os.path.exists(os.path.join(cache_dir, 'work_sums.npy')))
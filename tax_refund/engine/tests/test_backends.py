@@ -0,0 +1,64 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from tax_refund.engine import END_DATE, START_DATE, parser
+from tax_refund.engine.backends import BACKENDS
+from tax_refund.engine.tests.support import CURR_DATE, PROPERTY_SEEDS, synthetic_roster
+
+
+class BackendTest(unittest.TestCase):
+    reference = BACKENDS['pandas']
+
+    def test_calendars_and_year_sums(self):
+        curr_date = CURR_DATE
+        for seed in PROPERTY_SEEDS:
+            _, roster = synthetic_roster(300, seed)
+            for start_date, end_date in [(START_DATE, END_DATE), ('2020-03-01', '2021-10-31')]:
+                expected_calendars = self.reference.calendars(roster, start_date, end_date, curr_date)
+                expected_sums = self.reference.year_sums(roster, start_date, end_date, curr_date)
+                for name, backend in BACKENDS.items():
+                    with self.subTest(backend=name, seed=seed, start_date=start_date):
+                        for expected, actual in zip(expected_calendars,
+                                                    backend.calendars(roster, start_date, end_date, curr_date)):
+                            np.testing.assert_array_equal(np.asarray(actual), np.asarray(expected))
+                        for expected, actual in zip(expected_sums,
+                                                    backend.year_sums(roster, start_date, end_date, curr_date)):
+                            np.testing.assert_array_equal(actual, expected)
+
+    def test_extend_totals(self):
+        years = parser.get_years(START_DATE, END_DATE)
+        for seed in PROPERTY_SEEDS:
+            rng = np.random.default_rng(seed)
+            young_sums = rng.integers(0, 13, (100, len(years)))
+            etc_sums = rng.integers(0, 13, (100, len(years)))
+            for target_index in range(len(years)):
+                expected = self.reference.extend_totals(young_sums, etc_sums, years, target_index)
+                for name, backend in BACKENDS.items():
+                    actual = backend.extend_totals(young_sums, etc_sums, years, target_index)
+                    with self.subTest(backend=name, seed=seed, target_index=target_index):
+                        self.assertEqual(sorted(actual), sorted(expected))
+                        for year_index in expected:
+                            np.testing.assert_array_equal(actual[year_index], expected[year_index])
+
+    def test_deduction(self):
+        years = parser.get_years(START_DATE, END_DATE)
+        for seed in range(50):
+            # 근로 달 수가 늘고 줄어드는 여러 경우
+            rng = np.random.default_rng(seed)
+            n_youngs = rng.integers(0, 200, len(years))
+            n_workers = n_youngs + rng.integers(0, 400, len(years))
+            extend_totals = {index: rng.integers(0, 200, len(years) - index) for index in range(len(years))}
+            for capital_area in (True, False):
+                expected = self.reference.deduction(n_workers, n_youngs, extend_totals, years, capital_area)
+                for name, backend in BACKENDS.items():
+                    actual = backend.deduction(n_workers, n_youngs, extend_totals, years, capital_area)
+                    with self.subTest(backend=name, seed=seed, capital_area=capital_area):
+                        self.assertEqual(actual[0], expected[0])
+                        self.assertEqual(actual[1], expected[1])
+                        self.assertEqual(len(actual[2]), len(expected[2]))
+                        for actual_table, expected_table in zip(actual[2], expected[2]):
+                            pd.testing.assert_frame_equal(actual_table, expected_table, check_dtype=False)
+                        np.testing.assert_array_equal(actual[3].values, expected[3].values)
+                        self.assertEqual(list(actual[4]), list(expected[4]))
@@ -0,0 +1,59 @@
+import os
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from tax_refund.engine import parser
+from tax_refund.engine.backends import BACKENDS
+from tax_refund.engine.consolidation import consolidate
+from tax_refund.engine.synthetic import synthetic_workdate
+from tax_refund.engine.tests.support import BASE_DIR, CURR_DATE, GOLDEN_ROSTERS, run_deductio_and_tax
+
+
+class ConsolidationTest(unittest.TestCase):
+    def test_consolidate_single_roster(self):
+        path = os.path.join(BASE_DIR, 'data', GOLDEN_ROSTERS[0])
+        expected = run_deductio_and_tax(path)
+        _, deduction_df = consolidate({'A': path}, curr_date=CURR_DATE)
+        self.assertEqual(deduction_df.loc['A', '공제금액'], expected['deduction'])
+        self.assertEqual(deduction_df.loc['연결', '추가납부금액'], expected['refund'])
+
+        # 공제 적용 연도를 지정하면 해당 연도로 끝나는 계산 기간으로 계산합니다.
+        expected = parser.deductio_and_tax(path, save_path=None, curr_date=CURR_DATE, target_year=2021)
+        headcount_df, deduction_df = consolidate({'A': path}, curr_date=CURR_DATE, target_year=2021)
+        self.assertEqual(headcount_df.columns[-1], '(청년)2021')
+        self.assertEqual(deduction_df.loc['연결'].tolist(), list(expected[:2]))
+
+    def test_consolidate_shared_employees(self):
+        # B 사업장은 A 사업장 인원 10명이 겸직합니다. 연결은 주민등록번호가 같은 인원을 한명으로 셉니다.
+        a_df = synthetic_workdate(60, 0)
+        b_own_df = synthetic_workdate(40, 1)
+        b_df = pd.concat([a_df.iloc[:10], b_own_df], ignore_index=True)
+        b_df.index += 1
+        union_df = pd.concat([a_df, b_own_df], ignore_index=True)
+        union_df.index += 1
+        rosters = {'A': a_df, 'B': b_df}
+
+        for backend in BACKENDS:
+            with mock.patch.object(parser, 'read_workdate', side_effect=lambda path: rosters[path].copy()):
+                headcount_df, deduction_df = consolidate({'A': 'A', 'B': 'B'}, backend=backend, curr_date=CURR_DATE)
+            self.assertEqual(list(deduction_df.index), ['A', 'B', '연결'])
+
+            # 사업장별 결과는 사업장 명부를 따로 계산한 결과와 같습니다.
+            for entity, workdate_df in [('A', a_df), ('B', b_df), ('연결', union_df)]:
+                expected = run_deductio_and_tax(entity, workdate_df)
+                total = expected['sheets']['table_df']['data'][-1][1:]
+                with self.subTest(backend=backend, entity=entity):
+                    self.assertEqual(headcount_df.loc[entity].tolist(), total)
+                    self.assertEqual(deduction_df.loc[entity].tolist(), [expected['deduction'], expected['refund']])
+
+        # 겸직 인원의 근무 달 수는 사업장별 합계에는 두번, 연결에는 한번 포함됩니다.
+        shared = run_deductio_and_tax('shared', a_df.iloc[:10])['sheets']['table_df']['data'][-1][1:]
+        np.testing.assert_array_equal(headcount_df.loc[['A', 'B']].sum(axis=0).values - headcount_df.loc['연결'].values,
+                                      shared)
+
+    def test_consolidate_reserved_name(self):
+        with self.assertRaises(ValueError):
+            consolidate({'연결': os.path.join(BASE_DIR, 'data', GOLDEN_ROSTERS[0])})
@@ -0,0 +1,53 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from tax_refund.engine import exports, parser
+from tax_refund.engine.tests.support import BASE_DIR, GOLDEN_ROSTERS
+
+
+class ExportTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # 엑셀로 저장될 sheet 들
+        with mock.patch.object(parser, 'df2excel') as df2excel:
+            parser.deductio_and_tax(os.path.join(BASE_DIR, 'data', GOLDEN_ROSTERS[0]), save_path='golden.xlsx')
+        cls.sheets = df2excel.call_args.kwargs
+
+    def export(self, export_format):
+        with tempfile.TemporaryDirectory() as root:
+            save_path = os.path.join(root, 'result' + exports.FORMATS[export_format][0])
+            parser.deductio_and_tax(os.path.join(BASE_DIR, 'data', GOLDEN_ROSTERS[0]), save_path=save_path,
+                                    export_format=export_format)
+            with open(save_path, 'rb') as f:
+                return f.read()
+
+    def test_csv(self):
+        with zipfile.ZipFile(io.BytesIO(self.export('csv'))) as zf:
+            self.assertEqual(zf.namelist(), [name + '.csv' for name in self.sheets])
+            for name in ['상시근로표', '청년근로표', '기타근로표', '연도별공제및추가납부']:
+                df = pd.read_csv(zf.open(name + '.csv'), index_col=0, encoding='utf-8-sig')
+                np.testing.assert_array_equal(df.values, self.sheets[name].values)
+
+    def test_ndjson(self):
+        lines = [json.loads(line) for line in self.export('ndjson').decode('utf-8').splitlines()]
+        self.assertEqual(len(lines), sum(len(df) for df in self.sheets.values()))
+        rows = [line for line in lines if line['sheet'] == '상시근로표']
+        expected = self.sheets['상시근로표']
+        self.assertEqual([row['index'] for row in rows], list(expected.index))
+        self.assertEqual(rows[0]['(상시)2022'], expected['(상시)2022'].iloc[0])
+
+    def test_parquet(self):
+        if 'parquet' not in exports.available_formats():
+            self.skipTest('pyarrow 가 설치되지 않았습니다.')
+        with zipfile.ZipFile(io.BytesIO(self.export('parquet'))) as zf:
+            self.assertEqual(zf.namelist(), [name + '.parquet' for name in self.sheets])
+            df = pd.read_parquet(io.BytesIO(zf.read('상시근로표.parquet')))
+            np.testing.assert_array_equal(df.values, self.sheets['상시근로표'].values)
@@ -0,0 +1,120 @@
+import contextlib
+import io
+import json
+import os
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from tax_refund.engine import END_DATE, START_DATE, parser
+from tax_refund.engine.backends import BACKENDS
+from tax_refund.engine.roster import Roster
+from tax_refund.engine.synthetic import synthetic_workdate
+from tax_refund.engine.tests.support import (BASE_DIR, CURR_DATE, GOLDEN_DIR, GOLDEN_ROSTERS, SYNTHETIC_ROSTERS,
+                                             golden_sheet, run_deductio_and_tax)
+
+
+# 기존 calculate_tax_sum 은 공제 테이블의 추가 납부 표시(-1)를 0으로 덮어써, 이후 filter_valid_deductions 가
+# 공제가 취소된 테이블도 남겼습니다. (현재는 복사본을 수정합니다.) 이 sheet 들은 goldens/ 에서만 비교합니다.
+BASELINE_CHANGED_SHEETS = ('공제금액표', '공제정보')
+
+
+class GoldenTest(unittest.TestCase):
+    maxDiff = None
+
+    def assertGolden(self, name, snapshot):
+        golden_path = os.path.join(GOLDEN_DIR, name + '.json')
+        sheets = {sheet_name: golden_sheet(sheet) for sheet_name, sheet in snapshot['sheets'].items()}
+        snapshot = dict(snapshot, sheets=sheets)
+        if os.environ.get('UPDATE_GOLDENS'):
+            os.makedirs(GOLDEN_DIR, exist_ok=True)
+            with open(golden_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, ensure_ascii=False, indent=1, sort_keys=True)
+
+        with open(golden_path, encoding='utf-8') as f:
+            golden = json.load(f)
+        self.assertEqual(snapshot['deduction'], golden['deduction'])
+        self.assertEqual(snapshot['refund'], golden['refund'])
+        self.assertEqual(sorted(snapshot['sheets']), sorted(golden['sheets']))
+        for sheet_name, sheet in golden['sheets'].items():
+            with self.subTest(sheet=sheet_name):
+                self.assertEqual(snapshot['sheets'][sheet_name], sheet)
+
+    def test_data_rosters(self):
+        for filename in GOLDEN_ROSTERS:
+            for backend in BACKENDS:
+                with self.subTest(roster=filename, backend=backend):
+                    snapshot = run_deductio_and_tax(os.path.join(BASE_DIR, 'data', filename), backend=backend)
+                    self.assertGolden(os.path.splitext(filename)[0], snapshot)
+
+    def test_synthetic_rosters(self):
+        for name, (n, seed) in SYNTHETIC_ROSTERS.items():
+            for backend in BACKENDS:
+                with self.subTest(roster=name, backend=backend):
+                    self.assertGolden(name, run_deductio_and_tax(name, synthetic_workdate(n, seed), backend=backend))
+
+    def test_elder_calendar(self):
+        # 기존 generate_elder_calendar 는 겹치는 기간의 종료 날짜를 시작 날짜로도 사용해(종료 날짜 하루만 노인 근로)
+        # 노인 근로가 거의 집계되지 않았습니다. 60세 이후 근무 기간 전체를 노인 근로로 집계합니다.
+        workdate_df = synthetic_workdate(1, 0)
+        workdate_df.loc[:, ['주민등록번호', '자격취득일', '자격상실일']] = ['600101-1******', '2018-03-15', '2022-06-10']
+        workdate_df.loc[:, ['장애인', '임원', '계약직']] = np.nan
+        workdate_df = parser.format_workdate(workdate_df)  # 2020-01-01 에 60세
+        _, young_sums = BACKENDS['numpy'].year_sums(Roster.from_workdate(workdate_df), START_DATE, END_DATE,
+                                                   CURR_DATE)
+        # 2020년 1월부터 2022년 5월(6월 말 이전 상실)까지
+        np.testing.assert_array_equal(young_sums[0], [0, 0, 12, 12, 5])
+        with mock.patch.object(parser, 'category_periods', end_only_elder_periods):
+            _, young_sums = BACKENDS['numpy'].year_sums(Roster.from_workdate(workdate_df), START_DATE, END_DATE,
+                                                       CURR_DATE)
+        np.testing.assert_array_equal(young_sums[0], [0, 0, 0, 0, 0])
+
+        path = os.path.join(BASE_DIR, 'data', GOLDEN_ROSTERS[0])
+        with mock.patch.object(parser, 'category_periods', end_only_elder_periods):
+            before = run_deductio_and_tax(path, backend='pandas')
+        after = run_deductio_and_tax(path, backend='pandas')
+        self.assertEqual((before['deduction'], before['refund']), (23800.0, 8400.0))
+        self.assertEqual((after['deduction'], after['refund']), (16000.0, 8400.0))
+
+    def test_baseline_roster(self):
+        # goldens/baseline/ 은 리팩토링 이전 parser.py (baseline commit) 로 CURR_DATE 에 계산한 결과입니다.
+        # 의도적으로 바꾼 노인 근로 집계(test_elder_calendar)를 기존 규칙으로 되돌리면 결과가 같아야 합니다.
+        rosters = [(os.path.splitext(filename)[0], os.path.join(BASE_DIR, 'data', filename), None)
+                   for filename in GOLDEN_ROSTERS]
+        rosters += [(name, name, synthetic_workdate(n, seed)) for name, (n, seed) in SYNTHETIC_ROSTERS.items()]
+        for name, path, workdate_df in rosters:
+            with open(os.path.join(GOLDEN_DIR, 'baseline', name + '.json'), encoding='utf-8') as f:
+                baseline = json.load(f)
+
+            for backend in BACKENDS:
+                with mock.patch.object(parser, 'category_periods', end_only_elder_periods):
+                    snapshot = run_deductio_and_tax(path, workdate_df, backend=backend)
+                with self.subTest(roster=name, backend=backend):
+                    self.assertEqual((snapshot['deduction'], snapshot['refund']),
+                                     (baseline['deduction'], baseline['refund']))
+                for sheet_name, sheet in baseline['sheets'].items():
+                    if sheet_name in BASELINE_CHANGED_SHEETS:
+                        continue
+                    with self.subTest(roster=name, backend=backend, sheet=sheet_name):
+                        self.assertEqual(golden_sheet(snapshot['sheets'][sheet_name]), sheet)
+
+    def test_result_logged(self):
+        # 계산 결과는 worker 프로세스의 표준 출력 대신 debug logging 으로 남깁니다.
+        stdout = io.StringIO()
+        with self.assertLogs(parser.logger, 'DEBUG') as logs, contextlib.redirect_stdout(stdout):
+            snapshot = run_deductio_and_tax(os.path.join(BASE_DIR, 'data', GOLDEN_ROSTERS[0]))
+        self.assertEqual(stdout.getvalue(), '')
+        self.assertEqual(logs.output, ['DEBUG:tax_refund.engine.parser:2022년 공제 받은 금액 : {}, 추가 납부 금액 : {}'
+                                       .format(snapshot['deduction'], snapshot['refund'])])
+
+
+def end_only_elder_periods(roster, curr_date, category_periods=parser.category_periods):
+    """
+    Description:
+        노인 근로를 종료 날짜 하루로만 집계하던 기존 generate_elder_calendar 규칙의 category_periods
+    """
+    periods = category_periods(roster, curr_date)
+    elder_start, elder_end = periods['elder']
+    periods['elder'] = (np.where(elder_start <= elder_end, elder_end, elder_start), elder_end)
+    return periods
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from tax_refund.engine import END_DATE, START_DATE, parser
+from tax_refund.engine.backends import BACKENDS
+from tax_refund.engine.intervals import YOUNG_CATEGORIES, IntervalIndex, RosterIntervalIndex
+from tax_refund.engine.tests.support import CURR_DATE, PROPERTY_SEEDS, synthetic_roster
+
+
+class IntervalIndexTest(unittest.TestCase):
+    def test_at_matches_calendars(self):
+        # 월말 조회 결과 = 근로표의 해당 달 근무 인원
+        curr_date = CURR_DATE
+        for seed in PROPERTY_SEEDS:
+            _, roster = synthetic_roster(300, seed)
+            index = RosterIntervalIndex.from_roster(roster)
+            work_mask, young_mask = BACKENDS['numpy'].calendars(roster, START_DATE, END_DATE, curr_date)
+            for month, date in enumerate(parser.calendar_grid(START_DATE, END_DATE).dates):
+                with self.subTest(seed=seed, date=date):
+                    workers = index.at(date, ['상시'])
+                    youngs = index.at(date, YOUNG_CATEGORIES)
+                    np.testing.assert_array_equal(workers['index'].values, roster.index[work_mask[:, month]])
+                    np.testing.assert_array_equal(np.unique(youngs['index'].values),
+                                                  roster.index[young_mask[:, month]])
+
+    def test_between_matches_brute_force(self):
+        rng = np.random.default_rng(0)
+        start = np.datetime64('2018-01-01') + rng.integers(0, 2000, 1000).astype('timedelta64[D]')
+        end = start + rng.integers(-10, 800, 1000).astype('timedelta64[D]')
+        start[::17] = np.datetime64('NaT')
+        index = IntervalIndex(start, end)
+        # start > end 인 기간은 제외됩니다.
+        end = np.where(start <= end, end, np.datetime64('NaT'))
+        for lower, upper in [('2018-01-01', '2018-01-01'), ('2019-05-03', '2020-02-29'), ('2023-06-01', '2025-01-01')]:
+            lower, upper = np.datetime64(lower), np.datetime64(upper)
+            with self.subTest(lower=lower, upper=upper):
+                np.testing.assert_array_equal(index.at(lower), np.flatnonzero((start <= lower) & (end >= lower)))
+                np.testing.assert_array_equal(index.between(lower, upper),
+                                              np.flatnonzero((start <= upper) & (end >= lower)))
+
+    def test_save_and_load(self):
+        _, roster = synthetic_roster(50, 0)
+        index = RosterIntervalIndex.from_roster(roster)
+        with tempfile.TemporaryDirectory() as root:
+            index.save(os.path.join(root, 'index'))
+            loaded = RosterIntervalIndex.load(os.path.join(root, 'index'))
+        pd.testing.assert_frame_equal(loaded.between('2018-01-01', '2022-12-31'),
+                                      index.between('2018-01-01', '2022-12-31'))
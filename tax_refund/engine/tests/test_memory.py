@@ -0,0 +1,75 @@
+import contextlib
+import io
+import os
+import threading
+import unittest
+from unittest import mock
+
+from tax_refund.engine import memory, metrics, parser
+from tax_refund.engine.tests.support import BASE_DIR, GOLDEN_ROSTERS
+
+
+class MemoryTest(unittest.TestCase):
+    def run_traced(self, env):
+        stdout = io.StringIO()
+        with mock.patch.dict(os.environ, env), metrics.capture() as events, contextlib.redirect_stdout(stdout), \
+                mock.patch.object(parser, 'df2excel'):
+            parser.deductio_and_tax(os.path.join(BASE_DIR, 'data', GOLDEN_ROSTERS[0]), save_path='golden.xlsx')
+        return [line for line in stdout.getvalue().splitlines() if line.startswith('[memory]')], events
+
+    def test_disabled(self):
+        lines, events = self.run_traced({'TAX_REFUND_MEMORY_TRACE': '0'})
+        self.assertEqual(lines, [])
+        self.assertEqual({name for name, _, _, _ in events},
+                         {'tax_refund_stage_seconds', 'tax_refund_roster_rows'})
+
+    def test_trace(self):
+        was_tracing = memory.tracemalloc.is_tracing()
+        lines, events = self.run_traced({'TAX_REFUND_MEMORY_TRACE': '1', 'TAX_REFUND_MEMORY_BUDGET_MB': '0.001'})
+        self.assertEqual(memory.tracemalloc.is_tracing(), was_tracing)
+
+        # 단계별 peak / net, 계산 전체 peak / retained, 예산 초과
+        stages = ['load', 'workdate', 'tables', 'deduction', 'sheets', 'export']
+        self.assertEqual([line.split()[1] for line in lines[:len(stages)]], stages)
+        self.assertTrue(lines[len(stages)].startswith('[memory] deductio_and_tax peak '))
+        self.assertIn('메모리 예산 초과', lines[-1])
+        peaks = [key for name, _, key, _ in events if name == 'tax_refund_stage_peak_bytes']
+        self.assertEqual(peaks, [(stage,) for stage in stages])
+        self.assertIn(('tax_refund_memory_budget_exceeded_total', 'inc', (), 1), events)
+
+    def test_concurrent_runs(self):
+        # tracemalloc 은 프로세스 전체에 하나이므로 먼저 끝난 측정이 다른 thread 의 측정을 멈추지 않아야 합니다.
+        was_tracing = memory.tracemalloc.is_tracing()
+        started = threading.Barrier(2, timeout=10)
+        first_done = threading.Event()
+        traces, errors = {}, []
+
+        def run(name):
+            try:
+                with memory.trace_run(name) as trace:
+                    with memory.stage('load'):
+                        started.wait()
+                        data = [bytearray(1024) for _ in range(100)]  # noqa: F841
+                        if name == 'second':
+                            self.assertTrue(first_done.wait(timeout=10))
+                traces[name] = trace
+            except Exception as e:
+                errors.append(e)
+            finally:
+                if name == 'first':
+                    first_done.set()
+
+        with mock.patch.dict(os.environ, {'TAX_REFUND_MEMORY_TRACE': '1'}), \
+                contextlib.redirect_stdout(io.StringIO()), metrics.capture():
+            threads = [threading.Thread(target=run, args=(name,)) for name in ['first', 'second']]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(memory.tracemalloc.is_tracing(), was_tracing)
+        self.assertEqual((memory._users, memory._owned), (0, False))
+        for name in ['first', 'second']:
+            self.assertEqual(list(traces[name].stages), ['load'])
+            self.assertGreater(traces[name].stages['load']['net'], 0)
@@ -0,0 +1,46 @@
+import os
+import tempfile
+import unittest
+
+from tax_refund.engine import metrics, parser
+from tax_refund.engine.tests.support import BASE_DIR, GOLDEN_ROSTERS
+
+
+class MetricsTest(unittest.TestCase):
+    def test_render(self):
+        registry = metrics.Registry()
+        requests = registry.counter('requests_total', 'help', ['view'])
+        seconds = registry.histogram('seconds', 'help', ['stage'], buckets=(0.1, 1))
+        requests.inc(view='index')
+        requests.inc(2, view='index')
+        for value in [0.05, 0.1, 0.5, 3]:
+            seconds.observe(value, stage='load')
+        self.assertEqual(registry.render().splitlines(), [
+            '# HELP requests_total help', '# TYPE requests_total counter', 'requests_total{view="index"} 3',
+            '# HELP seconds help', '# TYPE seconds histogram',
+            'seconds_bucket{stage="load",le="0.1"} 2',
+            'seconds_bucket{stage="load",le="1"} 3',
+            'seconds_bucket{stage="load",le="+Inf"} 4',
+            'seconds_sum{stage="load"} 3.65',
+            'seconds_count{stage="load"} 4'])
+        with self.assertRaises(ValueError):
+            requests.inc(stage='load')
+
+    def test_capture(self):
+        # worker 에서 기록한 값은 capture 로 모아 요청 처리 프로세스에서 반영합니다.
+        before = metrics.REGISTRY.render()
+        path = os.path.join(BASE_DIR, 'data', GOLDEN_ROSTERS[0])
+        with tempfile.TemporaryDirectory() as root:
+            with metrics.capture() as events:
+                parser.deductio_and_tax(path, None, cache_dir=os.path.join(root, 'cache'))
+            # cache 를 사용하면 명부를 다시 계산하지 않으므로 명부 행 수를 기록하지 않습니다.
+            with metrics.capture() as cached_events:
+                parser.deductio_and_tax(path, None, cache_dir=os.path.join(root, 'cache'))
+        self.assertEqual(metrics.REGISTRY.render(), before)
+        stages = ['load', 'workdate', 'tables', 'deduction', 'sheets']
+        self.assertEqual({(name, key) for name, _, key, _ in events},
+                         {('tax_refund_stage_seconds', (stage,)) for stage in stages} |
+                         {('tax_refund_roster_rows', ()), ('tax_refund_cache_requests_total', ('arrays', 'miss'))})
+        self.assertEqual({(name, key) for name, _, key, _ in cached_events},
+                         {('tax_refund_stage_seconds', (stage,)) for stage in ['tables', 'deduction', 'sheets']} |
+                         {('tax_refund_cache_requests_total', ('arrays', 'hit'))})
@@ -0,0 +1,266 @@
+import csv
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from tax_refund.engine import DEDUCTION_YEARS, END_DATE, START_DATE, calculation_period, parser, target_years
+from tax_refund.engine.errors import RosterValidationError
+from tax_refund.engine.synthetic import synthetic_workdate
+from tax_refund.engine.tests.support import (BASE_DIR, CURR_DATE, GOLDEN_ROSTERS, PROPERTY_SEEDS, run_deductio_and_tax,
+                                             synthetic_roster)
+
+
+def intersection(start_date_1, end_date_1, start_date_2, end_date_2, dummy_date):
+    """
+    Description:
+        두 날짜 범위중 겹치는 범위를 반환합니다. 겹치지 않으면 dummy_date 로 채웁니다.
+    """
+    assert (start_date_1 < end_date_1).all() & (start_date_2 < end_date_2).all()
+    start_date = start_date_2.where(start_date_1 < start_date_2, start_date_1)
+    end_date = end_date_2.where(end_date_1 > end_date_2, end_date_1)
+
+    not_intersection_mask = start_date > end_date
+    start_date = start_date.mask(not_intersection_mask).fillna(dummy_date)
+    end_date = end_date.mask(not_intersection_mask).fillna(dummy_date)
+    return start_date, end_date
+
+
+def generate_young_calendar(start_date, end_date, acquisi_date, disqual_date, enlist_date, discharge_date,
+                            birth_date):
+    """
+    Description:
+        청년(30세 미만, 군복무 기간 추가) 근로 테이블 (기존 인원별 기간 계산)
+    """
+    young_disqual_date = birth_date + pd.DateOffset(years=30)
+    period = (pd.to_datetime(discharge_date) - pd.to_datetime(enlist_date)).fillna(pd.Timedelta(0))
+    period.index = young_disqual_date.index
+    start, end = intersection(acquisi_date, disqual_date, birth_date, young_disqual_date + period,
+                              pd.to_datetime('1800-01-01'))
+    return parser.check_workdate(start_date, end_date, start, end)
+
+
+def generate_elder_calendar(start_date, end_date, acquisi_date, disqual_date, birth_date):
+    """
+    Description:
+        노인(60세 이상) 근로 테이블 (기존 인원별 기간 계산)
+    """
+    elder_acquisi_date = birth_date + pd.DateOffset(years=60)
+    start, end = intersection(acquisi_date, disqual_date, elder_acquisi_date,
+                              elder_acquisi_date + pd.DateOffset(years=150), pd.to_datetime('1800-01-01'))
+    return parser.check_workdate(start_date, end_date, start, end)
+
+
+def reference_generate_workdate(workdate_df, start_date, end_date, curr_date):
+    """
+    Description:
+        인원별 기간 계산(intersection)으로 근로표를 만드는 기존 생성 순서 (generate_workdate 의 기준 구현)
+    """
+    birth_date = pd.to_datetime(parser.resident2date(workdate_df.iloc[:, 0]))
+    acquisi_date = pd.to_datetime(workdate_df.iloc[:, 2])
+    disqual_date = pd.to_datetime(workdate_df.iloc[:, 3]).fillna(curr_date)
+    years = parser.get_years(start_date, end_date)
+
+    workdate_df_, workdate_sum_df = parser.generate_work_calendar(start_date, end_date, acquisi_date, disqual_date)
+    young_df = generate_young_calendar(start_date, end_date, acquisi_date, disqual_date,
+                                       workdate_df.iloc[:, 7], workdate_df.iloc[:, 8], birth_date)
+    elder_df = generate_elder_calendar(start_date, end_date, acquisi_date, disqual_date, birth_date)
+    # 장애인은 상시 근로 기간 전체, 임원 / 계약직은 청년 근로에서 제외합니다.
+    disable_df = workdate_df_.copy()
+    disable_df.loc[~workdate_df.iloc[:, 4].astype(bool)] = False
+    young_df.loc[workdate_df.iloc[:, 5].astype(bool) | workdate_df.iloc[:, 6].astype(bool)] = False
+    merged_young_df = elder_df | young_df | disable_df
+    return workdate_df_, workdate_sum_df, merged_young_df, parser.sum_by_yaer(merged_young_df, years, '(청년)')
+
+
+class EquivalenceTest(unittest.TestCase):
+    def test_generate_workdate(self):
+        curr_date = CURR_DATE
+        for seed in PROPERTY_SEEDS:
+            workdate_df, roster = synthetic_roster(200, seed)
+            for start_date, end_date in [(START_DATE, END_DATE), ('2020-03-01', '2021-10-31')]:
+                with self.subTest(seed=seed, start_date=start_date):
+                    expected = reference_generate_workdate(workdate_df, start_date, end_date, curr_date)
+                    actual = parser.generate_workdate(roster, start_date, end_date, curr_date)
+                    for expected_df, actual_df in zip(expected, actual):
+                        np.testing.assert_array_equal(np.asarray(actual_df, dtype=np.int64),
+                                                      np.asarray(expected_df, dtype=np.int64))
+
+    def test_check_workdate(self):
+        dates = parser.get_dates_by_month(START_DATE, END_DATE)
+        for seed in PROPERTY_SEEDS:
+            rng = np.random.default_rng(seed)
+            acquisi_date = pd.Series(pd.to_datetime('2016-01-01') + pd.to_timedelta(rng.integers(0, 2500, 100), 'D'))
+            disqual_date = acquisi_date + pd.to_timedelta(rng.integers(1, 1500, 100), 'D')
+            calendar_df = parser.check_workdate(START_DATE, END_DATE, acquisi_date, disqual_date)
+            # 인원별, 달(month)별 반복 계산
+            expected = [[start <= date <= end for date in dates] for start, end in zip(acquisi_date, disqual_date)]
+            with self.subTest(seed=seed):
+                np.testing.assert_array_equal(calendar_df.values.astype(bool), np.array(expected))
+
+    def test_sum_by_yaer(self):
+        years = parser.get_years(START_DATE, END_DATE)
+        dates = pd.DatetimeIndex(parser.get_dates_by_month(START_DATE, END_DATE))
+        for seed in PROPERTY_SEEDS:
+            rng = np.random.default_rng(seed)
+            calendar_df = pd.DataFrame(rng.random((50, len(dates))) < 0.5, columns=dates)
+            expected = calendar_df.T.groupby(dates.year).sum().T
+            with self.subTest(seed=seed):
+                np.testing.assert_array_equal(parser.sum_by_yaer(calendar_df, years).values, expected.values)
+
+    def test_extend_workdate_sum(self):
+        for seed in PROPERTY_SEEDS:
+            rng = np.random.default_rng(seed)
+            young = pd.DataFrame(rng.integers(0, 13, (30, 3)))
+            etc = pd.DataFrame(rng.integers(0, 13, (30, 3)))
+            extend_young, extend_etc = parser.extend_workdate_sum(young, etc)
+            # 인원별 반복 계산 : 작년도와 해당년도 중 최대 청년 근로 달수를 해당년도 상시 근로 달수로 제한합니다.
+            for i in range(len(young)):
+                for j in range(2):
+                    total = young.iat[i, j + 1] + etc.iat[i, j + 1]
+                    anchor = min(max(young.iat[i, j], young.iat[i, j + 1]), total)
+                    self.assertEqual(extend_young.iat[i, j], anchor)
+                    self.assertEqual(extend_etc.iat[i, j], total - anchor)
+                self.assertEqual(extend_young.iat[i, 2], young.iat[i, 2])
+
+    def test_chunked_matches_full(self):
+        for seed in PROPERTY_SEEDS:
+            workdate_df = synthetic_workdate(300, seed)
+            for target_year in [None, 2021]:
+                chunks = [workdate_df.iloc[i:i + 64].copy() for i in range(0, len(workdate_df), 64)]
+                with mock.patch.object(parser, 'read_workdate', return_value=workdate_df.copy()), \
+                        mock.patch.object(parser, 'read_workdate_chunks', return_value=iter(chunks)):
+                    expected = parser.deductio_and_tax('synthetic', save_path=None, curr_date=CURR_DATE,
+                                                       target_year=target_year)
+                    actual = parser.deductio_and_tax_chunked('synthetic', curr_date=CURR_DATE,
+                                                             target_year=target_year)
+                with self.subTest(seed=seed, target_year=target_year):
+                    self.assertEqual(actual[:2], expected[:2])
+
+    def test_yearly_matches_target_year(self):
+        years = parser.get_years(START_DATE, END_DATE)
+        for seed in PROPERTY_SEEDS:
+            _, roster = synthetic_roster(300, seed)
+            _, workdate_sum_df, _, young_workdate_sum_df = parser.generate_workdate(roster, START_DATE, END_DATE,
+                                                                                    CURR_DATE)
+            etc_workdate_sum_df = pd.DataFrame(workdate_sum_df.values - young_workdate_sum_df.values,
+                                               index=workdate_sum_df.index)
+            n_workers = workdate_sum_df.values.sum(axis=0)
+            n_youngs = young_workdate_sum_df.values.sum(axis=0)
+            yearly_df = parser.yearly_deduction_and_tax(
+                n_workers, n_youngs,
+                parser.yearly_extend_workdate_totals(young_workdate_sum_df, etc_workdate_sum_df, years), years)
+
+            # 각 연도를 계산 기간 마지막 연도로 다시 계산한 결과와 같아야 합니다.
+            for target_index, year in enumerate(years):
+                extend_totals = parser.extend_workdate_totals(young_workdate_sum_df.iloc[:, :target_index + 1],
+                                                              etc_workdate_sum_df.iloc[:, :target_index + 1],
+                                                              years[:target_index + 1])
+                deduction, refund, _, _, _ = parser.deduction_and_tax_from_totals(
+                    n_workers[:target_index + 1], n_youngs[:target_index + 1], extend_totals,
+                    years[:target_index + 1])
+                with self.subTest(seed=seed, year=year):
+                    self.assertEqual(yearly_df.loc[year, '공제금액'], deduction)
+                    self.assertEqual(yearly_df.loc[year, '추가납부금액'], refund)
+
+    def test_yearly_projection(self):
+        years = [2020, 2021, 2022]
+        n_workers, n_youngs = np.array([100, 120, 140]), np.array([10, 20, 30])
+        yearly_extend_totals = {year: {i: np.zeros(len(years) - i) for i in range(len(years))} for year in years}
+
+        # 마지막 연도 값을 유지하는 추정 연도는 추가 납부가 없습니다.
+        yearly_df = parser.yearly_deduction_and_tax(n_workers, n_youngs, yearly_extend_totals, years)
+        self.assertEqual(yearly_df.loc[[2023, 2024], '추가납부금액'].tolist(), [0, 0])
+        self.assertEqual(yearly_df.loc[[2023, 2024], '공제금액'].tolist(), [36000, 18000])
+
+        # 추정 근무 달 수가 최초 공제 연도(2022)보다 줄면 2022년 최초 공제를 반납합니다.
+        yearly_df = parser.yearly_deduction_and_tax(n_workers, n_youngs, yearly_extend_totals, years,
+                                                    projected_workers=np.array([130, 150]),
+                                                    projected_youngs=np.array([30, 30]))
+        self.assertEqual(yearly_df.loc[[2023, 2024], '추가납부금액'].tolist(), [18000, 0])
+
+        # 계산 기간 마지막 연도의 청년 근로 달 수 감소 확인 결과를 추정 연도에 다시 적용하지 않습니다.
+        yearly_extend_totals[2022][1] = np.array([5, 3])
+        yearly_df = parser.yearly_deduction_and_tax(n_workers, n_youngs, yearly_extend_totals, years)
+        self.assertEqual(yearly_df['추가납부금액'].tolist(), [0, 0, 18000, 0, 0])
+
+    def test_clawback_rule(self):
+        # 계산 기간 연도의 추가 납부는 'young' 이 -1 로 표시된 공제(청년 근로 달 수 감소)에만 적용됩니다.
+        years = [2020, 2021, 2022]
+
+        # 2021년 최초 공제 후 2022년 근로자 수가 줄면 deduction_mask 의 -1 에 공제 금액이 곱해지며 추가 납부는 없습니다.
+        deductions, _ = parser.get_deductions(np.array([10, 20, 20]), np.array([90, 100, 90]), True, years)
+        self.assertEqual(deductions[0][2022].tolist(), [-11000, -7000])
+        self.assertEqual(parser.calculate_tax_sum(deductions, 2022), 0)
+        self.assertEqual(parser.filter_valid_tax(deductions, 2022)[1], [0])
+
+        # 청년 공제 금액이 0 이면 'young' 은 0 이 되고 'etc' 만 음수가 됩니다.
+        deductions, _ = parser.get_deductions(np.array([10, 10, 10]), np.array([90, 100, 90]), True, years)
+        self.assertEqual(deductions[0][2022].tolist(), [0, -7000])
+        self.assertEqual(parser.filter_valid_tax(deductions, 2022)[1], [])
+        self.assertEqual(parser.calculate_tax_sum(deductions, 2022), 0)
+
+        # 청년 근로 달 수 감소로 -1 을 표시한 공제는 받았던 공제를 반납합니다.
+        deductions, _ = parser.get_deductions(np.array([10, 20, 25]), np.array([90, 100, 100]), True, years)
+        deductions[0][2022] = -1
+        self.assertEqual(parser.calculate_tax_sum(deductions, 2022), 18000)
+
+    def test_target_years(self):
+        # 계산 기간의 첫 연도를 제외한 연도의 공제 금액이 있는 연도만 공제 적용 연도로 계산할 수 있습니다.
+        self.assertEqual(list(parser.deduction_table(True).columns), list(DEDUCTION_YEARS))
+        self.assertEqual(list(parser.deduction_table(False).columns), list(DEDUCTION_YEARS))
+        for target_year in target_years():
+            years = parser.get_years(*calculation_period(target_year))
+            with self.subTest(target_year=target_year):
+                self.assertTrue(set(years[1:]) <= set(DEDUCTION_YEARS))
+                self.assertEqual(years[-1], target_year)
+
+
+class CsvInputTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.path = os.path.join(BASE_DIR, 'data', GOLDEN_ROSTERS[0])
+        cls.rows = [['' if cell is np.nan else cell for cell in row] for row in parser.sheet_rows(cls.path)]
+
+    def write(self, root, filename, encoding, rows, delimiter=','):
+        path = os.path.join(root, filename)
+        with open(path, 'w', encoding=encoding, newline='') as f:
+            csv.writer(f, delimiter=delimiter).writerows(rows)
+        return path
+
+    def test_same_as_excel(self):
+        expected = run_deductio_and_tax(self.path)
+        with tempfile.TemporaryDirectory() as root:
+            # 엑셀 명부를 그대로 저장한 csv (cp949), header 가 한 행인 tsv (utf-8)
+            for path, encoding in [(self.write(root, 'roster.csv', 'cp949', self.rows), 'cp949'),
+                                   (self.write(root, 'roster.tsv', 'utf-8', [row[3:12] for row in self.rows[1:]],
+                                               delimiter='\t'), 'utf-8')]:
+                with self.subTest(path=os.path.basename(path)):
+                    self.assertEqual(parser.detect_encoding(path), encoding)
+                    # 엑셀의 날짜 cell 은 datetime, csv 는 문자열이므로 변환 후 비교합니다.
+                    pd.testing.assert_frame_equal(parser.load_workdate(path).reset_index(drop=True),
+                                                  parser.load_workdate(self.path).reset_index(drop=True))
+                    actual = run_deductio_and_tax(path)
+                    self.assertEqual((actual['deduction'], actual['refund']),
+                                     (expected['deduction'], expected['refund']))
+
+    def test_chunks_and_error_rows(self):
+        rows = [row[3:12] for row in self.rows[1:]]
+        rows[5][2] = '2019.13.01'
+        with tempfile.TemporaryDirectory() as root:
+            path = self.write(root, 'roster.csv', 'utf-8-sig', rows[:1] + [[]] + rows[1:])
+            chunks = list(parser.read_workdate_chunks(path, chunksize=7))
+            self.assertEqual(sum(len(chunk) for chunk in chunks), len(rows) - 1)
+            with self.assertRaises(RosterValidationError) as context:
+                parser.load_roster(path)
+        # 검증 오류 행 번호 = csv 줄 번호 (header 1줄, 빈 줄 1줄)
+        self.assertEqual([error['row'] for error in context.exception.report], [7])
+
+    def test_missing_header(self):
+        with tempfile.TemporaryDirectory() as root:
+            path = self.write(root, 'roster.csv', 'utf-8', [row[3:12] for row in self.rows[2:]])
+            with self.assertRaises(RosterValidationError):
+                parser.read_workdate(path)
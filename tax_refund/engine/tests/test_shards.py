@@ -0,0 +1,63 @@
+import os
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from tax_refund.engine import END_DATE, START_DATE, parser, shards
+from tax_refund.engine.backends import BACKENDS
+from tax_refund.engine.synthetic import synthetic_workdate
+from tax_refund.engine.tests.support import CURR_DATE, SYNTHETIC_ROSTERS, run_deductio_and_tax, synthetic_roster
+
+
+class ShardTest(unittest.TestCase):
+    # 작은 명부도 나눠 계산합니다.
+    @classmethod
+    def setUpClass(cls):
+        cls.min_rows = mock.patch.object(shards, 'MIN_SHARD_ROWS', 50)
+        cls.min_rows.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.min_rows.stop()
+        shards.shutdown()
+
+    def test_shard_slices(self):
+        self.assertEqual(shards.shard_slices(310, 4), [slice(0, 77), slice(77, 155), slice(155, 232), slice(232, 310)])
+        self.assertEqual(shards.shard_slices(120, 4), [slice(0, 60), slice(60, 120)])
+        self.assertEqual(shards.shard_slices(10, 4), [slice(0, 10)])
+
+    def test_matches_unsharded(self):
+        curr_date = CURR_DATE
+        _, roster = synthetic_roster(300, 0)
+        expected = parser.generate_workdate(roster, START_DATE, END_DATE, curr_date)
+        for actual, frame in zip(parser.generate_workdate(roster, START_DATE, END_DATE, curr_date, n_shards=4),
+                                 expected):
+            pd.testing.assert_frame_equal(actual, frame)
+        for name, backend in BACKENDS.items():
+            with self.subTest(backend=name):
+                for actual, sums in zip(shards.year_sums(backend, roster, START_DATE, END_DATE, curr_date, 4),
+                                        backend.year_sums(roster, START_DATE, END_DATE, curr_date)):
+                    np.testing.assert_array_equal(actual, sums)
+
+    def test_pool_reused(self):
+        # 여러 thread 가 서로 다른 shard 수로 동시에 계산해도 pool 을 바꾸지 않습니다.
+        _, roster = synthetic_roster(300, 1)
+        backend = BACKENDS['numpy']
+        expected = backend.year_sums(roster, START_DATE, END_DATE, CURR_DATE)
+        pool = shards.get_pool(2)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(shards.year_sums, backend, roster, START_DATE, END_DATE, CURR_DATE, n_shards)
+                       for n_shards in [2, 6, 3, 6]]
+            for future in futures:
+                for actual, sums in zip(future.result(), expected):
+                    np.testing.assert_array_equal(actual, sums)
+        self.assertIs(shards.get_pool(6), pool)
+
+    def test_deductio_and_tax(self):
+        workdate_df = synthetic_workdate(*SYNTHETIC_ROSTERS['synthetic_300_1'])
+        with mock.patch.dict(os.environ, {'TAX_REFUND_SHARDS': '3'}):
+            actual = run_deductio_and_tax('synthetic.xls', workdate_df, backend='numpy')
+        self.assertEqual(actual, run_deductio_and_tax('synthetic.xls', workdate_df, backend='numpy'))
@@ -0,0 +1,27 @@
+import unittest
+
+import numpy as np
+
+from tax_refund.engine import END_DATE, START_DATE
+from tax_refund.engine.backends import BACKENDS
+from tax_refund.engine.timeline import headcount_timeline
+from tax_refund.engine.tests.support import CURR_DATE, PROPERTY_SEEDS, synthetic_roster
+
+
+class TimelineTest(unittest.TestCase):
+    def test_matches_calendars(self):
+        # 월말 인원 수 = 근로표 열(column) 합계, 연도별 합계 = year_sums 합계
+        curr_date = CURR_DATE
+        reference = BACKENDS['pandas']
+        for seed in PROPERTY_SEEDS:
+            _, roster = synthetic_roster(300, seed)
+            for start_date, end_date in [(START_DATE, END_DATE), ('2020-03-01', '2021-10-31')]:
+                monthly_df, yearly_df = headcount_timeline(roster, start_date, end_date, curr_date)
+                work_mask, young_mask = reference.calendars(roster, start_date, end_date, curr_date)
+                work_sums, young_sums = reference.year_sums(roster, start_date, end_date, curr_date)
+                with self.subTest(seed=seed, start_date=start_date):
+                    np.testing.assert_array_equal(monthly_df['상시'].values, np.asarray(work_mask).sum(0))
+                    np.testing.assert_array_equal(monthly_df['청년'].values, np.asarray(young_mask).sum(0))
+                    np.testing.assert_array_equal(yearly_df['상시'].values, work_sums.sum(0))
+                    np.testing.assert_array_equal(yearly_df['청년'].values, young_sums.sum(0))
+                    np.testing.assert_array_equal(yearly_df['기타'].values, (work_sums - young_sums).sum(0))
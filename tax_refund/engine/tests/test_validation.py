@@ -0,0 +1,64 @@
+import pickle
+import unittest
+
+import numpy as np
+
+from tax_refund.engine import parser
+from tax_refund.engine.errors import RosterValidationError
+from tax_refund.engine.roster import Roster
+from tax_refund.engine.synthetic import synthetic_workdate
+from tax_refund.engine.validation import HEADER_ROWS, clean_workdate
+from tax_refund.engine.tests.support import CURR_DATE, PROPERTY_SEEDS
+
+
+class ValidationTest(unittest.TestCase):
+    def test_non_ascii_resident_codes(self):
+        # 전각 숫자, 한글이 섞인 주민등록번호는 500(UnicodeEncodeError) 대신 검증 오류로 보고합니다.
+        workdate_df = synthetic_workdate(5, 0)
+        workdate_df.iloc[:3, 0] = ['９００１１７-1******', '900117-１******', '900117-1가*****']
+        with self.assertRaises(RosterValidationError) as context:
+            clean_workdate(workdate_df.copy())
+        report = context.exception.report
+        self.assertEqual([error['row'] for error in report], [1 + HEADER_ROWS, 2 + HEADER_ROWS, 3 + HEADER_ROWS])
+        self.assertEqual({error['error'] for error in report}, {'주민등록번호 형식 오류'})
+
+        roster = Roster.from_workdate(parser.format_workdate(workdate_df))
+        self.assertEqual(roster.resident_codes[2], b'900117-1?*****')
+
+    def test_serving(self):
+        # 입대 날짜만 있으면 복무 중이므로 계산 날짜까지 복무한 것으로 계산합니다. 전역 날짜만 있으면 오류입니다.
+        workdate_df = synthetic_workdate(5, 0)
+        workdate_df.iloc[:, 7:9] = np.nan
+        workdate_df.iloc[0, 7] = '2022.01.01'
+        workdate_df, report = clean_workdate(workdate_df)
+        self.assertEqual(len(report), 0)
+        roster = Roster.from_workdate(parser.format_workdate(workdate_df.copy()), CURR_DATE)
+        self.assertEqual(roster.military_days.tolist(), [530, 0, 0, 0, 0])
+
+        workdate_df.iloc[1, 8] = '2022.01.01'
+        with self.assertRaises(RosterValidationError) as context:
+            clean_workdate(workdate_df)
+        self.assertEqual([(error['row'], error['column']) for error in context.exception.report],
+                         [(2 + HEADER_ROWS, '입대')])
+
+    def test_roster_from_read_workdate(self):
+        # load_roster 는 format_workdate 없이 read_workdate 결과(변환 전 column)로 Roster 를 만듭니다.
+        for seed in PROPERTY_SEEDS:
+            workdate_df = synthetic_workdate(200, seed)
+            expected = Roster.from_workdate(parser.format_workdate(workdate_df.copy()), CURR_DATE)
+            actual = Roster.from_workdate(workdate_df, CURR_DATE)
+            for name in Roster.__slots__:
+                with self.subTest(seed=seed, column=name):
+                    np.testing.assert_array_equal(getattr(actual, name), getattr(expected, name))
+
+    def test_error_is_plain(self):
+        # 검증 오류는 worker 프로세스에서 pickle 되어 전달되므로 pandas 객체를 담지 않습니다.
+        workdate_df = synthetic_workdate(5, 0)
+        workdate_df.iloc[0, 2] = '2019.13.01'
+        with self.assertRaises(RosterValidationError) as context:
+            clean_workdate(workdate_df)
+        error = pickle.loads(pickle.dumps(context.exception))
+        self.assertEqual(error.report, [{'row': 1 + HEADER_ROWS, 'column': '자격취득일', 'value': '2019.13.01',
+                                         'error': '날짜 형식 오류'}])
+        self.assertEqual(str(error), str(context.exception))
+        self.assertNotIn(b'pandas', pickle.dumps(context.exception))
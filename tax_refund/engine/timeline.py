@@ -0,0 +1,114 @@
+"""
+회사 인원(headcount) 시계열
+
+인원별 근로표(인원 x 달)를 만들지 않고 인정 기간 시작(+1) / 종료 다음날(-1) 이벤트를 날짜순으로 정렬해
+누적합(sweep-line)을 월말마다 읽어 회사 전체 상시 / 청년 / 기타 근로자 수를 계산합니다. O(n log n)
+
+연도별 합계는 table_df 의 연도별 상시 / 청년 근로 달 수 합계(공제 계산에 사용하는 n_workers, n_youngs)와 같습니다.
+대시보드, 큰 명부의 빠른 추정에 사용합니다.
+
+Usage:
+    >>> roster, _ = parser.load_roster(path)
+    >>> monthly_df, yearly_df = headcount_timeline(roster, START_DATE, END_DATE, curr_date)
+"""
+import numpy as np
+import pandas as pd
+
+from tax_refund.engine import parser
+from tax_refund.engine.parser import category_periods
+
+COLUMNS = ['상시', '청년', '기타']
+
+
+def category_intervals(roster, curr_date):
+    """
+    Description:
+        상시 / 통합 청년 인정 기간을 (start, end, weight) 로 반환합니다.
+        통합 청년 = (청년 & ~임원/계약직) + 노인 - (청년, 노인 겹치는 기간), 장애인은 상시 기간 전체입니다.
+
+    :param Roster roster:
+    :param Timestamp curr_date: 자격상실일이 없는 인원의 자격상실일
+    :dict return: {'상시': (start, end, weight), '청년': (start, end, weight)}
+    """
+    periods = category_periods(roster, curr_date)
+    (work_start, work_end) = periods['work']
+    (young_start, young_end), (elder_start, elder_end) = periods['young'], periods['elder']
+
+    excluded = roster.executive | roster.contract
+    disabled = roster.disabled
+    ones = np.ones(len(roster), dtype=np.int64)
+    young_weight = np.where(excluded | disabled, 0, 1)
+    elder_weight = np.where(disabled, 0, 1)
+
+    young = [(young_start, young_end, young_weight),
+             (elder_start, elder_end, elder_weight),
+             (np.maximum(young_start, elder_start), np.minimum(young_end, elder_end), -young_weight),
+             (work_start, work_end, np.where(disabled, 1, 0))]
+    return {'상시': (work_start, work_end, ones),
+            '청년': tuple(np.concatenate(arrays) for arrays in zip(*young))}
+
+
+def sweep(start, end, weight, dates):
+    """
+    Description:
+        [start, end] 기간마다 start 에 +weight, end 다음날에 -weight 이벤트를 만들고
+        날짜순 누적합으로 각 dates 시점의 인원 수를 계산합니다. 기간이 없거나(NaT) start > end 이면 제외합니다.
+
+    :param ndarray start: datetime64[D]
+    :param ndarray end: datetime64[D]
+    :param ndarray weight: int
+    :param ndarray dates: datetime64[D], 정렬된 평가 시점
+    :ndarray return: shape (len(dates),)
+    """
+    valid = ~(np.isnat(start) | np.isnat(end)) & (start <= end) & (weight != 0)
+    start, end, weight = start[valid], end[valid], weight[valid]
+
+    event_dates = np.concatenate([start, end + np.timedelta64(1, 'D')])
+    event_weights = np.concatenate([weight, -weight])
+    order = np.argsort(event_dates, kind='stable')
+    event_dates = event_dates[order]
+    running = np.cumsum(event_weights[order])
+
+    # 각 시점까지 (해당 날짜 포함) 발생한 이벤트의 누적합, 첫 이벤트 이전은 0
+    running = np.concatenate([[0], running])
+    return running[np.searchsorted(event_dates, dates, side='right')]
+
+
+def headcount_timeline(roster, start_date, end_date, curr_date):
+    """
+    Description:
+        월말 기준 회사 상시 / 청년 / 기타 근로자 수와 연도별 합계를 반환합니다.
+
+        monthly_df
+        -----------------------------
+        |            | 상시 | 청년 | 기타 |
+        | 2018-01-31 |  23 |   6 |  17 |
+        | 2018-02-28 |  24 |   6 |  18 |
+        -----------------------------
+
+        yearly_df (연도별 근로 달 수 합계)
+        ------------------------
+        |      | 상시 | 청년 | 기타 |
+        | 2018 | 288 |  73 | 215 |
+        ------------------------
+
+    :param Roster roster:
+    :param str start_date: yyyy-mm-dd
+    :param str end_date: yyyy-mm-dd
+    :param Timestamp curr_date: 자격상실일이 없는 인원의 자격상실일
+    :return:
+        : DataFrame monthly_df
+        : DataFrame yearly_df
+    """
+    grid = parser.calendar_grid(start_date, end_date)
+    dates = grid.dates.astype('datetime64[D]')
+    intervals = category_intervals(roster, curr_date)
+
+    workers = sweep(*intervals['상시'], dates)
+    youngs = sweep(*intervals['청년'], dates)
+    monthly_df = pd.DataFrame({'상시': workers, '청년': youngs, '기타': workers - youngs},
+                              index=pd.DatetimeIndex(grid.dates), columns=COLUMNS)
+
+    yearly = np.add.reduceat(monthly_df.values, grid.year_bounds[:-1], axis=0)
+    yearly_df = pd.DataFrame(yearly, index=list(grid.years), columns=COLUMNS)
+    return monthly_df, yearly_df
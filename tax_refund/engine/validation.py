@@ -0,0 +1,132 @@
+"""
+사업자가입명부 사전 검증
+
+명부를 로드한 직후, 근로표 계산 전에 모든 행(row)을 한번에 검사합니다.
+    1. 주민등록번호 형식 (yymmdd-n..., ASCII 문자) 및 생년월일
+    2. 자격취득일 누락 / 날짜 형식
+    3. 자격상실일 날짜 형식
+    4. 자격취득일이 자격상실일과 같거나 이후인 경우
+    5. 입대/전역 날짜 형식, 전역 날짜만 있는 경우, 입대일이 전역일 이후인 경우 (입대 날짜만 있으면 복무 중입니다.)
+"""
+import numpy as np
+import pandas as pd
+
+from tax_refund.engine.errors import RosterValidationError
+from tax_refund.engine.roster import parse_birth_dates
+
+# 엑셀 행 번호 = DataFrame index + HEADER_ROWS (header, 부제목 행)
+HEADER_ROWS = 2
+
+REPORT_COLUMNS = ['row', 'column', 'value', 'error']
+
+
+def parse_dates(series):
+    """
+    Description:
+        날짜 column 을 변환합니다.
+
+    :param pd.Series series:
+    :return:
+        : pd.Series dates: 변환된 날짜, 변환할 수 없으면 NaT
+        : pd.Series invalid: 값이 있지만 날짜로 변환할 수 없으면 True
+    """
+    dates = pd.to_datetime(series, errors='coerce')
+    invalid = series.notna() & dates.isna()
+    return dates, invalid
+
+
+def validate_workdate(df):
+    """
+    Description:
+        사업자가입명부의 모든 행(row)을 검사해 오류 목록을 반환합니다.
+
+    :param DataFrame df: read_workdate 결과 (날짜 변환 전)
+    :DataFrame return:
+        +-----+---------------+----------------+--------------------------+
+        | row | column        | value          | error                    |
+        +-----+---------------+----------------+--------------------------+
+        | 15  | 주민등록번호  | 5501041******  | 주민등록번호 형식 오류   |
+        +-----+---------------+----------------+--------------------------+
+        | 27  | 자격상실일    | 2019.13.01     | 날짜 형식 오류           |
+        +-----+---------------+----------------+--------------------------+
+        row 는 엑셀 행 번호입니다.
+    """
+    reports = []
+
+    def report(mask, column, error):
+        mask = np.asarray(mask, dtype=bool)
+        if mask.any():
+            reports.append(pd.DataFrame({'row': np.asarray(df.index[mask]) + HEADER_ROWS,
+                                         'column': column,
+                                         'value': df[column].values[mask].astype(str),
+                                         'error': error}))
+
+    # 주민등록번호
+    resident_codes = df['주민등록번호'].astype(str).str.strip()
+    # 전각 숫자 등 ASCII 가 아닌 문자는 주민등록번호로 사용할 수 없습니다. (Roster 는 ASCII bytes 로 보관합니다.)
+    code_format = resident_codes.str.match(r'^[0-9]{6}-[0-9]') & resident_codes.map(str.isascii) & \
+        df['주민등록번호'].notna()
+    report(~code_format, '주민등록번호', '주민등록번호 형식 오류')
+    birth_dates = parse_birth_dates(resident_codes)
+    report(code_format & np.isnat(birth_dates), '주민등록번호', '생년월일 변환 불가')
+
+    # 자격취득일, 자격상실일
+    acquisi_date, invalid_acquisi = parse_dates(df['자격취득일'])
+    disqual_date, invalid_disqual = parse_dates(df['자격상실일'])
+    report(df['자격취득일'].isna(), '자격취득일', '자격취득일 없음')
+    report(invalid_acquisi, '자격취득일', '날짜 형식 오류')
+    report(invalid_disqual, '자격상실일', '날짜 형식 오류')
+    report(acquisi_date >= disqual_date, '자격상실일', '자격상실일이 자격취득일과 같거나 이전')
+
+    # 입대, 전역
+    enlist_date, invalid_enlist = parse_dates(df['입대'])
+    discharge_date, invalid_discharge = parse_dates(df['전역'])
+    report(invalid_enlist, '입대', '날짜 형식 오류')
+    report(invalid_discharge, '전역', '날짜 형식 오류')
+    # 입대 날짜만 있으면 복무 중인 인원입니다. (계산 날짜까지 복무한 것으로 계산합니다. Roster.from_workdate 참조)
+    report(df['입대'].isna() & df['전역'].notna(), '입대', '입대 날짜 없이 전역 날짜만 있음')
+    report(enlist_date > discharge_date, '전역', '전역일이 입대일 이전')
+
+    if not reports:
+        return pd.DataFrame(columns=REPORT_COLUMNS)
+    return pd.concat(reports, ignore_index=True).sort_values('row', kind='stable', ignore_index=True)
+
+
+def report_records(report):
+    """
+    Description:
+        validate_workdate 결과를 RosterValidationError 의 report 형식(기본 자료형 dict list)으로 변환합니다.
+
+    :param DataFrame report: validate_workdate 결과
+    :list return: [{'row': int, 'column': str, 'value': str, 'error': str}, ...]
+    """
+    return [{'row': int(row), 'column': str(column), 'value': str(value), 'error': str(error)}
+            for row, column, value, error in report[REPORT_COLUMNS].itertuples(index=False)]
+
+
+def clean_workdate(df, on_error='raise'):
+    """
+    Description:
+        사업자가입명부를 검증합니다.
+
+    Args:
+        :param DataFrame df: read_workdate 결과 (날짜 변환 전)
+        :param str on_error:
+            1) raise : 오류가 있으면 RosterValidationError 를 발생시킵니다.
+            2) quarantine : 오류가 있는 행(row)을 제외하고 계속 진행합니다.
+
+    :return:
+        : DataFrame df: 오류 행이 제외된 명부
+        : DataFrame report: validate_workdate 결과
+    """
+    report = validate_workdate(df)
+    if report.empty:
+        return df, report
+
+    if on_error == 'raise':
+        raise RosterValidationError(report_records(report))
+    elif on_error == 'quarantine':
+        invalid_index = report['row'].unique() - HEADER_ROWS
+        return df.loc[~df.index.isin(invalid_index)], report
+    else:
+        raise NotImplementedError
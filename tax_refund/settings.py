@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -77,10 +78,12 @@ WSGI_APPLICATION = 'tax_refund.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.1/ref/settings/#databases
 
+# sqlite DB 경로 (부하 측정 등에서 별도 DB 를 사용할 때 지정합니다.)
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.environ.get('DATABASE_NAME', BASE_DIR / 'db.sqlite3'),
     }
 }
 
@@ -121,6 +124,45 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Calculation workers
+# 계산 worker 프로세스 수 (0 이면 요청 처리 프로세스에서 직접 계산), worker 당 최대 작업 수
+
+CALCULATION_WORKERS = int(os.environ.get('CALCULATION_WORKERS', 2))
+
+CALCULATION_MAX_JOBS_PER_WORKER = int(os.environ.get('CALCULATION_MAX_JOBS_PER_WORKER', 50))
+
+# 계산 backend, 'numpy' 또는 'pandas'(기준 구현, 검증/감사용)
+CALCULATION_BACKEND = os.environ.get('CALCULATION_BACKEND', 'numpy')
+
+# 큰 명부 하나의 근로표 계산을 나눠 실행할 최대 프로세스 수 (1 이면 나누지 않음, tax_refund.engine.shards 참조)
+# ⚠️ worker 프로세스마다 shard 프로세스 pool 을 만들므로 계산 프로세스 수는 최대
+#    CALCULATION_WORKERS x CALCULATION_SHARDS 입니다.
+CALCULATION_SHARDS = int(os.environ.get('CALCULATION_SHARDS', 1))
+
+# Admission control
+# 동시에 실행하는 최대 계산 수, 동시 계산의 최대 비용(명부 행 수) 합계, 최대 대기 시간(초), 사용자별 최대 대기 요청 수
+# (제한을 넘으면 503 / 429 + Retry-After 로 응답합니다. info.admission 참조)
+# 예상 대기 시간이 최대 대기 시간보다 긴 요청은 기다리지 않고 바로 503 으로 응답합니다. 0 이면 대기하지 않습니다.
+
+ADMISSION_MAX_CONCURRENT = int(os.environ.get('ADMISSION_MAX_CONCURRENT', max(CALCULATION_WORKERS, 1)))
+
+ADMISSION_MAX_COST = int(os.environ.get('ADMISSION_MAX_COST', 500000))
+
+ADMISSION_MAX_WAIT = float(os.environ.get('ADMISSION_MAX_WAIT', 10))
+
+ADMISSION_MAX_QUEUED_PER_USER = int(os.environ.get('ADMISSION_MAX_QUEUED_PER_USER', 2))
+
+# Upload store
+# 업로드 명부 / 생성된 엑셀 파일 저장소 경로, 보관 기간(일), 최대 용량
+
+UPLOAD_STORE_ROOT = os.environ.get('UPLOAD_STORE_ROOT', BASE_DIR / 'media')
+
+UPLOAD_RETENTION_DAYS = 30
+
+RESULT_RETENTION_DAYS = 7
+
+UPLOAD_STORE_MAX_BYTES = 10 * 1024 ** 3
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.1/ref/settings/#default-auto-field
 
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tax_refund.settings')
 
 application = get_wsgi_application()
+
+# 계산 worker 프로세스를 미리 시작합니다. (info.workers 참조)
+from info import workers  # noqa: E402
+
+workers.start()